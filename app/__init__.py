@@ -36,6 +36,10 @@ def create_app(config_name=None):
     db.init_app(app)
     migrate = Migrate(app, db, directory='app/migrations')
     
+    # Pipeline zadań w tle (efekty uboczne po commit)
+    from app.services.background_jobs import job_pipeline
+    job_pipeline.init_app(app)
+    
     # CORS
     CORS(app, resources={
         r"/api/*": {
@@ -59,8 +63,8 @@ def create_app(config_name=None):
     
     # Rejestracja blueprintów z routes
     from app.routes import (
-        admin_route, ankieter_routes, auth_route, blog_route, crm_routes, events_route,
-        footer_route, log_route, public_route, seo_route, social_route,
+        admin_route, ankieter_routes, assets_route, auth_route, blog_route, crm_routes, events_route,
+        footer_route, log_route, public_route, seo_route, sitemap_route, social_route,
         user_groups_route, users_route, unsubscribe_routes
     )
     
@@ -78,6 +82,8 @@ def create_app(config_name=None):
     app.register_blueprint(user_groups_route.user_groups_bp)
     app.register_blueprint(users_route.users_bp)
     app.register_blueprint(unsubscribe_routes.unsubscribe_bp)
+    app.register_blueprint(assets_route.assets_bp)
+    app.register_blueprint(sitemap_route.sitemap_bp)
     
     # Rejestracja API blueprintów - uproszczona wersja
     try:
@@ -171,6 +177,18 @@ def create_app(config_name=None):
         return value or {}
     
     # Dodaj funkcje globalne do kontekstu Jinja2
+    @app.template_global()
+    def asset_url(endpoint='static', filename=None, **values):
+        """Funkcja globalna - url_for('static', ...) z adresem pliku z hashem (manifest)"""
+        from app.utils.static_assets import asset_url as build_asset_url
+        return build_asset_url(endpoint, filename, **values)
+    
+    @app.template_global()
+    def seo_head(page_type, entity=None):
+        """Funkcja globalna - wyrenderowane (z cache) meta tagi SEO i JSON-LD strony"""
+        from app.services.seo_cache import SEOCache
+        return SEOCache.head(page_type, entity)
+    
     @app.template_global()
     def get_seo_settings(page_type, fallback_to_default=True):
         """Funkcja globalna do pobierania ustawień SEO"""
@@ -187,7 +205,7 @@ def create_app(config_name=None):
     def get_blog_tag_seo(tag):
         """Funkcja globalna do pobierania SEO dla tagów bloga"""
         from app.utils.seo_utils import SEOManager
-        return SEOManager.get_blog_tag_seo(tag)
+        return SEOManager.generate_blog_tag_seo(tag)
     
     @app.template_global()
     def generate_blog_link(link_data):
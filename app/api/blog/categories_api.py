@@ -3,10 +3,13 @@ Blog Categories API - category management
 """
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
-from app.models import BlogCategory, db
+from app.models import BlogCategory, BlogPost, db
 from app.utils.auth_utils import admin_required, admin_required_api
 import logging
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
+from app.utils.pagination_utils import paginate_keyset
+from app.services.seo_cache import SEOCache
+from app.services.category_tree import category_tree
 
 logger = logging.getLogger(__name__)
 
@@ -41,9 +44,13 @@ def get_admin_categories():
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        cursor = request.args.get('cursor', type=str)
         
-        pagination = BlogCategory.query.options(joinedload(BlogCategory.posts)).order_by(BlogCategory.title).paginate(
-            page=page, per_page=per_page, error_out=False
+        pagination = paginate_keyset(
+            BlogCategory.query, BlogCategory.title, BlogCategory.id,
+            per_page=per_page, cursor=cursor, page=page, descending=False,
+            options=(selectinload(BlogCategory.posts).load_only(BlogPost.id, BlogPost.title),
+                     selectinload(BlogCategory.parent))
         )
         
         categories = [{
@@ -65,12 +72,7 @@ def get_admin_categories():
         return jsonify({
             'success': True,
             'categories': categories,
-            'pagination': {
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'total': pagination.total,
-                'per_page': pagination.per_page
-            }
+            'pagination': pagination.to_dict()
         })
     except Exception as e:
         logger.error(f"❌ Błąd pobierania kategorii admin: {e}")
@@ -102,6 +104,7 @@ def create_category():
         
         db.session.add(category)
         db.session.commit()
+        category_tree.invalidate()
         
         return jsonify({
             'success': True,
@@ -176,6 +179,10 @@ def update_category(category_id):
             category.sort_order = data['sort_order']
         
         db.session.commit()
+        # Category titles are part of post JSON-LD (articleSection)
+        SEOCache.invalidate('blog_category', category_id)
+        SEOCache.invalidate('blog_post')
+        category_tree.invalidate()
         
         return jsonify({
             'success': True,
@@ -195,8 +202,8 @@ def delete_category(category_id):
     try:
         category = BlogCategory.query.get_or_404(category_id)
         
-        # Check if category has posts
-        if category.posts_count > 0:
+        # Check if category has posts (posts_count counts only published ones)
+        if category.has_posts():
             return jsonify({
                 'success': False,
                 'message': 'Nie można usunąć kategorii z postami'
@@ -212,6 +219,8 @@ def delete_category(category_id):
         
         db.session.delete(category)
         db.session.commit()
+        SEOCache.invalidate('blog_category', category_id)
+        category_tree.invalidate()
         
         return jsonify({
             'success': True,
@@ -243,13 +252,15 @@ def bulk_delete_categories():
             category = BlogCategory.query.get(category_id)
             if category:
                 # Check if category can be deleted
-                if category.posts_count == 0:
+                if not category.has_posts():
                     children = BlogCategory.query.filter_by(parent_id=category_id).count()
                     if children == 0:
                         db.session.delete(category)
                         deleted_count += 1
         
         db.session.commit()
+        SEOCache.invalidate('blog_category')
+        category_tree.invalidate()
         
         return jsonify({
             'success': True,
@@ -5,6 +5,8 @@ from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from app.models import BlogComment, BlogPost, User, db
 from app.utils.auth_utils import admin_required, admin_required_api
+from app.utils.pagination_utils import paginate_keyset
+from sqlalchemy.orm import selectinload
 import logging
 from datetime import datetime
 
@@ -20,6 +22,7 @@ def get_comments():
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
+        cursor = request.args.get('cursor', type=str)
         post_id = request.args.get('post_id', type=int)
         status = request.args.get('status', '', type=str)
         
@@ -33,8 +36,10 @@ def get_comments():
         elif status == 'pending':
             query = query.filter_by(is_approved=False)
         
-        comments = query.order_by(BlogComment.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+        comments = paginate_keyset(
+            query, BlogComment.created_at, BlogComment.id,
+            per_page=per_page, cursor=cursor, page=page,
+            options=(selectinload(BlogComment.post), selectinload(BlogComment.moderator))
         )
         
         return jsonify({
@@ -64,14 +69,7 @@ def get_comments():
                     'name': comment.moderator.first_name
                 } if comment.moderator else None
             } for comment in comments.items],
-            'pagination': {
-                'page': comments.page,
-                'pages': comments.pages,
-                'per_page': comments.per_page,
-                'total': comments.total,
-                'has_next': comments.has_next,
-                'has_prev': comments.has_prev
-            }
+            'pagination': comments.to_dict()
         })
     except Exception as e:
         logger.error(f"❌ Błąd pobierania komentarzy: {e}")
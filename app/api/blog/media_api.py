@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_required, current_user
 from app.models import BlogPost, BlogPostImage, db
 from app.utils.auth_utils import admin_required, admin_required_api
+from app.services.image_pipeline import ImagePipeline
 import logging
 import os
 import time
@@ -118,22 +119,30 @@ def get_post_gallery(post_id):
             # Extract filename from URL
             filename = os.path.basename(image.image_url)
             
-            # Generate thumbnail filename
-            from app.utils.image_utils import generate_thumbnail_path
-            thumbnail_filename = generate_thumbnail_path(filename)
-            
-            # Check if thumbnail exists
-            thumbnail_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'blog', str(post_id), 'gallery', thumbnail_filename)
-            thumbnail_url = image.image_url  # Fallback to original
-            
-            if os.path.exists(thumbnail_path):
-                # Use thumbnail URL
-                thumbnail_url = f'/static/uploads/blog/{post_id}/gallery/{thumbnail_filename}'
+            responsive = image.responsive
+            if responsive and responsive['files'].get('jpeg'):
+                # Smallest generated variant
+                thumbnail_url = responsive['files']['jpeg'][0]['url']
+            else:
+                # Generate thumbnail filename
+                from app.utils.image_utils import generate_thumbnail_path
+                thumbnail_filename = generate_thumbnail_path(filename)
+                
+                # Check if thumbnail exists (created before the responsive pipeline)
+                thumbnail_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'blog', str(post_id), 'gallery', thumbnail_filename)
+                thumbnail_url = image.image_url  # Fallback to original
+                
+                if os.path.exists(thumbnail_path):
+                    # Use thumbnail URL
+                    thumbnail_url = f'/static/uploads/blog/{post_id}/gallery/{thumbnail_filename}'
             
             image_list.append({
                 'id': image.id,
                 'url': image.image_url,
                 'thumbnail_url': thumbnail_url,
+                'srcset': responsive['srcset'] if responsive else None,
+                'width': responsive['width'] if responsive else None,
+                'height': responsive['height'] if responsive else None,
                 'alt_text': image.alt_text or post.title,
                 'caption': image.caption,
                 'order': image.order,
@@ -230,15 +239,6 @@ def add_post_image(post_id):
             file.save(file_path)
             logger.info(f"✅ File saved to: {file_path}")
             
-            # Create thumbnail
-            from app.utils.image_utils import create_gallery_thumbnails
-            thumbnail_result = create_gallery_thumbnails(post_id, filename, current_app.config['UPLOAD_FOLDER'])
-            
-            if thumbnail_result['success']:
-                logger.info(f"✅ Thumbnail created: {thumbnail_result['thumbnail_url']}")
-            else:
-                logger.warning(f"⚠️ Failed to create thumbnail: {thumbnail_result.get('error', 'Unknown error')}")
-            
             # Create database record with uploaded file
             image = BlogPostImage(
                 post_id=post_id,
@@ -252,6 +252,9 @@ def add_post_image(post_id):
         db.session.add(image)
         db.session.commit()
         
+        # Responsive variants are generated in the background
+        ImagePipeline.enqueue_gallery_image(image.id)
+        
         response_data = {
             'success': True,
             'message': 'Obraz został dodany do postu',
@@ -320,6 +323,9 @@ def update_post_image(post_id, image_id):
         
         db.session.commit()
         
+        if not image.responsive:
+            ImagePipeline.enqueue_gallery_image(image.id)
+        
         return jsonify({
             'success': True,
             'message': 'Obraz został zaktualizowany'
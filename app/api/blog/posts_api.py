@@ -13,8 +13,13 @@ import time
 import shutil
 from datetime import datetime
 from app.utils.timezone_utils import get_local_now
+from app.utils.pagination_utils import paginate_keyset
+from sqlalchemy.orm import selectinload, undefer
 from werkzeug.utils import secure_filename
-from app.services.social_media_service import social_media_service
+from app.services.blog_listing import listing_query, serialize_post
+from app.services.image_pipeline import ImagePipeline
+from app.services.seo_cache import SEOCache
+from app.services.social_outbox import SocialOutbox
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +40,12 @@ def get_blog_posts():
         per_page = request.args.get('per_page', 10, type=int)
         category_id = request.args.get('category_id', type=int)
         tag_id = request.args.get('tag_id', type=int)
+        # Full content only on request - listings use summary
+        include_content = request.args.get('include_content', 'false').lower() == 'true'
         
-        query = BlogPost.query.filter_by(status='published')
+        query = listing_query()
+        if include_content:
+            query = query.options(undefer(BlogPost.content))
         
         if category_id:
             query = query.join(BlogPost.categories).filter(BlogCategory.id == category_id)
@@ -50,18 +59,7 @@ def get_blog_posts():
         
         return jsonify({
             'success': True,
-            'posts': [{
-                'id': post.id,
-                'title': post.title,
-                'slug': post.slug,
-                'excerpt': post.excerpt,
-                'content': post.content,
-                'published_at': post.published_at.isoformat() if post.published_at else None,
-                'author': post.author.first_name if post.author else 'Unknown',
-                'categories': [{'id': cat.id, 'title': cat.title, 'slug': cat.slug} for cat in post.categories],
-                'tags': [{'id': tag.id, 'name': tag.name, 'slug': tag.slug} for tag in post.tags],
-                'featured_image': post.featured_image
-            } for post in posts.items],
+            'posts': [serialize_post(post, include_content) for post in posts.items],
             'pagination': {
                 'page': posts.page,
                 'pages': posts.pages,
@@ -83,6 +81,7 @@ def get_admin_posts():
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        cursor = request.args.get('cursor', type=str)
         search = request.args.get('search', '', type=str)
         category_id = request.args.get('category_id', type=int)
         status = request.args.get('status', '', type=str)
@@ -105,8 +104,14 @@ def get_admin_posts():
         elif status == 'draft':
             query = query.filter_by(status='draft')
         
-        posts = query.order_by(BlogPost.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+        posts = paginate_keyset(
+            query, BlogPost.created_at, BlogPost.id,
+            per_page=per_page, cursor=cursor, page=page,
+            options=(
+                selectinload(BlogPost.author),
+                selectinload(BlogPost.categories),
+                selectinload(BlogPost.tags)
+            )
         )
         
         return jsonify({
@@ -124,14 +129,7 @@ def get_admin_posts():
                 'tags': [{'id': tag.id, 'name': tag.name} for tag in post.tags],
                 'featured_image': post.featured_image
             } for post in posts.items],
-            'pagination': {
-                'page': posts.page,
-                'pages': posts.pages,
-                'per_page': posts.per_page,
-                'total': posts.total,
-                'has_next': posts.has_next,
-                'has_prev': posts.has_prev
-            }
+            'pagination': posts.to_dict()
         })
         
     except Exception as e:
@@ -230,16 +228,14 @@ def create_post():
         post.featured_image = featured_image_url
         
         db.session.add(post)
+        # Social media publications are written in the same transaction as the post
+        publications = SocialOutbox.stage(post)
         db.session.commit()  # Commit to get the ID
         
         # Move featured image to proper directory if it was uploaded
         if featured_image_url.startswith('/static/uploads/blog/temp_featured/'):
             _move_featured_image_to_post_folder(post.id, featured_image_url, current_app)
         
-        # Automatycznie publikuj na mediach społecznościowych jeśli status != draft
-        if status != 'draft' and any([data.get('social_facebook'), data.get('social_twitter'), data.get('social_linkedin')]):
-            _auto_publish_to_social_media(post, current_app)
-        
         # Add categories
         if 'categories' in data and data['categories']:
             category_ids = data['categories']
@@ -286,6 +282,9 @@ def create_post():
         
         db.session.commit()
         
+        # Publish to social media in the background
+        SocialOutbox.dispatch(publications)
+        
         return jsonify({
             'success': True,
             'message': 'Post został utworzony',
@@ -359,6 +358,9 @@ def update_post(post_id):
             if 'social_instagram' in data:
                 data['social_instagram'] = data['social_instagram'] == 'true'
         
+        # Status and social flags before the edit - the outbox publishes only on change
+        previous = SocialOutbox.snapshot(post)
+        
         # Update fields
         if 'title' in data:
             post.title = data['title']
@@ -393,15 +395,6 @@ def update_post(post_id):
                 file_path = os.path.join(post_folder, filename)
                 featured_image_file.save(file_path)
                 
-                # Create thumbnail for featured image
-                from app.utils.image_utils import create_featured_thumbnail
-                thumbnail_result = create_featured_thumbnail(post_id, filename, current_app.config['UPLOAD_FOLDER'])
-                
-                if thumbnail_result['success']:
-                    logger.info(f"✅ Featured image thumbnail created: {thumbnail_result['thumbnail_url']}")
-                else:
-                    logger.warning(f"⚠️ Failed to create featured image thumbnail: {thumbnail_result.get('error', 'Unknown error')}")
-                
                 post.featured_image = f'/static/uploads/blog/{post_id}/featured/{filename}'
         elif 'featured_image' in data:
             post.featured_image = data['featured_image']
@@ -469,7 +462,14 @@ def update_post(post_id):
             post.tags = tags
         
         post.updated_at = get_local_now()
+        publications = SocialOutbox.stage(post, previous)
         db.session.commit()
+        SEOCache.invalidate('blog_post', post_id)
+        SocialOutbox.dispatch(publications)
+        
+        # New featured image - responsive variants are generated in the background
+        if post.featured_image and not post.featured_responsive:
+            ImagePipeline.enqueue_featured_image(post.id)
         
         return jsonify({
             'success': True,
@@ -497,6 +497,7 @@ def delete_post(post_id):
         # Delete post
         db.session.delete(post)
         db.session.commit()
+        SEOCache.invalidate('blog_post', post_id)
         
         return jsonify({
             'success': True,
@@ -531,6 +532,7 @@ def bulk_delete_posts():
             db.session.delete(post)
         
         db.session.commit()
+        SEOCache.invalidate('blog_post')
         
         return jsonify({
             'success': True,
@@ -542,6 +544,49 @@ def bulk_delete_posts():
         logger.error(f"❌ Błąd masowego usuwania postów: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@posts_api_bp.route('/blog/admin/posts/<int:post_id>/social', methods=['GET'])
+@login_required
+@admin_required_api
+def get_post_social_status(post_id):
+    """Get social media publication status per platform"""
+    try:
+        BlogPost.query.get_or_404(post_id)
+        return jsonify({
+            'success': True,
+            'platforms': SocialOutbox.status(post_id)
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Błąd pobierania statusu publikacji postu {post_id}: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@posts_api_bp.route('/blog/admin/posts/<int:post_id>/social/<platform>/retry', methods=['POST'])
+@login_required
+@admin_required_api
+def retry_post_social_publication(post_id, platform):
+    """Retry a failed social media publication"""
+    try:
+        publication = SocialOutbox.retry(post_id, platform)
+        if publication is None:
+            return jsonify({
+                'success': False,
+                'message': 'Brak nieudanej publikacji do ponowienia'
+            }), 404
+
+        db.session.commit()
+        SocialOutbox.dispatch([publication])
+
+        return jsonify({
+            'success': True,
+            'message': 'Publikacja została ponownie zlecona',
+            'publication': publication.to_dict()
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"❌ Błąd ponawiania publikacji postu {post_id} na {platform}: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 def _move_featured_image_to_post_folder(post_id, temp_url, app):
     """Move featured image from temp folder to post-specific folder"""
     try:
@@ -562,21 +607,15 @@ def _move_featured_image_to_post_folder(post_id, temp_url, app):
         if os.path.exists(source_path):
             shutil.move(source_path, dest_path)
             
-            # Create thumbnail for featured image
-            from app.utils.image_utils import create_featured_thumbnail
-            thumbnail_result = create_featured_thumbnail(post_id, filename, app.config['UPLOAD_FOLDER'])
-            
-            if thumbnail_result['success']:
-                logger.info(f"✅ Featured image thumbnail created: {thumbnail_result['thumbnail_url']}")
-            else:
-                logger.warning(f"⚠️ Failed to create featured image thumbnail: {thumbnail_result.get('error', 'Unknown error')}")
-            
             # Update post.featured_image URL
             post = BlogPost.query.get(post_id)
             if post:
                 post.featured_image = f'/static/uploads/blog/{post_id}/featured/{filename}'
                 db.session.commit()
                 
+                # Responsive variants are generated in the background
+                ImagePipeline.enqueue_featured_image(post_id)
+                
             logger.info(f"✅ Moved featured image to: {dest_path}")
         else:
             logger.warning(f"⚠️ Source file not found: {source_path}")
@@ -616,38 +655,3 @@ def _move_gallery_image_to_post_folder(post_id, temp_url, app):
             
     except Exception as e:
         logger.error(f"❌ Error moving gallery image: {e}")
-
-def _auto_publish_to_social_media(post, app):
-    """
-    Automatycznie publikuje post na mediach społecznościowych
-    
-    Args:
-        post: BlogPost object
-        app: Flask app context
-    """
-    try:
-        # Przygotuj dane posta
-        post_url = f"{app.config.get('BASE_URL', 'https://klublepszezycie.pl')}/blog/{post.slug}"
-        
-        post_data = {
-            'title': post.title,
-            'url': post_url,
-            'excerpt': post.excerpt or post.meta_description or '',
-            'image_url': post.featured_image if post.featured_image else None,
-            'social_facebook': post.social_facebook,
-            'social_twitter': post.social_twitter,
-            'social_linkedin': post.social_linkedin
-        }
-        
-        # Publikuj na social media
-        results = social_media_service.auto_publish_post(post_data)
-        
-        # Loguj wyniki
-        for platform, (success, message) in results.items():
-            if success:
-                logger.info(f"✅ Post {post.id} opublikowany na {platform}: {message}")
-            else:
-                logger.warning(f"⚠️ Post {post.id} NIE opublikowany na {platform}: {message}")
-    
-    except Exception as e:
-        logger.error(f"❌ Błąd automatycznej publikacji na social media: {e}")
@@ -5,6 +5,8 @@ from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from app.models import BlogTag, db
 from app.utils.auth_utils import admin_required, admin_required_api
+from app.utils.pagination_utils import paginate_keyset
+from app.services.seo_cache import SEOCache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -40,9 +42,11 @@ def get_tags():
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
+        cursor = request.args.get('cursor', type=str)
         
-        tags = BlogTag.query.paginate(
-            page=page, per_page=per_page, error_out=False
+        tags = paginate_keyset(
+            BlogTag.query, BlogTag.name, BlogTag.id,
+            per_page=per_page, cursor=cursor, page=page, descending=False
         )
         
         return jsonify({
@@ -55,14 +59,7 @@ def get_tags():
                 'posts_count': tag.posts_count,
                 'created_at': tag.created_at.isoformat() if tag.created_at else None
             } for tag in tags.items],
-            'pagination': {
-                'page': tags.page,
-                'pages': tags.pages,
-                'per_page': tags.per_page,
-                'total': tags.total,
-                'has_next': tags.has_next,
-                'has_prev': tags.has_prev
-            }
+            'pagination': tags.to_dict()
         })
     except Exception as e:
         logger.error(f"❌ Błąd pobierania tagów: {e}")
@@ -153,6 +150,9 @@ def update_tag(tag_id):
             tag.is_active = data['is_active']
         
         db.session.commit()
+        # Tag names are part of post keywords and JSON-LD
+        SEOCache.invalidate('blog_tag', tag_id)
+        SEOCache.invalidate('blog_post')
         
         return jsonify({
             'success': True,
@@ -178,17 +178,18 @@ def delete_tag(tag_id):
         
         logger.info(f"🔍 Tag found: {tag.name}, posts_count: {tag.posts_count}")
         
-        # Check if tag has posts
-        if tag.posts_count > 0:
-            logger.warning(f"⚠️ Cannot delete tag {tag_id} - has {tag.posts_count} posts")
+        # Check if tag has posts (posts_count counts only published ones)
+        if tag.has_posts():
+            logger.warning(f"⚠️ Cannot delete tag {tag_id} - has posts")
             return jsonify({
                 'success': False,
-                'message': f'Nie można usunąć tagu "{tag.name}" - jest przypisany do {tag.posts_count} postów'
+                'message': f'Nie można usunąć tagu "{tag.name}" - jest przypisany do postów'
             }), 400
         
         logger.info(f"✅ Deleting tag {tag_id}: {tag.name}")
         db.session.delete(tag)
         db.session.commit()
+        SEOCache.invalidate('blog_tag', tag_id)
         
         logger.info(f"✅ Tag {tag_id} deleted successfully")
         return jsonify({
@@ -223,11 +224,12 @@ def bulk_delete_tags():
             tag = BlogTag.query.get(tag_id)
             if tag:
                 # Check if tag can be deleted
-                if tag.posts_count == 0:
+                if not tag.has_posts():
                     db.session.delete(tag)
                     deleted_count += 1
         
         db.session.commit()
+        SEOCache.invalidate('blog_tag')
         
         return jsonify({
             'success': True,
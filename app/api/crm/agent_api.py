@@ -91,48 +91,19 @@ def get_next_contact():
     try:
         from app.services.crm_queue_manager import QueueManager
         
-        # Get next contact from queue
-        next_contact = QueueManager.get_next_contact_for_ankieter(current_user.id)
-        
-        if next_contact:
-            # Get contact's call history
-            call_history = Call.query.filter_by(contact_id=next_contact.id).order_by(Call.call_date.desc()).limit(5).all()
-            
-            history = []
-            for call in call_history:
-                history.append({
-                    'id': call.id,
-                    'call_date': call.call_date.isoformat(),
-                    'status': call.status,
-                    'notes': call.notes,
-                    'duration_minutes': call.duration_minutes
-                })
-            
-            # Get campaign script if contact has campaign
-            campaign_script = None
-            if next_contact.campaign_id:
-                from app.models.crm_model import Campaign
-                campaign = Campaign.query.get(next_contact.campaign_id)
-                if campaign:
-                    campaign_script = campaign.script_content
-            
-            # Get current pending call to determine priority and type
-            current_call = Call.query.filter_by(
-                contact_id=next_contact.id,
-                ankieter_id=current_user.id,
-                queue_status='pending'
-            ).order_by(Call.created_at.desc()).first()
-            
-            is_new_record = False
-            is_rescheduled = False
-            scheduled_time = None
-            priority = 'low'
+        # Get next contact from queue with history and campaign script (single query)
+        dispatch = QueueManager.get_next_dispatch(current_user.id)
+        
+        if dispatch:
+            next_contact = dispatch['contact']
+            current_call = dispatch['call']
+            history = dispatch['call_history']
+            campaign_script = dispatch['campaign_script']
             
-            if current_call:
-                priority = current_call.priority
-                scheduled_time = current_call.scheduled_date.isoformat() if current_call.scheduled_date else None
-                is_rescheduled = current_call.scheduled_date is not None
-                is_new_record = current_call.queue_type == 'new' if hasattr(current_call, 'queue_type') else (current_call.call_attempts == 0 or current_call.call_attempts is None)
+            priority = current_call.priority or 'low'
+            scheduled_time = current_call.scheduled_date.isoformat() if current_call.scheduled_date else None
+            is_rescheduled = current_call.scheduled_date is not None
+            is_new_record = current_call.queue_type == 'new'
             
             return jsonify({
                 'success': True,
@@ -6,6 +6,10 @@ from flask_login import login_required, current_user
 from functools import wraps
 from app.models import db, User
 from app.models.crm_model import Contact, BlacklistEntry
+from app.services.crm_blacklist_index import blacklist_index
+from app.utils.phone_utils import normalize_phone
+from app.utils.pagination_utils import paginate_keyset
+from sqlalchemy.orm import selectinload
 import logging
 
 logger = logging.getLogger(__name__)
@@ -72,6 +76,7 @@ def add_to_blacklist():
                 contact.is_blacklisted = True
         
         db.session.commit()
+        blacklist_index.add(phone, reason=reason)
         
         return jsonify({
             'success': True,
@@ -96,6 +101,7 @@ def remove_from_blacklist(blacklist_id):
         # Deactivate instead of delete
         blacklist_entry.is_active = False
         db.session.commit()
+        blacklist_index.remove(blacklist_entry.phone, blacklist_entry.campaign_id)
         
         return jsonify({
             'success': True,
@@ -115,6 +121,7 @@ def get_blacklist():
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
+        cursor = request.args.get('cursor', type=str)
         
         # Get active blacklist entries
         query = BlacklistEntry.query.filter_by(is_active=True)
@@ -124,25 +131,21 @@ def get_blacklist():
         if search:
             query = query.filter(BlacklistEntry.phone.contains(search))
         
-        pagination = query.order_by(BlacklistEntry.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+        pagination = paginate_keyset(
+            query, BlacklistEntry.created_at, BlacklistEntry.id,
+            per_page=per_page, cursor=cursor, page=page,
+            options=(selectinload(BlacklistEntry.blacklister), selectinload(BlacklistEntry.contact))
         )
         
         blacklist_data = []
         for entry in pagination.items:
-            # Get blacklisted by user info
-            blacklisted_by_user = User.query.get(entry.blacklisted_by) if entry.blacklisted_by else None
-            
-            # Get contact info if available
-            contact = Contact.query.get(entry.contact_id) if entry.contact_id else None
-            
             blacklist_data.append({
                 'id': entry.id,
                 'phone': entry.phone,
                 'reason': entry.reason,
-                'contact_name': contact.name if contact else None,
+                'contact_name': entry.contact.name if entry.contact else None,
                 'contact_id': entry.contact_id,
-                'blacklisted_by': blacklisted_by_user.first_name if blacklisted_by_user else 'System',
+                'blacklisted_by': entry.blacklister.first_name if entry.blacklister else 'System',
                 'created_at': entry.created_at.isoformat(),
                 'is_active': entry.is_active
             })
@@ -150,14 +153,7 @@ def get_blacklist():
         return jsonify({
             'success': True,
             'blacklist': blacklist_data,
-            'pagination': {
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'total': pagination.total,
-                'per_page': pagination.per_page,
-                'has_next': pagination.has_next,
-                'has_prev': pagination.has_prev
-            }
+            'pagination': pagination.to_dict()
         })
         
     except Exception as e:
@@ -193,11 +189,12 @@ def admin_add_to_blacklist():
         db.session.add(blacklist_entry)
         
         # Update any existing contacts with this phone number
-        contacts = Contact.query.filter_by(phone=phone).all()
+        contacts = Contact.query.filter_by(phone_normalized=normalize_phone(phone)).all()
         for contact in contacts:
             contact.is_blacklisted = True
         
         db.session.commit()
+        blacklist_index.add(phone, reason=reason)
         
         return jsonify({
             'success': True,
@@ -223,9 +220,10 @@ def admin_remove_from_blacklist(entry_id):
         # Deactivate entry
         blacklist_entry.is_active = False
         db.session.commit()
+        blacklist_index.remove(blacklist_entry.phone, blacklist_entry.campaign_id)
         
         # Update related contacts
-        contacts = Contact.query.filter_by(phone=blacklist_entry.phone).all()
+        contacts = Contact.query.filter_by(phone_normalized=normalize_phone(blacklist_entry.phone)).all()
         for contact in contacts:
             contact.is_blacklisted = False
         
@@ -264,7 +262,7 @@ def bulk_remove_from_blacklist():
                 blacklist_entry.is_active = False
                 
                 # Update related contacts
-                contacts = Contact.query.filter_by(phone=blacklist_entry.phone).all()
+                contacts = Contact.query.filter_by(phone_normalized=normalize_phone(blacklist_entry.phone)).all()
                 for contact in contacts:
                     contact.is_blacklisted = False
                     updated_contacts_count += 1
@@ -272,6 +270,7 @@ def bulk_remove_from_blacklist():
                 removed_count += 1
         
         db.session.commit()
+        blacklist_index.invalidate()
         
         return jsonify({
             'success': True,
@@ -296,6 +295,9 @@ def import_blacklist():
         import os
         import uuid
         from werkzeug.utils import secure_filename
+        from sqlalchemy import update, any_, bindparam
+        from sqlalchemy.dialects.postgresql import ARRAY
+        from app.utils.timezone_utils import get_local_now
         
         if 'file' not in request.files:
             return jsonify({'success': False, 'error': 'No file provided'}), 400
@@ -328,43 +330,48 @@ def import_blacklist():
             if 'phone' not in df.columns:
                 return jsonify({'success': False, 'error': 'File must contain "phone" column'}), 400
             
-            # Process phone numbers
-            imported_count = 0
-            skipped_count = 0
+            # Normalise and deduplicate phone numbers (vectorised)
+            frame = pd.DataFrame({
+                'phone': df['phone'].astype(str).str.strip(),
+                'reason': df['reason'].fillna('Bulk import').astype(str) if 'reason' in df.columns else 'Bulk import'
+            })
+            frame['normalized'] = frame['phone'].map(blacklist_index.normalize_phone)
+            frame = frame[frame['normalized'] != ''].drop_duplicates(subset='normalized')
             
-            for _, row in df.iterrows():
-                phone = str(row['phone']).strip()
-                reason = row.get('reason', 'Bulk import')
-                
-                # Skip empty phones
-                if not phone or phone == 'nan':
-                    skipped_count += 1
-                    continue
-                
-                # Check if already blacklisted
-                existing = BlacklistEntry.query.filter_by(phone=phone, is_active=True).first()
-                if existing:
-                    skipped_count += 1
-                    continue
+            # Diff against active global blacklist (in-memory index)
+            already_blacklisted = blacklist_index.is_blacklisted_many(frame['phone'])
+            new_entries = frame[~frame['phone'].isin(list(already_blacklisted))]
+            
+            imported_count = len(new_entries)
+            skipped_count = len(df) - imported_count
+            
+            if imported_count:
+                now = get_local_now()
+                db.session.bulk_insert_mappings(BlacklistEntry, [{
+                    'phone': phone,
+                    'reason': reason,
+                    'blacklisted_by': current_user.id,
+                    'is_active': True,
+                    'created_at': now,
+                    'updated_at': now
+                } for phone, reason in zip(new_entries['phone'], new_entries['reason'])])
                 
-                # Add to blacklist
-                blacklist_entry = BlacklistEntry(
-                    phone=phone,
-                    reason=reason,
-                    blacklisted_by=current_user.id
+                # Mark related contacts in one statement (indexed phone_normalized)
+                phones = new_entries['normalized'].tolist()
+                if db.engine.dialect.name == 'postgresql':
+                    phone_match = Contact.phone_normalized == any_(bindparam('phones', value=phones, type_=ARRAY(db.String)))
+                else:
+                    phone_match = Contact.phone_normalized.in_(phones)
+                db.session.execute(
+                    update(Contact).where(phone_match).values(is_blacklisted=True)
+                    .execution_options(synchronize_session=False)
                 )
-                
-                db.session.add(blacklist_entry)
-                
-                # Update related contacts
-                contacts = Contact.query.filter_by(phone=phone).all()
-                for contact in contacts:
-                    contact.is_blacklisted = True
-                
-                imported_count += 1
             
             db.session.commit()
             
+            for phone, reason in zip(new_entries['phone'], new_entries['reason']):
+                blacklist_index.add(phone, reason=reason)
+            
             return jsonify({
                 'success': True,
                 'message': f'Successfully imported {imported_count} phone numbers to blacklist',
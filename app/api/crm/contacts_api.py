@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from functools import wraps
 from app.models.crm_model import Contact, Call
+from app.utils.pagination_utils import paginate_keyset
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,6 +32,7 @@ def get_contacts():
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        cursor = request.args.get('cursor', type=str)
         
         # Get contacts assigned to current ankieter
         contacts_query = Contact.query.filter_by(assigned_ankieter_id=current_user.id)
@@ -50,10 +52,9 @@ def get_contacts():
                     Contact.call_attempts >= Contact.max_call_attempts
                 )
         
-        contacts_pagination = contacts_query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
+        contacts_pagination = paginate_keyset(
+            contacts_query, Contact.created_at, Contact.id,
+            per_page=per_page, cursor=cursor, page=page
         )
         
         contacts = []
@@ -76,14 +77,7 @@ def get_contacts():
         return jsonify({
             'success': True,
             'contacts': contacts,
-            'pagination': {
-                'page': contacts_pagination.page,
-                'per_page': contacts_pagination.per_page,
-                'total': contacts_pagination.total,
-                'pages': contacts_pagination.pages,
-                'has_next': contacts_pagination.has_next,
-                'has_prev': contacts_pagination.has_prev
-            }
+            'pagination': contacts_pagination.to_dict()
         })
         
     except Exception as e:
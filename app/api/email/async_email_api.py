@@ -269,6 +269,10 @@ def schedule_event_reminder():
             '5min': timedelta(minutes=5)
         }
         
+        # Podpisz linki do wypisania dla wszystkich uczestników naraz
+        from app.services.unsubscribe_manager import unsubscribe_manager
+        unsubscribe_urls = unsubscribe_manager.bulk_get_urls((p.id, p.email) for p in participants)
+        
         for participant in participants:
             for reminder_time in reminder_times:
                 if reminder_time not in reminder_offsets:
@@ -291,18 +295,7 @@ def schedule_event_reminder():
                 }
                 
                 # Dodaj linki do wypisania
-                try:
-                    from app.services.unsubscribe_manager import unsubscribe_manager
-                    context.update({
-                        'unsubscribe_url': unsubscribe_manager.get_unsubscribe_url(participant.email),
-                        'delete_account_url': unsubscribe_manager.get_delete_account_url(participant.email)
-                    })
-                except Exception as e:
-                    logger.warning(f"⚠️ Błąd generowania linków unsubscribe: {e}")
-                    context.update({
-                        'unsubscribe_url': 'mailto:kontakt@klublepszezycie.pl',
-                        'delete_account_url': 'mailto:kontakt@klublepszezycie.pl'
-                    })
+                context.update(unsubscribe_urls[participant.email])
                 
                 # Dodaj do kolejki
                 success, message, email_id = email_cron_service.add_email_to_queue(
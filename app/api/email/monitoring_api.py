@@ -283,6 +283,29 @@ def get_system_health():
             'error': str(e)
         }), 500
 
+@email_monitoring_bp.route('/email/monitor/rate-limits', methods=['GET'])
+@login_required
+def get_rate_limits():
+    """Pobiera aktualną dostępność współdzielonych limitów wysyłki"""
+    try:
+        processor = EmailQueueProcessor()
+        
+        return jsonify({
+            'success': True,
+            'rate_limits': {
+                'mailgun': dict(processor.mailgun.get_rate_limit_status(), available=processor.mailgun.is_available()),
+                'smtp': dict(processor.smtp.get_rate_limit_status(), available=processor.smtp.is_available())
+            },
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        logger.error(f"❌ Błąd pobierania limitów wysyłki: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @email_monitoring_bp.route('/email/monitor/daily-stats', methods=['GET'])
 @login_required
 def get_daily_stats():
@@ -7,6 +7,7 @@ from app.models import EmailQueue, db
 from app.services.email_v2 import EmailManager
 from app.services.email_v2.queue.processor import EmailQueueProcessor
 from app.utils.timezone_utils import get_local_now
+from app.utils.pagination_utils import paginate_keyset
 import logging
 
 email_queue_bp = Blueprint('email_queue_api', __name__)
@@ -19,6 +20,7 @@ def get_queue():
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        cursor = request.args.get('cursor', type=str)
         filter_status = request.args.get('filter', 'all')
         
         # Buduj zapytanie
@@ -27,14 +29,10 @@ def get_queue():
         if filter_status != 'all':
             query = query.filter_by(status=filter_status)
         
-        # Sortuj po dacie utworzenia
-        query = query.order_by(EmailQueue.created_at.desc())
-        
-        # Paginacja
-        pagination = query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
+        # Paginacja keyset po dacie utworzenia
+        pagination = paginate_keyset(
+            query, EmailQueue.created_at, EmailQueue.id,
+            per_page=per_page, cursor=cursor, page=page
         )
         
         emails = []
@@ -58,16 +56,7 @@ def get_queue():
         return jsonify({
             'success': True,
             'emails': emails,
-            'pagination': {
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'per_page': pagination.per_page,
-                'total': pagination.total,
-                'has_next': pagination.has_next,
-                'has_prev': pagination.has_prev,
-                'next_num': pagination.next_num,
-                'prev_num': pagination.prev_num
-            }
+            'pagination': pagination.to_dict()
         })
     except Exception as e:
         logger.error(f"❌ Błąd pobierania kolejki: {e}")
@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from app.models import EventSchedule, User, db
 from app.utils.auth_utils import admin_required, admin_required_api
+from app.services.seo_cache import SEOCache
 import logging
 from datetime import datetime
 
@@ -268,6 +269,7 @@ def update_event(event_id):
             event.is_archived = data['is_archived']
         
         db.session.commit()
+        SEOCache.invalidate('event', event_id)
         
         # Jeśli data wydarzenia się zmieniła i przypomnienia były zaplanowane, reschedule
         reschedule_message = None
@@ -314,6 +316,7 @@ def delete_event(event_id):
         
         db.session.delete(event)
         db.session.commit()
+        SEOCache.invalidate('event', event_id)
         
         return jsonify({
             'success': True,
@@ -410,6 +413,7 @@ def bulk_delete_events():
             db.session.delete(event)
         
         db.session.commit()
+        SEOCache.invalidate('event')
         
         return jsonify({
             'success': True,
@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from app.models import EventSchedule, User, db
 from app.utils.auth_utils import admin_required, admin_required_api
+from app.services.seo_cache import SEOCache
 import logging
 from datetime import datetime
 
@@ -178,6 +179,7 @@ def update_schedule(schedule_id):
         
         schedule.updated_at = datetime.utcnow()
         db.session.commit()
+        SEOCache.invalidate('event', schedule_id)
         
         # Jeśli data wydarzenia się zmieniła i przypomnienia były zaplanowane, reschedule
         reschedule_message = None
@@ -269,6 +271,7 @@ def delete_schedule(schedule_id):
         
         db.session.delete(schedule)
         db.session.commit()
+        SEOCache.invalidate('event', schedule_id)
         
         return jsonify({
             'success': True,
@@ -347,6 +350,7 @@ def bulk_delete_schedules():
             db.session.delete(schedule)
         
         db.session.commit()
+        SEOCache.invalidate('event')
         
         return jsonify({
             'success': True,
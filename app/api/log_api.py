@@ -4,8 +4,6 @@ from app import db
 from app.models.email_model import EmailLog
 from app.models.events_model import EventSchedule
 from app.models.email_model import EmailTemplate, EmailCampaign
-from sqlalchemy import desc, or_, and_, func
-from datetime import datetime, timedelta
 
 log_bp = Blueprint('log_api', __name__)
 
@@ -27,103 +25,33 @@ def get_logs():
         event_id = request.args.get('event_id', '')
         campaign_id = request.args.get('campaign_id', '')
         template_id = request.args.get('template_id', '')
-        
-        query = EmailLog.query
-        
-        # Apply filters
-        if search:
-            query = query.filter(
-                or_(
-                    EmailLog.email.ilike(f'%{search}%'),
-                    EmailLog.subject.ilike(f'%{search}%'),
-                    EmailLog.error_message.ilike(f'%{search}%')
-                )
-            )
-        
-        if status and status != 'all':
-            query = query.filter_by(status=status)
-        
-        if event_id:
-            query = query.filter_by(event_id=event_id)
-        
-        if campaign_id:
-            query = query.filter_by(campaign_id=campaign_id)
-        
-        if template_id:
-            query = query.filter_by(template_id=template_id)
-        
-        if date_from:
-            try:
-                date_from_obj = datetime.fromisoformat(date_from)
-                query = query.filter(EmailLog.sent_at >= date_from_obj)
-            except ValueError:
-                pass
-        
-        if date_to:
-            try:
-                date_to_obj = datetime.fromisoformat(date_to + ' 23:59:59')
-                query = query.filter(EmailLog.sent_at <= date_to_obj)
-            except ValueError:
-                pass
-        
-        # Time filters
-        if time_from:
-            try:
-                time_from_obj = datetime.strptime(time_from, '%H:%M').time()
-                query = query.filter(EmailLog.sent_at.cast(db.Time) >= time_from_obj)
-            except ValueError:
-                pass
-        
-        if time_to:
-            try:
-                time_to_obj = datetime.strptime(time_to, '%H:%M').time()
-                query = query.filter(EmailLog.sent_at.cast(db.Time) <= time_to_obj)
-            except ValueError:
-                pass
-        
-        # Pagination
-        pagination = query.order_by(desc(EmailLog.sent_at)).paginate(
-            page=page, per_page=per_page, error_out=False
+        cursor = request.args.get('cursor', '')  # Keyset cursor (next_cursor z poprzedniej strony)
+        
+        from app.services.log_service import LogService
+        logs, pagination = LogService.get_logs(
+            filters={
+                'search': search,
+                'status': status,
+                'date_from': date_from,
+                'date_to': date_to,
+                'time_from': time_from,
+                'time_to': time_to,
+                'event_id': event_id,
+                'campaign_id': campaign_id,
+                'template_id': template_id
+            },
+            page=page,
+            per_page=per_page,
+            cursor=cursor or None
         )
         
-        logs = []
-        for log in pagination.items:
-            # Get event info
-            event_info = None
-            if log.event_id:
-                event = EventSchedule.query.get(log.event_id)
-                if event:
-                    event_info = {
-                        'id': event.id,
-                        'title': event.title,
-                        'event_date': event.event_date.isoformat() if event.event_date else None
-                    }
-            
-            logs.append({
-                'id': log.id,
-                'email': log.email,
-                'subject': log.subject,
-                'status': log.status,
-                'sent_at': log.sent_at.isoformat() if log.sent_at else None,
-                'error_message': log.error_message,
-                'template_id': log.template_id,
-                'template_name': log.template.name if log.template else f'Usunięty szablon (ID: {log.template_id})',
-                'campaign_id': log.campaign_id,
-                'campaign_name': log.campaign.name if log.campaign else f'Usunięta kampania (ID: {log.campaign_id})' if log.campaign_id else None,
-                'event_id': log.event_id,
-                'event_info': event_info,
-                'recipient_data': log.recipient_data
-            })
+        if 'error' in pagination:
+            return jsonify({'success': False, 'error': pagination['error']}), 500
         
         return jsonify({
             'success': True,
             'logs': logs,
-            'pagination': {
-                'page': pagination.page,
-                'pages': pagination.pages,
-                'total': pagination.total,
-                'per_page': pagination.per_page
-            }
+            'pagination': pagination
         })
         
     except Exception as e:
@@ -197,88 +125,15 @@ def get_log_details(log_id):
 def get_logs_stats():
     """Pobiera statystyki logów emaili z bazy danych"""
     try:
-        # Get database stats
-        total_emails = EmailLog.query.count()
-        
-        # Status breakdown
-        status_stats = db.session.query(
-            EmailLog.status,
-            func.count(EmailLog.id).label('count')
-        ).group_by(EmailLog.status).all()
-        
-        status_breakdown = {status: count for status, count in status_stats}
-        
-        # Today's stats
-        today = datetime.now().date()
-        today_emails = EmailLog.query.filter(
-            func.date(EmailLog.sent_at) == today
-        ).count()
-        
-        # This week's stats
-        week_ago = datetime.now() - timedelta(days=7)
-        week_emails = EmailLog.query.filter(
-            EmailLog.sent_at >= week_ago
-        ).count()
+        from app.services.log_service import LogService
+        stats = LogService.get_logs_stats()
         
-        # This month's stats
-        month_ago = datetime.now() - timedelta(days=30)
-        month_emails = EmailLog.query.filter(
-            EmailLog.sent_at >= month_ago
-        ).count()
-        
-        # Recent activity (last 24 hours)
-        day_ago = datetime.now() - timedelta(hours=24)
-        recent_emails = EmailLog.query.filter(
-            EmailLog.sent_at >= day_ago
-        ).count()
-        
-        # Template stats
-        template_stats = db.session.query(
-            EmailLog.template_id,
-            func.count(EmailLog.id).label('count')
-        ).filter(EmailLog.template_id.isnot(None)).group_by(EmailLog.template_id).order_by(
-            func.count(EmailLog.id).desc()
-        ).limit(10).all()
-        
-        template_breakdown = []
-        for template_id, count in template_stats:
-            template = EmailTemplate.query.get(template_id)
-            template_breakdown.append({
-                'template_id': template_id,
-                'count': count,
-                'template_name': template.name if template else f'Usunięty szablon (ID: {template_id})'
-            })
-        
-        # Event stats
-        event_stats = db.session.query(
-            EmailLog.event_id,
-            func.count(EmailLog.id).label('count')
-        ).filter(EmailLog.event_id.isnot(None)).group_by(EmailLog.event_id).order_by(
-            func.count(EmailLog.id).desc()
-        ).limit(10).all()
-        
-        event_breakdown = []
-        for event_id, count in event_stats:
-            event = EventSchedule.query.get(event_id)
-            event_breakdown.append({
-                'event_id': event_id,
-                'count': count,
-                'event_name': event.title if event else f'Usunięte wydarzenie (ID: {event_id})'
-            })
+        if 'error' in stats:
+            return jsonify({'success': False, 'error': stats['error']}), 500
         
         return jsonify({
             'success': True,
-            'stats': {
-                'total_emails': total_emails,
-                'today_emails': today_emails,
-                'week_emails': week_emails,
-                'month_emails': month_emails,
-                'recent_emails': recent_emails,
-                'status_breakdown': status_breakdown,
-                'template_breakdown': template_breakdown,
-                'event_breakdown': event_breakdown,
-                'last_updated': datetime.now().isoformat()
-            }
+            'stats': stats
         })
         
     except Exception as e:
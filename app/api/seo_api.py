@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 from flask_login import login_required
 from app.models import SEOSettings, db
 from app.utils.auth_utils import admin_required
+from app.services.seo_cache import SEOCache
 import logging
 
 seo_api_bp = Blueprint('seo_api', __name__)
@@ -53,6 +54,7 @@ def api_seo():
             
             db.session.add(seo)
             db.session.commit()
+            SEOCache.invalidate()
             
             return jsonify({
                 'success': True,
@@ -120,6 +122,7 @@ def api_seo_setting(seo_id):
                 seo.is_active = data['is_active']
             
             db.session.commit()
+            SEOCache.invalidate()
             
             return jsonify({
                 'success': True,
@@ -129,6 +132,7 @@ def api_seo_setting(seo_id):
         elif request.method == 'DELETE':
             db.session.delete(seo)
             db.session.commit()
+            SEOCache.invalidate()
             
             return jsonify({
                 'success': True,
@@ -3,10 +3,13 @@ Users API endpoints
 """
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
+from sqlalchemy.orm import selectinload
 from werkzeug.security import check_password_hash
 from app.models import User, UserGroup, db
 from app.utils.auth_utils import admin_required_api, login_required_api
 from app.blueprints.users_controller import UsersController
+from app.utils.pagination_utils import paginate_keyset
+from app.services.user_search import UserSearch
 import logging
 
 users_api_bp = Blueprint('users_api', __name__)
@@ -18,23 +21,12 @@ def api_users():
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        cursor = request.args.get('cursor', type=str)
         search = request.args.get('search', '', type=str)
         
-        query = User.query
+        query = UserSearch.apply_search(User.query, search)
         
-        if search:
-            query = query.filter(
-                db.or_(
-                    User.first_name.ilike(f'%{search}%'),
-                    User.email.ilike(f'%{search}%')
-                )
-            )
-        
-        users = query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
-        )
+        users = paginate_keyset(query, User.created_at, User.id, per_page=per_page, cursor=cursor, page=page)
         
         return jsonify({
             'success': True,
@@ -49,14 +41,7 @@ def api_users():
                 'created_at': user.created_at.isoformat() if user.created_at else None,
                 'last_login': user.last_login.isoformat() if user.last_login else None
             } for user in users.items],
-            'pagination': {
-                'page': users.page,
-                'pages': users.pages,
-                'per_page': users.per_page,
-                'total': users.total,
-                'has_next': users.has_next,
-                'has_prev': users.has_prev
-            }
+            'pagination': users.to_dict()
         })
     except Exception as e:
         logging.error(f"Error getting users: {str(e)}")
@@ -86,15 +71,12 @@ def api_users_for_event_group(event_id):
             ~User.id.in_(registered_user_ids)
         )
         
-        if search:
-            query = query.filter(
-                db.or_(
-                    User.first_name.ilike(f'%{search}%'),
-                    User.email.ilike(f'%{search}%')
-                )
-            )
-        
-        users = query.all()
+        if search.strip():
+            # Autouzupełnianie: ranking i limit zamiast wszystkich dopasowań
+            limit = request.args.get('limit', type=int)
+            users = UserSearch.search(search, limit=limit, query=query, with_registrations=True)
+        else:
+            users = query.options(selectinload(User.event_registrations)).all()
         
         return jsonify({
             'success': True,
@@ -120,12 +102,8 @@ def api_search_users():
         if not query:
             return jsonify({'success': True, 'users': []})
         
-        users = User.query.filter(
-            db.or_(
-                User.first_name.ilike(f'%{query}%'),
-                User.email.ilike(f'%{query}%')
-            )
-        ).limit(10).all()
+        limit = request.args.get('limit', type=int)
+        users = UserSearch.search(query, limit=limit)
         
         return jsonify({
             'success': True,
@@ -471,101 +449,15 @@ def api_bulk_delete_users():
         if not user_ids:
             return jsonify({'success': False, 'message': 'No users selected'}), 400
         
-        deleted_count = 0
-        deleted_users = []  # Store user info for group synchronization
-        
-        # Remove users from all groups before deleting them
-        from app.services.group_manager import GroupManager
-        group_manager = GroupManager()
-        
-        for user_id in user_ids:
-            user = User.query.get(user_id)
-            if user:
-                # Store user info before deletion
-                deleted_users.append({
-                    'id': user.id,
-                    'email': user.email,
-                    'club_member': user.club_member
-                })
-                
-                # Remove user from all groups before deleting
-                try:
-                    from app.models import UserGroupMember
-                    user_memberships = UserGroupMember.query.filter_by(
-                        user_id=user.id,
-                        is_active=True
-                    ).all()
-                    
-                    print(f"🔍 Bulk delete: Usuwanie użytkownika {user.email} (ID: {user.id}) z {len(user_memberships)} grup")
-                    
-                    # Remove from each group
-                    for membership in user_memberships:
-                        group = membership.group
-                        if group:
-                            print(f"🔍 Bulk delete: Usuwanie z grupy: {group.name}")
-                            success, message = group_manager.remove_user_from_group(group.id, user.id)
-                            if success:
-                                print(f"✅ Bulk delete: Usunięto z grupy: {group.name}")
-                            else:
-                                print(f"❌ Bulk delete: Błąd usuwania z grupy {group.name}: {message}")
-                                
-                except Exception as group_error:
-                    print(f"❌ Bulk delete: Błąd usuwania użytkownika {user.email} z grup: {str(group_error)}")
-                
-                # Delete EventRegistrations for this user
-                try:
-                    from app.models import EventRegistration
-                    event_registrations = EventRegistration.query.filter_by(user_id=user.id).all()
-                    for reg in event_registrations:
-                        db.session.delete(reg)
-                    print(f"📋 Bulk delete: Usunięto {len(event_registrations)} rejestracji na wydarzenia dla {user.email}")
-                except Exception as reg_error:
-                    print(f"❌ Bulk delete: Błąd usuwania rejestracji: {str(reg_error)}")
-                
-                # Delete email queue items for this user
-                try:
-                    from app.models import EmailQueue
-                    email_queue_items = EmailQueue.query.filter_by(
-                        recipient_email=user.email,
-                        status='pending'
-                    ).all()
-                    
-                    for queue_item in email_queue_items:
-                        db.session.delete(queue_item)
-                    
-                    print(f"📧 Bulk delete: Usunięto {len(email_queue_items)} e-maili z kolejki dla {user.email}")
-                except Exception as email_error:
-                    print(f"❌ Bulk delete: Błąd usuwania e-maili: {str(email_error)}")
-                
-                db.session.delete(user)
-                deleted_count += 1
-        
-        db.session.commit()
-        
-        # Synchronize groups after bulk deletion
-        if deleted_users:
-            try:
-                
-                # Synchronize club members group
-                success, message = group_manager.sync_club_members_group()
-                if success:
-                    print(f"✅ Zsynchronizowano grupę członków klubu po bulk delete ({deleted_count} użytkowników)")
-                else:
-                    print(f"❌ Błąd synchronizacji grupy członków klubu: {message}")
-                
-                # Synchronize event groups
-                success, message = group_manager.sync_event_groups()
-                if success:
-                    print(f"✅ Zsynchronizowano grupy wydarzeń po bulk delete ({deleted_count} użytkowników)")
-                else:
-                    print(f"❌ Błąd synchronizacji grup wydarzeń: {message}")
-                    
-            except Exception as sync_error:
-                print(f"❌ Błąd synchronizacji grup po bulk delete: {str(sync_error)}")
+        from app.services.user_bulk_deletion import UserBulkDeletion
+        result = UserBulkDeletion.delete_users(user_ids)
+        deleted_count = result['deleted_count']
         
         return jsonify({
             'success': True,
-            'message': f'Successfully deleted {deleted_count} users'
+            'message': f'Successfully deleted {deleted_count} users',
+            'deleted_count': deleted_count,
+            'timings': result['timings']
         })
     except Exception as e:
         db.session.rollback()
@@ -95,6 +95,9 @@ class AdminController:
             
             db.session.commit()
             
+            from app.services.crm_blacklist_index import blacklist_index
+            blacklist_index.invalidate()
+            
             return {
                 'success': True,
                 'message': f'Usunięto wszystkie dane CRM: {contacts_count} kontaktów, {calls_count} połączeń, {imports_count} importów, {blacklist_count} wpisów z czarnej listy'
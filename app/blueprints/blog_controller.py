@@ -4,6 +4,10 @@ Blog business logic controller
 from flask import request, jsonify, flash, redirect, url_for
 from flask_login import login_required, current_user
 from app.models import db, BlogCategory, BlogPost, BlogTag, BlogComment, User
+from app.services.blog_search import BlogSearch
+from app.services.blog_comments import CommentTree
+from app.services.category_tree import category_tree
+from app.services.blog_listing import listing_query, listing_options, sidebar_categories, sidebar_tags
 from datetime import datetime
 from sqlalchemy import and_, or_
 import re
@@ -23,12 +27,12 @@ class BlogController:
     def get_blog_posts(page=1, per_page=10, category_slug=None, tag_slug=None, search=None):
         """Get blog posts with filters"""
         try:
-            # Get published posts
-            posts_query = BlogPost.query.filter_by(status='published').order_by(BlogPost.published_at.desc())
+            # Get published posts (listing columns only, relations loaded in bulk)
+            posts_query = listing_query().order_by(BlogPost.published_at.desc())
             
             # Filter by category if specified
             if category_slug:
-                category = BlogCategory.query.filter_by(slug=category_slug, is_active=True).first()
+                category = category_tree.by_slug(category_slug)
                 if category:
                     posts_query = posts_query.join(BlogPost.categories).filter(BlogCategory.id == category.id)
                 else:
@@ -54,22 +58,20 @@ class BlogController:
                         'tags': []
                     }
             
-            # Search functionality
+            # Search functionality (full-text, ordered by relevance)
             if search:
-                posts_query = posts_query.filter(
-                    or_(
-                        BlogPost.title.ilike(f'%{search}%'),
-                        BlogPost.content.ilike(f'%{search}%'),
-                        BlogPost.excerpt.ilike(f'%{search}%')
-                    )
-                )
+                posts_query = BlogSearch.apply(posts_query, search)
             
             # Paginate
             posts = posts_query.paginate(page=page, per_page=per_page, error_out=False)
             
+            # Highlighted fragments only for the current page
+            if search:
+                BlogSearch.attach_snippets(posts.items, search)
+            
             # Get categories and tags for sidebar
-            categories = BlogCategory.query.filter_by(is_active=True).order_by(BlogCategory.title).all()
-            tags = BlogTag.query.filter_by(is_active=True).order_by(BlogTag.name).all()
+            categories = sidebar_categories()
+            tags = sidebar_tags()
             
             return {
                 'success': True,
@@ -106,7 +108,7 @@ class BlogController:
             related_posts = []
             if post.categories:
                 category_ids = [cat.id for cat in post.categories]
-                related_posts = BlogPost.query.filter(
+                related_posts = BlogPost.query.options(*listing_options()).filter(
                     BlogPost.id != post.id,
                     BlogPost.status == 'published',
                     BlogPost.categories.any(BlogCategory.id.in_(category_ids))
@@ -127,11 +129,14 @@ class BlogController:
     
     @staticmethod
     def create_blog_comment(post_id, name, email, content, parent_id=None):
-        """Create blog comment with user tracking"""
+        """Create blog comment with user tracking
+        
+        Only the comment row is written inside the request. Browser/OS/location
+        enrichment and admin notifications run in the background job pipeline.
+        """
         try:
-            from app.utils.user_info_utils import get_user_info
-            from app.utils.user_agent_parser import UserAgentParser
-            from app.utils.ip_geolocation import IPGeolocation
+            from app.utils.user_info_utils import get_client_ip
+            from app.services.background_jobs import job_pipeline
             
             post = BlogPost.query.get(post_id)
             if not post:
@@ -140,15 +145,8 @@ class BlogController:
                     'error': 'Post nie został znaleziony'
                 }
             
-            # Get user information
-            user_info = get_user_info()
-            
-            # Parse user agent for better browser/OS detection
-            ua_parser = UserAgentParser()
-            parsed_ua = ua_parser.parse(user_info['user_agent'])
-            
-            # Get location information
-            location_info = IPGeolocation.get_location(user_info['ip_address'])
+            ip_address = get_client_ip()
+            user_agent = request.headers.get('User-Agent', '')
             
             comment = BlogComment(
                 post_id=post_id,
@@ -156,63 +154,21 @@ class BlogController:
                 author_name=name,
                 author_email=email,
                 content=content,
-                ip_address=user_info['ip_address'],
-                user_agent=user_info['user_agent'],
-                browser=ua_parser.get_browser_display_name(parsed_ua['browser'], parsed_ua['browser_version']),
-                operating_system=ua_parser.get_os_display_name(parsed_ua['os'], parsed_ua['os_version']),
-                location_country=location_info['country'],
-                location_city=location_info['city'],
+                ip_address=ip_address,
+                user_agent=user_agent,
                 is_approved=False
             )
             
             db.session.add(comment)
             db.session.commit()
             
-            # Send notification email to admin about new comment
-            try:
-                from app.services.email_v2 import EmailManager
-                from app.utils.timezone_utils import get_local_now
-                import os
-                
-                email_manager = EmailManager()
-                
-                # Get admin emails (users with admin role)
-                from app.models import User
-                admin_users = User.query.filter_by(role='admin', is_active=True).all()
-                
-                if admin_users:
-                    # Prepare email context
-                    base_url = os.getenv('BASE_URL', 'https://klublepszezycie.pl')
-                    moderation_url = f"{base_url}/admin/blog/comments"
-                    post_url = f"{base_url}/blog/{post.slug}"
-                    
-                    context = {
-                        'post_title': post.title,
-                        'post_url': post_url,
-                        'comment_author': name,
-                        'comment_email': email,
-                        'comment_content': content,
-                        'comment_date': get_local_now().strftime('%d.%m.%Y %H:%M'),
-                        'comment_ip': user_info['ip_address'],
-                        'comment_browser': ua_parser.get_browser_display_name(parsed_ua['browser'], parsed_ua['browser_version']),
-                        'moderation_url': moderation_url
-                    }
-                    
-                    # Send to all admin users
-                    for admin in admin_users:
-                        success, message = email_manager.send_template_email(
-                            to_email=admin.email,
-                            template_name='comment_moderation',
-                            context=context,
-                            to_name=admin.first_name or 'Administratorze'
-                        )
-                        
-                        if not success:
-                            print(f"Błąd wysyłania emaila do {admin.email}: {message}")
-                        
-            except Exception as email_error:
-                # Don't fail comment creation if email fails
-                print(f"Błąd wysyłania powiadomienia o komentarzu: {str(email_error)}")
+            # Post-commit side effects - don't fail comment creation if they can't be queued
+            job_pipeline.enqueue('blog_comment_enrichment', {
+                'comment_id': comment.id,
+                'ip_address': ip_address,
+                'user_agent': user_agent
+            })
+            job_pipeline.enqueue('blog_comment_notification', {'comment_id': comment.id})
             
             return {
                 'success': True,
@@ -226,6 +182,81 @@ class BlogController:
                 'error': str(e)
             }
     
+    @staticmethod
+    def enrich_comment_metadata(comment_id, ip_address=None, user_agent=None):
+        """Fill browser, OS and location of a comment (background job)"""
+        from app.utils.user_agent_parser import UserAgentParser
+        from app.utils.ip_geolocation import IPGeolocation
+        
+        comment = BlogComment.query.get(comment_id)
+        if not comment:
+            return
+        
+        browser, operating_system = UserAgentParser.get_display_names(
+            user_agent if user_agent is not None else comment.user_agent
+        )
+        location_info = IPGeolocation.get_location(ip_address or comment.ip_address)
+        
+        comment.browser = browser
+        comment.operating_system = operating_system
+        comment.location_country = location_info['country']
+        comment.location_city = location_info['city']
+        db.session.commit()
+    
+    @staticmethod
+    def notify_admins_about_comment(comment_id, admin_id=None):
+        """Send moderation notification about new comment to admins (background job)
+        
+        Without admin_id the job fans out into one job per admin, so a failed
+        delivery is retried only for that admin. Raises on failure so the job
+        pipeline can retry it.
+        """
+        from app.services.email_v2 import EmailManager
+        from app.utils.user_agent_parser import UserAgentParser
+        from app.utils.timezone_utils import get_local_now
+        from app.services.background_jobs import job_pipeline
+        import os
+        
+        comment = BlogComment.query.get(comment_id)
+        if not comment or not comment.post:
+            return
+        
+        if admin_id is None:
+            admin_ids = [row.id for row in db.session.query(User.id).filter_by(role='admin', is_active=True)]
+            for admin_id in admin_ids:
+                job_pipeline.enqueue('blog_comment_notification', {'comment_id': comment_id, 'admin_id': admin_id})
+            return
+        
+        admin = db.session.get(User, admin_id)
+        if not admin or not admin.is_active or admin.role != 'admin':
+            return
+        
+        post = comment.post
+        browser = comment.browser or UserAgentParser.get_display_names(comment.user_agent)[0]
+        
+        # Prepare email context
+        base_url = os.getenv('BASE_URL', 'https://klublepszezycie.pl')
+        context = {
+            'post_title': post.title,
+            'post_url': f"{base_url}/blog/{post.slug}",
+            'comment_author': comment.author_name,
+            'comment_email': comment.author_email,
+            'comment_content': comment.content,
+            'comment_date': get_local_now().strftime('%d.%m.%Y %H:%M'),
+            'comment_ip': comment.ip_address,
+            'comment_browser': browser,
+            'moderation_url': f"{base_url}/admin/blog/comments",
+            'admin_name': admin.first_name or 'Administratorze'
+        }
+        
+        success, message = EmailManager().send_template_email(
+            to_email=admin.email,
+            template_name='comment_moderation',
+            context=context
+        )
+        if not success:
+            raise RuntimeError(f"Błąd wysyłania powiadomienia o komentarzu do {admin.email}: {message}")
+    
     @staticmethod
     def get_admin_posts(page=1, per_page=20, status=None, search=None):
         """Get posts for admin panel"""
@@ -403,7 +434,7 @@ class BlogController:
     def get_categories():
         """Get all categories"""
         try:
-            categories = BlogCategory.query.filter_by(is_active=True).order_by(BlogCategory.title).all()
+            categories = sidebar_categories()
             return {
                 'success': True,
                 'categories': categories
@@ -436,14 +467,10 @@ class BlogController:
     
     @staticmethod
     def get_tags():
-        """Get all tags with their posts"""
+        """Get all tags with their post counts"""
         try:
-            tags = BlogTag.query.filter_by(is_active=True).order_by(BlogTag.name).all()
-            
-            # Load posts for each tag to avoid N+1 queries
-            for tag in tags:
-                # This will load the posts relationship
-                _ = tag.posts
+            # Post counts come from the stored posts_count column - no posts are loaded
+            tags = sidebar_tags()
             
             return {
                 'success': True,
@@ -502,24 +529,8 @@ class BlogController:
     def get_post_comments(post_id, approved_only=True):
         """Get comments for a specific post with replies"""
         try:
-            query = BlogComment.query.filter_by(post_id=post_id)
-            
-            if approved_only:
-                query = query.filter_by(is_approved=True)
-            
-            # Get only top-level comments (no parent)
-            comments = query.filter(BlogComment.parent_id.is_(None)).order_by(BlogComment.created_at.asc()).all()
-            
-            # For each comment, get its approved replies
-            for comment in comments:
-                if approved_only:
-                    comment.replies = query.filter(
-                        BlogComment.parent_id == comment.id
-                    ).order_by(BlogComment.created_at.asc()).all()
-                else:
-                    comment.replies = BlogComment.query.filter(
-                        BlogComment.parent_id == comment.id
-                    ).order_by(BlogComment.created_at.asc()).all()
+            # Whole thread in one query, replies assembled in memory
+            comments = CommentTree.load(post_id, approved_only=approved_only)
             
             return {
                 'success': True,
@@ -534,9 +545,12 @@ class BlogController:
     
     @staticmethod
     def get_post_url_with_category(post):
-        """Get post URL with primary category"""
+        """Get post URL with primary category (hierarchy from the in-memory category tree)"""
         if post.categories:
             primary_category = post.categories[0]
+            url = category_tree.category_url(primary_category.id)
+            if url:
+                return f"{url}/{post.slug}"
             if primary_category.parent:
                 return f"/blog/category/{primary_category.parent.slug}/{primary_category.slug}/{post.slug}"
             else:
@@ -545,7 +559,10 @@ class BlogController:
     
     @staticmethod
     def get_category_url_with_hierarchy(category):
-        """Get category URL with hierarchy"""
+        """Get category URL with hierarchy (from the in-memory category tree)"""
+        url = category_tree.category_url(category.id)
+        if url:
+            return url
         if category.parent:
             return f"/blog/category/{category.parent.slug}/{category.slug}"
         return f"/blog/category/{category.slug}"
\ No newline at end of file
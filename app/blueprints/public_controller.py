@@ -313,6 +313,66 @@ class PublicController:
                 'error': str(e)
             }
     
+    @staticmethod
+    def finalize_event_registration(user_id, event_id):
+        """Synchronize event group and send confirmation email (background job)
+        
+        Raises when the confirmation email can't be queued so the job pipeline retries it.
+        """
+        from app.models import UserGroup
+        from app.services.group_manager import GroupManager
+        from app.services.unsubscribe_manager import unsubscribe_manager
+        
+        user = User.query.get(user_id)
+        event = EventSchedule.query.get(event_id)
+        if not user or not event:
+            logging.warning(f"⚠️ Pominięto finalizację rejestracji: user={user_id}, event={event_id}")
+            return
+        
+        # Get or create event group
+        event_group = UserGroup.query.filter_by(group_type='event_based', event_id=event_id).first()
+        if not event_group:
+            event_group = UserGroup(
+                name=f"Wydarzenie: {event.title}",
+                description=f"Grupa uczestników wydarzenia: {event.title}",
+                group_type='event_based',
+                event_id=event_id
+            )
+            db.session.add(event_group)
+            db.session.commit()
+            logging.info(f"✅ Event group created: {event_group.name}")
+        
+        # Synchronize event group
+        try:
+            success, message = GroupManager().async_sync_event_group(event_id)
+            if success:
+                logging.info(f"✅ Group synchronized: {message}")
+            else:
+                logging.error(f"❌ Group synchronization error: {message}")
+        except Exception as sync_error:
+            db.session.rollback()
+            logging.error(f"❌ Failed to sync group: {sync_error}", exc_info=True)
+        
+        # Send confirmation email
+        context = {
+            'user_name': user.first_name,
+            'event_title': event.title,
+            'event_date': event.event_date.strftime('%d.%m.%Y') if event.event_date else '',
+            'event_time': event.event_date.strftime('%H:%M') if event.event_date else '',
+            'event_location': event.location or 'Online',
+            'event_description': event.description or '',
+            **unsubscribe_manager.get_urls_for_user(user.id)
+        }
+        
+        success, message = EmailManager().send_template_email(
+            to_email=user.email,
+            template_name='event_registration',
+            context=context
+        )
+        if not success:
+            raise RuntimeError(f"Failed to send confirmation email: {message}")
+        logging.info(f"✅ Confirmation email sent to {user.email}")
+    
     @staticmethod
     def subscribe_to_newsletter(email, name=None):
         """Subscribe to newsletter"""
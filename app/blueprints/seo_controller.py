@@ -4,6 +4,7 @@ SEO business logic controller
 from flask import request
 from flask_login import login_required, current_user
 from app.models import db, SEOSettings
+from app.services.seo_cache import SEOCache
 from datetime import datetime
 
 class SEOController:
@@ -79,6 +80,7 @@ class SEOController:
             
             db.session.add(seo)
             db.session.commit()
+            SEOCache.invalidate()
             
             return {
                 'success': True,
@@ -124,6 +126,7 @@ class SEOController:
             setting.updated_at = __import__('app.utils.timezone_utils', fromlist=['get_local_now']).get_local_now()
             
             db.session.commit()
+            SEOCache.invalidate()
             
             return {
                 'success': True,
@@ -150,6 +153,7 @@ class SEOController:
             
             db.session.delete(setting)
             db.session.commit()
+            SEOCache.invalidate()
             
             return {
                 'success': True,
@@ -131,6 +131,45 @@ class Config:
     EMAIL_RETRY_DELAY = int(os.getenv('EMAIL_RETRY_DELAY', 300))
     EMAIL_QUEUE_DELAY = int(os.getenv('EMAIL_QUEUE_DELAY', 2))
     
+    # Background Job Pipeline Settings
+    BACKGROUND_JOB_WORKERS = int(os.getenv('BACKGROUND_JOB_WORKERS', 4))
+    BACKGROUND_JOB_QUEUE_SIZE = int(os.getenv('BACKGROUND_JOB_QUEUE_SIZE', 500))
+    BACKGROUND_JOB_RETRY_INTERVAL = int(os.getenv('BACKGROUND_JOB_RETRY_INTERVAL', 60))
+    
+    # Responsive Image Pipeline Settings (blog image variants, process pool)
+    IMAGE_VARIANT_WIDTHS = os.getenv('IMAGE_VARIANT_WIDTHS', '400,800,1200,1600')
+    IMAGE_VARIANT_FORMATS = os.getenv('IMAGE_VARIANT_FORMATS', 'webp,jpeg')  # webp, jpeg, avif
+    IMAGE_VARIANT_QUALITY = int(os.getenv('IMAGE_VARIANT_QUALITY', 82))
+    IMAGE_PIPELINE_PROCESSES = int(os.getenv('IMAGE_PIPELINE_PROCESSES', 0))  # 0 = min(2, CPU)
+    IMAGE_PIPELINE_TIMEOUT = int(os.getenv('IMAGE_PIPELINE_TIMEOUT', 120))
+    
+    # Sitemap & Feed Settings (static gzip files rebuilt incrementally by cron)
+    SITEMAP_DIR = os.getenv('SITEMAP_DIR', 'instance/sitemaps')
+    SITEMAP_MAX_URLS = int(os.getenv('SITEMAP_MAX_URLS', 50000))
+    FEED_SIZE = int(os.getenv('FEED_SIZE', 20))
+    FEED_TITLE = os.getenv('FEED_TITLE', 'Klub Lepsze Życie - Blog')
+    
+    # SEO Metadata Cache (rendered meta tags and JSON-LD per page type and entity)
+    SEO_CACHE_TTL = int(os.getenv('SEO_CACHE_TTL', 300))
+    SEO_CACHE_SIZE = int(os.getenv('SEO_CACHE_SIZE', 1000))
+    
+    # Social Media Publishing Outbox (background delivery with retries)
+    SOCIAL_PUBLISH_MAX_ATTEMPTS = int(os.getenv('SOCIAL_PUBLISH_MAX_ATTEMPTS', 5))
+    SOCIAL_PUBLISH_BACKOFF = int(os.getenv('SOCIAL_PUBLISH_BACKOFF', 60))  # seconds, doubled per attempt
+    
+    # Blog Category Tree (in-memory snapshot; seconds between version checks against the database)
+    CATEGORY_TREE_CHECK_INTERVAL = int(os.getenv('CATEGORY_TREE_CHECK_INTERVAL', 60))
+    
+    # Retention Settings (chunked cleanup of logs and email queue)
+    RETENTION_CHUNK_SIZE = int(os.getenv('RETENTION_CHUNK_SIZE', 5000))
+    RETENTION_SLEEP_SECONDS = float(os.getenv('RETENTION_SLEEP_SECONDS', 0.1))
+    RETENTION_ARCHIVE_DIR = os.getenv('RETENTION_ARCHIVE_DIR', '')  # empty = no archive
+    
+    # Log Partitioning (monthly partitions of email_logs, user_logs, system_logs)
+    LOG_PARTITION_MONTHS_AHEAD = int(os.getenv('LOG_PARTITION_MONTHS_AHEAD', 3))
+    LOG_PARTITION_RETENTION_MONTHS = int(os.getenv('LOG_PARTITION_RETENTION_MONTHS', 12))  # 0 = keep all
+    LOG_PARTITION_EXPIRE_ACTION = os.getenv('LOG_PARTITION_EXPIRE_ACTION', 'drop')  # drop, detach
+    
     # Group Synchronization Settings
     AUTO_GROUP_SYNC = os.getenv('AUTO_GROUP_SYNC', 'false').lower() == 'true'
     
@@ -52,3 +52,13 @@ BLACKLIST_REASONS = {
     'wrong_number': 'Błędny numer',
     'manual': 'Ręczne dodanie'
 }
+
+# Contact assignment (ContactAssignmentEngine)
+ASSIGNMENT_MIN_BATCH = 5  # Minimum contacts claimed per assignment
+ASSIGNMENT_MAX_BATCH = 50  # Maximum contacts claimed per assignment
+ASSIGNMENT_DEFAULT_BATCH = 10  # Batch size when ankieter has no recent calls
+ASSIGNMENT_RATE_WINDOW_MINUTES = 60  # Window used to measure ankieter dialling rate
+ASSIGNMENT_LOOKAHEAD_MINUTES = 30  # Queue should hold enough contacts for this many minutes
+
+# Blacklist index (BlacklistIndex)
+BLACKLIST_INDEX_TTL_SECONDS = 60  # Rebuild in-memory index after this many seconds
@@ -0,0 +1,154 @@
+"""partition_log_tables_by_month
+
+Opcjonalne partycjonowanie tabel logów miesięcznie (PARTITION BY RANGE):
+- email_logs po sent_at, user_logs i system_logs po created_at
+- partycje <tabela>_pRRRR_MM od najstarszego wpisu do bieżącego miesiąca + MONTHS_AHEAD
+  oraz partycja <tabela>_default (NULL i wartości spoza zakresów)
+- indeksy i klucze obce przenoszone z dotychczasowej tabeli; klucz główny (id)
+  zastąpiony indeksem ix_<tabela>_id (unikalny klucz musiałby zawierać kolumnę partycji),
+  unikalność id zapewnia sekwencja
+
+Włączane zmienną środowiskową LOG_PARTITIONING=true w chwili uruchomienia migracji
+(dane są kopiowane do nowej tabeli - najlepiej w oknie serwisowym). Bez niej migracja
+nic nie zmienia. Kolejne partycje tworzy i wygasza LogPartitionManager
+(app/services/log_partitioning.py, process_email_queue.py --partition-maintenance).
+
+Revision ID: a9d3e6b1c4f7
+Revises: f3a8c2d5b7e9
+Create Date: 2025-10-30 15:26:09.731864
+
+"""
+import os
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d3e6b1c4f7'
+down_revision = 'f3a8c2d5b7e9'
+branch_labels = None
+depends_on = None
+
+# Tabela -> kolumna partycjonowania (zgodne z PARTITIONED_TABLES w log_partitioning.py)
+PARTITIONED_TABLES = {
+    'email_logs': 'sent_at',
+    'user_logs': 'created_at',
+    'system_logs': 'created_at',
+}
+
+MONTHS_AHEAD = int(os.getenv('LOG_PARTITION_MONTHS_AHEAD', 3))
+
+
+def _enabled():
+    return os.getenv('LOG_PARTITIONING', 'false').lower() == 'true'
+
+
+def _month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _is_partitioned(conn, table):
+    return conn.execute(
+        sa.text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:table)"),
+        {'table': table}
+    ).scalar() or False
+
+
+def _table_definition(conn, table):
+    """Indeksy (bez klucza głównego) i klucze obce tabeli"""
+    primary_key = conn.execute(
+        sa.text("SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:table) AND contype = 'p'"),
+        {'table': table}
+    ).scalar()
+    # Indeksy tabeli partycjonowanej mają postać "ON ONLY <tabela>"
+    indexes = [
+        indexdef.replace(' ON ONLY ', ' ON ') for indexname, indexdef in conn.execute(
+            sa.text("SELECT indexname, indexdef FROM pg_indexes "
+                    "WHERE schemaname = current_schema() AND tablename = :table"),
+            {'table': table}
+        )
+        if indexname not in (primary_key, f'ix_{table}_id')
+    ]
+    foreign_keys = conn.execute(
+        sa.text("SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = to_regclass(:table) AND contype = 'f'"),
+        {'table': table}
+    ).all()
+    return indexes, foreign_keys
+
+
+def _rebuild(conn, table, column, partitioned):
+    """Przepisuje tabelę do wersji partycjonowanej (lub z powrotem do zwykłej)"""
+    indexes, foreign_keys = _table_definition(conn, table)
+    old_table = f'{table}_old'
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {old_table}")
+    like = f"LIKE {old_table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMMENTS"
+
+    if partitioned:
+        op.execute(f"CREATE TABLE {table} ({like}) PARTITION BY RANGE ({column})")
+
+        oldest = conn.execute(sa.text(f"SELECT min({column}) FROM {old_table}")).scalar()
+        current = _month_start(date.today())
+        month = _month_start(oldest) if oldest and _month_start(oldest) < current else current
+        last = _add_months(current, MONTHS_AHEAD)
+        while month <= last:
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+            )
+            month = _add_months(month, 1)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    else:
+        op.execute(f"CREATE TABLE {table} ({like})")
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old_table}")
+
+    sequence = conn.execute(sa.text(f"SELECT pg_get_serial_sequence('{old_table}', 'id')")).scalar()
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+
+    op.execute(f"DROP TABLE {old_table}")
+
+    if partitioned:
+        op.execute(f"CREATE INDEX ix_{table}_id ON {table} (id)")
+    else:
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+
+    # Definicje odnoszą się do nazwy tabeli, która wskazuje teraz na nową tabelę
+    for indexdef in indexes:
+        op.execute(indexdef)
+    for name, definition in foreign_keys:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql' or not _enabled():
+        print("ℹ️ Partycjonowanie logów wyłączone (LOG_PARTITIONING != true) - pomijam")
+        return
+
+    conn = op.get_bind()
+    for step, (table, column) in enumerate(PARTITIONED_TABLES.items(), start=1):
+        if _is_partitioned(conn, table):
+            print(f"📋 Krok {step}: {table} jest już partycjonowana - pomijam")
+            continue
+        print(f"📋 Krok {step}: Partycjonowanie {table} po {column}")
+        _rebuild(conn, table, column, partitioned=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    conn = op.get_bind()
+    for step, (table, column) in enumerate(PARTITIONED_TABLES.items(), start=1):
+        if not _is_partitioned(conn, table):
+            continue
+        print(f"📋 Krok {step}: Przywracanie zwykłej tabeli {table}")
+        _rebuild(conn, table, column, partitioned=False)
@@ -0,0 +1,119 @@
+"""add_blog_stored_counters
+
+Wartości wyliczane dotąd przy każdym renderowaniu, zapisane w tabelach
+(utrzymywane przy zapisie przez zdarzenia modeli w app/models/blog_model.py):
+1. blog_posts.word_count, reading_time - zamiast dzielenia pełnej treści w szablonie
+2. blog_categories.posts_count, blog_tags.posts_count - liczba opublikowanych postów
+   zamiast ładowania wszystkich postów kategorii/tagu
+3. blog_categories.path ('/1/5/') i full_path ('Rodzic > Dziecko') - zamiast
+   ładowania kolejnych rodziców
+
+Revision ID: a9d3e7c2b4f6
+Revises: e6c4a9f2d1b5
+Create Date: 2025-11-02 10:21:07.318452
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d3e7c2b4f6'
+down_revision = 'e6c4a9f2d1b5'
+branch_labels = None
+depends_on = None
+
+WORDS_PER_MINUTE = 200
+BATCH_SIZE = 500
+
+COUNT_SQL = """
+    UPDATE {table} SET posts_count = (
+        SELECT count(*) FROM {association} a
+        JOIN blog_posts p ON p.id = a.post_id
+        WHERE a.{key} = {table}.id AND p.status = 'published'
+    )
+"""
+
+
+def _backfill_text_stats_python(conn):
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT id, content FROM blog_posts WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {'last_id': last_id, 'limit': BATCH_SIZE}
+        ).all()
+        if not rows:
+            return
+        for post_id, content in rows:
+            word_count = len((content or '').split())
+            conn.execute(
+                sa.text("UPDATE blog_posts SET word_count = :words, reading_time = :minutes WHERE id = :id"),
+                {'words': word_count, 'minutes': max(1, word_count // WORDS_PER_MINUTE), 'id': post_id}
+            )
+        last_id = rows[-1][0]
+
+
+def _backfill_category_paths(conn):
+    rows = conn.execute(sa.text("SELECT id, parent_id, title FROM blog_categories")).all()
+    by_id = {row[0]: row for row in rows}
+    paths = {}
+
+    def resolve(category_id, seen):
+        if category_id not in paths:
+            _, parent_id, title = by_id[category_id]
+            if parent_id in by_id and parent_id not in seen:
+                parent_path, parent_titles = resolve(parent_id, seen | {category_id})
+                paths[category_id] = (f'{parent_path}{category_id}/', f'{parent_titles} > {title}')
+            else:
+                paths[category_id] = (f'/{category_id}/', title)
+        return paths[category_id]
+
+    for category_id in by_id:
+        path, full_path = resolve(category_id, {category_id})
+        conn.execute(
+            sa.text("UPDATE blog_categories SET path = :path, full_path = :full_path WHERE id = :id"),
+            {'path': path, 'full_path': full_path, 'id': category_id}
+        )
+    print(f"   Ścieżki kategorii: {len(paths)}")
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    print("📋 Krok 1: Kolumny liczników i ścieżek")
+    op.add_column('blog_posts', sa.Column('word_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('blog_posts', sa.Column('reading_time', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('blog_categories', sa.Column('posts_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('blog_categories', sa.Column('path', sa.String(length=255), nullable=True))
+    op.add_column('blog_categories', sa.Column('full_path', sa.String(length=500), nullable=True))
+    op.add_column('blog_tags', sa.Column('posts_count', sa.Integer(), nullable=False, server_default='0'))
+
+    print("📋 Krok 2: Liczba słów i czas czytania postów")
+    if conn.dialect.name == 'postgresql':
+        op.execute("""
+            UPDATE blog_posts SET word_count = CASE
+                WHEN btrim(coalesce(content, ''), E' \\t\\n\\r') = '' THEN 0
+                ELSE array_length(regexp_split_to_array(btrim(content, E' \\t\\n\\r'), E'\\\\s+'), 1)
+            END
+        """)
+        op.execute(f"UPDATE blog_posts SET reading_time = GREATEST(1, word_count / {WORDS_PER_MINUTE})")
+    else:
+        _backfill_text_stats_python(conn)
+
+    print("📋 Krok 3: Liczba opublikowanych postów kategorii i tagów")
+    op.execute(COUNT_SQL.format(table='blog_categories', association='blog_post_categories', key='category_id'))
+    op.execute(COUNT_SQL.format(table='blog_tags', association='blog_post_tags', key='tag_id'))
+
+    print("📋 Krok 4: Ścieżki kategorii")
+    _backfill_category_paths(conn)
+    op.create_index('ix_blog_categories_path', 'blog_categories', ['path'])
+
+
+def downgrade():
+    op.drop_index('ix_blog_categories_path', table_name='blog_categories')
+    op.drop_column('blog_tags', 'posts_count')
+    op.drop_column('blog_categories', 'full_path')
+    op.drop_column('blog_categories', 'path')
+    op.drop_column('blog_categories', 'posts_count')
+    op.drop_column('blog_posts', 'reading_time')
+    op.drop_column('blog_posts', 'word_count')
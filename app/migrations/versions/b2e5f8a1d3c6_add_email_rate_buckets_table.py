@@ -0,0 +1,29 @@
+"""add_email_rate_buckets_table
+
+Revision ID: b2e5f8a1d3c6
+Revises: a9d3e6b1c4f7
+Create Date: 2025-10-31 09:41:17.284503
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2e5f8a1d3c6'
+down_revision = 'a9d3e6b1c4f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('email_rate_buckets',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('tokens', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('email_rate_buckets')
@@ -0,0 +1,72 @@
+"""add_email_log_search_indexes
+
+Indeksy dla wyszukiwania logów emaili (EmailLogSearch):
+1. Rozszerzenie pg_trgm i indeksy GIN trigram na email, subject, error_message (ILIKE '%fraza%')
+2. Indeks wyrażenia (sent_at AT TIME ZONE <TIMEZONE>)::time dla filtrów godziny
+3. Indeks (sent_at DESC NULLS LAST, id DESC) dla stronicowania keyset
+
+Indeksy tworzone są CONCURRENTLY, aby nie blokować zapisu logów na dużej tabeli.
+
+Revision ID: b7e2d4a19c3f
+Revises: a3f1c9e7b2d4
+Create Date: 2025-10-28 14:37:05.118402
+
+"""
+import os
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2d4a19c3f'
+down_revision = 'a3f1c9e7b2d4'
+branch_labels = None
+depends_on = None
+
+# Musi być zgodna z LOG_TIMEZONE w app/services/email_log_search.py
+LOG_TIMEZONE = os.getenv('TIMEZONE', 'Europe/Warsaw')
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        op.create_index('ix_email_logs_sent_at_id', 'email_logs', [sa.text('sent_at DESC'), sa.text('id DESC')])
+        return
+
+    print("📋 Krok 1: Rozszerzenie pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        print("📋 Krok 2: Indeksy trigram")
+        for column in ('email', 'subject', 'error_message'):
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_email_logs_{column}_trgm "
+                f"ON email_logs USING gin ({column} gin_trgm_ops)"
+            )
+
+        print("📋 Krok 3: Indeks godziny wysłania")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_email_logs_sent_time_local "
+            f"ON email_logs ((timezone('{LOG_TIMEZONE}', sent_at)::time))"
+        )
+
+        print("📋 Krok 4: Indeks stronicowania keyset")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_email_logs_sent_at_id "
+            "ON email_logs (sent_at DESC NULLS LAST, id DESC)"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        op.drop_index('ix_email_logs_sent_at_id', table_name='email_logs')
+        return
+
+    with op.get_context().autocommit_block():
+        for index_name in (
+            'ix_email_logs_sent_at_id',
+            'ix_email_logs_sent_time_local',
+            'ix_email_logs_error_message_trgm',
+            'ix_email_logs_subject_trgm',
+            'ix_email_logs_email_trgm',
+        ):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
@@ -0,0 +1,54 @@
+"""add_social_publications_outbox
+
+Outbox publikacji postów bloga w mediach społecznościowych: wiersz na
+(post, platforma) zapisywany w transakcji posta, wysyłany w tle z ponowieniami.
+
+Revision ID: c2e8f4a1d7b3
+Revises: a9d3e7c2b4f6
+Create Date: 2025-11-03 09:14:52.640218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2e8f4a1d7b3'
+down_revision = 'a9d3e7c2b4f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    print("📋 Krok 1: Tworzenie tabeli social_publications...")
+    op.create_table('social_publications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('platform', sa.String(length=20), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=32), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=True),
+        sa.Column('max_attempts', sa.Integer(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('response', sa.Text(), nullable=True),
+        sa.Column('run_after', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['post_id'], ['blog_posts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key'),
+        sa.UniqueConstraint('post_id', 'platform', name='uq_social_publications_post_platform')
+    )
+
+    print("📋 Krok 2: Tworzenie indeksów...")
+    with op.batch_alter_table('social_publications', schema=None) as batch_op:
+        batch_op.create_index('ix_social_publications_status_run_after', ['status', 'run_after'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('social_publications', schema=None) as batch_op:
+        batch_op.drop_index('ix_social_publications_status_run_after')
+
+    op.drop_table('social_publications')
@@ -0,0 +1,50 @@
+"""add_crm_call_dispatch_indexes
+
+Indeksy dla kolejki połączeń CRM (QueueManager.get_next_dispatch):
+1. (ankieter_id, queue_status, priority, scheduled_date, created_at) - wybór następnego wpisu kolejki
+2. (contact_id, call_date) - historia połączeń kontaktu
+
+Revision ID: c5d8e1f2a4b6
+Revises: b7e2d4a19c3f
+Create Date: 2025-10-29 09:21:47.330215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d8e1f2a4b6'
+down_revision = 'b7e2d4a19c3f'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_crm_calls_queue_dispatch', ['ankieter_id', 'queue_status', 'priority', 'scheduled_date', 'created_at']),
+    ('ix_crm_calls_contact_call_date', ['contact_id', 'call_date']),
+)
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        for index_name, columns in INDEXES:
+            op.create_index(index_name, 'crm_calls', columns)
+        return
+
+    with op.get_context().autocommit_block():
+        for index_name, columns in INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+                f"ON crm_calls ({', '.join(columns)})"
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        for index_name, _ in INDEXES:
+            op.drop_index(index_name, table_name='crm_calls')
+        return
+
+    with op.get_context().autocommit_block():
+        for index_name, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
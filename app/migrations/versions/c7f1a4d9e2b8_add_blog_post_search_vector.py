@@ -0,0 +1,87 @@
+"""add_blog_post_search_vector
+
+Wyszukiwanie pełnotekstowe postów bloga (BlogSearch):
+1. Funkcja blog_search_config() - konfiguracja 'polish' gdy słownik jest zainstalowany,
+   inaczej 'simple' (używana zarówno przez trigger, jak i zapytania)
+2. Kolumna search_vector (tytuł A, zajawka B, treść bez HTML C) i trigger ją utrzymujący
+3. Wypełnienie istniejących postów
+4. Indeks GIN ix_blog_posts_search_vector (CONCURRENTLY)
+
+Revision ID: c7f1a4d9e2b8
+Revises: b2e5f8a1d3c6
+Create Date: 2025-10-31 13:05:52.617094
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7f1a4d9e2b8'
+down_revision = 'b2e5f8a1d3c6'
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_EXPRESSION = """
+    setweight(to_tsvector(blog_search_config(), coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector(blog_search_config(), coalesce({row}excerpt, '')), 'B') ||
+    setweight(to_tsvector(blog_search_config(), regexp_replace(coalesce({row}content, ''), '<[^>]+>', ' ', 'g')), 'C')
+"""
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        op.add_column('blog_posts', sa.Column('search_vector', sa.Text(), nullable=True))
+        return
+
+    conn = op.get_bind()
+
+    print("📋 Krok 1: Konfiguracja wyszukiwania")
+    has_polish = conn.execute(sa.text("SELECT 1 FROM pg_ts_config WHERE cfgname = 'polish'")).scalar()
+    config = 'polish' if has_polish else 'simple'
+    print(f"   Konfiguracja tekstowa: {config}")
+    op.execute(
+        f"CREATE OR REPLACE FUNCTION blog_search_config() RETURNS regconfig "
+        f"LANGUAGE sql IMMUTABLE AS $$ SELECT '{config}'::regconfig $$"
+    )
+
+    print("📋 Krok 2: Kolumna search_vector i trigger")
+    op.add_column('blog_posts', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION blog_posts_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR_EXPRESSION.format(row='NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER blog_posts_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, excerpt, content ON blog_posts
+        FOR EACH ROW EXECUTE PROCEDURE blog_posts_search_vector_update()
+    """)
+
+    print("📋 Krok 3: Wypełnianie istniejących postów")
+    op.execute(f"UPDATE blog_posts SET search_vector = {SEARCH_VECTOR_EXPRESSION.format(row='')}")
+
+    with op.get_context().autocommit_block():
+        print("📋 Krok 4: Indeks GIN")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_blog_posts_search_vector "
+            "ON blog_posts USING gin (search_vector)"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        op.drop_column('blog_posts', 'search_vector')
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_blog_posts_search_vector")
+
+    op.execute("DROP TRIGGER IF EXISTS blog_posts_search_vector_trigger ON blog_posts")
+    op.execute("DROP FUNCTION IF EXISTS blog_posts_search_vector_update()")
+    op.drop_column('blog_posts', 'search_vector')
+    op.execute("DROP FUNCTION IF EXISTS blog_search_config()")
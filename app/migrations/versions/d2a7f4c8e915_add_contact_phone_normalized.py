@@ -0,0 +1,86 @@
+"""add_contact_phone_normalized
+
+Kanoniczny numer telefonu kontaktu (E.164, app.utils.phone_utils.normalize_phone):
+1. Kolumna crm_contacts.phone_normalized
+2. Uzupełnienie istniejących kontaktów partiami (krótkie transakcje)
+3. Indeks częściowy (WHERE phone_normalized IS NOT NULL), bez UNIQUE - duplikaty
+   wykrywa import (Contact.find_ids_by_phones), a pojedyncze zapisy kontaktów ich nie blokują
+
+Revision ID: d2a7f4c8e915
+Revises: c5d8e1f2a4b6
+Create Date: 2025-10-29 13:05:12.604481
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7f4c8e915'
+down_revision = 'c5d8e1f2a4b6'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+INDEX_NAME = 'ix_crm_contacts_phone_normalized'
+
+
+def _backfill(connection):
+    from app.utils.phone_utils import normalize_phone
+
+    select_batch = sa.text(
+        "SELECT id, phone FROM crm_contacts "
+        "WHERE phone_normalized IS NULL AND id > :last_id ORDER BY id LIMIT :limit"
+    )
+    update_row = sa.text("UPDATE crm_contacts SET phone_normalized = :phone WHERE id = :id")
+
+    last_id = 0
+    total = 0
+    while True:
+        rows = connection.execute(select_batch, {'last_id': last_id, 'limit': BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        updates = [{'id': row.id, 'phone': normalize_phone(row.phone)} for row in rows]
+        updates = [u for u in updates if u['phone']]
+        if updates:
+            connection.execute(update_row, updates)
+        last_id = rows[-1].id
+        total += len(updates)
+        print(f"   ... {total} kontaktów (do id {last_id})")
+
+
+def upgrade():
+    print("📋 Krok 1: Kolumna phone_normalized")
+    with op.batch_alter_table('crm_contacts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('phone_normalized', sa.String(length=20), nullable=True))
+
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    print("📋 Krok 2: Uzupełnianie numerów")
+    if is_postgres:
+        with op.get_context().autocommit_block():
+            _backfill(op.get_bind())
+    else:
+        _backfill(op.get_bind())
+
+    print("📋 Krok 3: Indeks")
+    if is_postgres:
+        with op.get_context().autocommit_block():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+                "ON crm_contacts (phone_normalized) WHERE phone_normalized IS NOT NULL"
+            )
+    else:
+        op.create_index(INDEX_NAME, 'crm_contacts', ['phone_normalized'], unique=False,
+                        postgresql_where=sa.text('phone_normalized IS NOT NULL'))
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
+    else:
+        op.drop_index(INDEX_NAME, table_name='crm_contacts')
+
+    with op.batch_alter_table('crm_contacts', schema=None) as batch_op:
+        batch_op.drop_column('phone_normalized')
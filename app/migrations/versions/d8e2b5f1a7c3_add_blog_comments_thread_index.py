@@ -0,0 +1,47 @@
+"""add_blog_comments_thread_index
+
+Indeks dla ładowania wątku komentarzy posta jednym zapytaniem (CommentTree):
+(post_id, is_approved, parent_id, created_at) - filtr po poście i statusie,
+kolejność po (parent_id, created_at) bez sortowania.
+
+Indeks tworzony jest CONCURRENTLY, aby nie blokować dodawania komentarzy.
+
+Revision ID: d8e2b5f1a7c3
+Revises: c7f1a4d9e2b8
+Create Date: 2025-10-31 16:40:18.205736
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8e2b5f1a7c3'
+down_revision = 'c7f1a4d9e2b8'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_blog_comments_post_thread'
+INDEX_COLUMNS = ['post_id', 'is_approved', 'parent_id', 'created_at']
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        op.create_index(INDEX_NAME, 'blog_comments', INDEX_COLUMNS)
+        return
+
+    with op.get_context().autocommit_block():
+        print("📋 Krok 1: Indeks wątków komentarzy")
+        op.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+            f"ON blog_comments ({', '.join(INDEX_COLUMNS)})"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        op.drop_index(INDEX_NAME, table_name='blog_comments')
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
@@ -0,0 +1,51 @@
+"""add_keyset_pagination_indexes
+
+Indeksy dla stronicowania keyset list administracyjnych (app.utils.pagination_utils):
+kolejność (kolumna DESC NULLS LAST, id DESC) zgodna z ORDER BY, więc kolejne
+strony są odczytywane z indeksu bez sortowania i bez OFFSET.
+
+Revision ID: e4b9c3d6f0a1
+Revises: d2a7f4c8e915
+Create Date: 2025-10-29 16:48:33.917240
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b9c3d6f0a1'
+down_revision = 'd2a7f4c8e915'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_users_created_at_id', 'users', 'created_at DESC NULLS LAST, id DESC'),
+    ('ix_blog_posts_created_at_id', 'blog_posts', 'created_at DESC NULLS LAST, id DESC'),
+    ('ix_blog_comments_created_at_id', 'blog_comments', 'created_at DESC NULLS LAST, id DESC'),
+    ('ix_email_queue_created_at_id', 'email_queue', 'created_at DESC NULLS LAST, id DESC'),
+    ('ix_crm_contacts_ankieter_created_at_id', 'crm_contacts', 'assigned_ankieter_id, created_at DESC NULLS LAST, id DESC'),
+    ('ix_crm_blacklist_active_created_at_id', 'crm_blacklist', 'is_active, created_at DESC NULLS LAST, id DESC'),
+)
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        for index_name, table_name, columns in INDEXES:
+            op.create_index(index_name, table_name, [sa.text(column) for column in columns.replace(' NULLS LAST', '').split(', ')])
+        return
+
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} ({columns})")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        for index_name, table_name, _ in INDEXES:
+            op.drop_index(index_name, table_name=table_name)
+        return
+
+    with op.get_context().autocommit_block():
+        for index_name, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
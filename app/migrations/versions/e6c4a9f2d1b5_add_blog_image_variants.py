@@ -0,0 +1,33 @@
+"""add_blog_image_variants
+
+Metadane responsywnych wariantów obrazów bloga (ImagePipeline):
+- blog_posts.featured_image_variants - warianty obrazu wyróżniającego
+- blog_post_images.variants - warianty obrazu galerii
+
+JSON z wymiarami, listą plików i gotowym srcset dla każdego formatu.
+
+Revision ID: e6c4a9f2d1b5
+Revises: d8e2b5f1a7c3
+Create Date: 2025-11-01 09:14:36.481920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6c4a9f2d1b5'
+down_revision = 'd8e2b5f1a7c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    print("📋 Krok 1: Kolumny wariantów obrazów")
+    op.add_column('blog_posts', sa.Column('featured_image_variants', sa.JSON(), nullable=True))
+    op.add_column('blog_post_images', sa.Column('variants', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('blog_post_images', 'variants')
+    op.drop_column('blog_posts', 'featured_image_variants')
@@ -0,0 +1,61 @@
+"""add_user_search_indexes
+
+Indeksy dla autouzupełniania użytkowników w panelu admina (UserSearch):
+1. Rozszerzenie pg_trgm i indeksy GIN trigram na first_name, email (ILIKE '%fraza%')
+2. Indeksy btree lower(kolumna) text_pattern_ops dla krótkich fraz (LIKE 'fraza%')
+
+Indeksy tworzone są CONCURRENTLY, aby nie blokować rejestracji użytkowników.
+
+Revision ID: f3a8c2d5b7e9
+Revises: e4b9c3d6f0a1
+Create Date: 2025-10-30 10:12:47.502318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8c2d5b7e9'
+down_revision = 'e4b9c3d6f0a1'
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = ('first_name', 'email')
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        for column in SEARCH_COLUMNS:
+            op.create_index(f'ix_users_{column}_prefix', 'users', [sa.text(f'lower({column})')])
+        return
+
+    print("📋 Krok 1: Rozszerzenie pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        print("📋 Krok 2: Indeksy trigram")
+        for column in SEARCH_COLUMNS:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_{column}_trgm "
+                f"ON users USING gin ({column} gin_trgm_ops)"
+            )
+
+        print("📋 Krok 3: Indeksy prefiksowe")
+        for column in SEARCH_COLUMNS:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_{column}_prefix "
+                f"ON users (lower({column}) text_pattern_ops)"
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        for column in SEARCH_COLUMNS:
+            op.drop_index(f'ix_users_{column}_prefix', table_name='users')
+        return
+
+    with op.get_context().autocommit_block():
+        for column in SEARCH_COLUMNS:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_users_{column}_prefix")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_users_{column}_trgm")
@@ -14,7 +14,7 @@ from .user_model import User, PasswordResetToken
 from .content_model import MenuItem, Section, BenefitItem, Testimonial, SocialLink, FAQ
 from .events_model import EventSchedule
 from .event_registration_model import EventRegistration
-from .email_model import EmailTemplate, EmailCampaign, EmailQueue, EmailLog, EmailReminder
+from .email_model import EmailTemplate, EmailCampaign, EmailQueue, EmailLog, EmailReminder, EmailRateBucket
 from .user_groups_model import UserGroup, UserGroupMember
 from .blog_model import BlogCategory, BlogTag, BlogPost, BlogComment, BlogPostImage
 from .seo_model import SEOSettings, FooterSettings, LegalDocument
@@ -23,6 +23,8 @@ from .user_history_model import UserHistory
 from .stats_model import Stats
 from .system_logs_model import SystemLog
 from .crm_model import Campaign, Contact, Call, BlacklistEntry, ImportFile, ImportRecord
+from .background_job_model import BackgroundJob
+from .social_publication_model import SocialPublication
 # TaskQueue usunięty - niepotrzebny
 
 # Association tables
@@ -47,6 +49,7 @@ __all__ = [
     'EmailQueue',
     'EmailLog',
     'EmailReminder',
+    'EmailRateBucket',
     'BlogCategory',
     'BlogTag',
     'BlogPost',
@@ -65,6 +68,8 @@ __all__ = [
     'BlacklistEntry',
     'ImportFile',
     'ImportRecord',
+    'BackgroundJob',
+    'SocialPublication',
     # 'TaskQueue',  # Usunięty
     'SocialMediaConfig',
     'SocialMediaPost',
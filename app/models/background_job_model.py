@@ -0,0 +1,29 @@
+"""
+Background Job Model - trwała kolejka zadań wykonywanych po commit
+"""
+from app.utils.timezone_utils import get_local_datetime
+from . import db
+
+class BackgroundJob(db.Model):
+    """Post-commit side effect persisted for retry (enrichment, notifications)"""
+    __tablename__ = 'background_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False, index=True)  # 'blog_comment_enrichment', 'event_registration_followup', etc.
+    payload = db.Column(db.JSON, nullable=True)  # Handler arguments as JSON
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, running, done, failed
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=5)
+    last_error = db.Column(db.Text)
+    run_after = db.Column(db.DateTime(timezone=True), default=get_local_datetime)  # Earliest time of the next attempt
+    started_at = db.Column(db.DateTime(timezone=True))
+    finished_at = db.Column(db.DateTime(timezone=True))
+    created_at = db.Column(db.DateTime(timezone=True), default=get_local_datetime)
+    updated_at = db.Column(db.DateTime(timezone=True), default=get_local_datetime, onupdate=get_local_datetime)
+
+    __table_args__ = (
+        db.Index('ix_background_jobs_status_run_after', 'status', 'run_after'),
+    )
+
+    def __repr__(self):
+        return f'<BackgroundJob {self.job_type} #{self.id} - {self.status}>'
@@ -2,9 +2,16 @@
 Blog-related models
 """
 from datetime import datetime
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, query_expression
+from sqlalchemy.orm.attributes import set_committed_value
 from . import db
+from .associations_model import blog_post_categories, blog_post_tags
 from app.utils.timezone_utils import get_local_datetime
 
+WORDS_PER_MINUTE = 200
+
 class BlogCategory(db.Model):
     """Blog categories with hierarchical structure"""
     __tablename__ = 'blog_categories'
@@ -18,6 +25,11 @@ class BlogCategory(db.Model):
     sort_order = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=get_local_datetime)
     updated_at = db.Column(db.DateTime, default=get_local_datetime, onupdate=get_local_datetime)
+    # Materialised path - ids ('/1/5/') and titles ('Parent > Child'), maintained on flush
+    path = db.Column(db.String(255), index=True)
+    full_path = db.Column(db.String(500))
+    # Published posts in the category, maintained on flush
+    posts_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships
     parent = db.relationship('BlogCategory', remote_side=[id], backref='children')
@@ -26,19 +38,10 @@ class BlogCategory(db.Model):
     def __repr__(self):
         return f'<BlogCategory {self.title}>'
     
-    @property
-    def posts_count(self):
-        return len(self.posts)
-    
-    @property
-    def full_path(self):
-        """Get full category path (e.g., 'Parent > Child > Subchild')"""
-        path = [self.title]
-        current = self.parent
-        while current:
-            path.insert(0, current.title)
-            current = current.parent
-        return ' > '.join(path)
+    def has_posts(self):
+        """Whether any post (published or not) is assigned - deletion guard"""
+        return db.session.query(blog_post_categories.c.post_id) \
+            .filter(blog_post_categories.c.category_id == self.id).first() is not None
 
 class BlogTag(db.Model):
     """Blog tags"""
@@ -50,6 +53,8 @@ class BlogTag(db.Model):
     description = db.Column(db.Text)
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=get_local_datetime)
+    # Published posts with the tag, maintained on flush
+    posts_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships
     posts = db.relationship('BlogPost', secondary='blog_post_tags', back_populates='tags')
@@ -57,10 +62,10 @@ class BlogTag(db.Model):
     def __repr__(self):
         return f'<BlogTag {self.name}>'
     
-    @property
-    def posts_count(self):
-        # Count posts associated with this tag
-        return len(self.posts) if self.posts else 0
+    def has_posts(self):
+        """Whether any post (published or not) is assigned - deletion guard"""
+        return db.session.query(blog_post_tags.c.post_id) \
+            .filter(blog_post_tags.c.tag_id == self.id).first() is not None
 
 class BlogPost(db.Model):
     """Blog posts"""
@@ -85,6 +90,16 @@ class BlogPost(db.Model):
     created_at = db.Column(db.DateTime, default=get_local_datetime)
     updated_at = db.Column(db.DateTime, default=get_local_datetime, onupdate=get_local_datetime)
     published_at = db.Column(db.DateTime)
+    # Weighted full-text vector (title A, excerpt B, content C), maintained by a database
+    # trigger on PostgreSQL - see app.services.blog_search
+    search_vector = deferred(db.Column(TSVECTOR().with_variant(db.Text(), 'sqlite')))
+    # Responsive variants of featured_image with srcset (app.services.image_pipeline)
+    featured_image_variants = db.Column(db.JSON)
+    # Beginning of the content, loaded instead of the full text on listing pages
+    content_preview = query_expression()
+    # Computed whenever content is set, so templates do not split the full text
+    word_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    reading_time = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # minutes
     
     # Relationships
     author = db.relationship('User', backref='blog_posts')
@@ -92,17 +107,32 @@ class BlogPost(db.Model):
     tags = db.relationship('BlogTag', secondary='blog_post_tags', back_populates='posts')
     comments = db.relationship('BlogComment', lazy='dynamic', cascade='all, delete-orphan')
     
+    # Keyset pagination of admin post list (app.utils.pagination_utils); NULLS LAST index on PostgreSQL only
+    __table_args__ = (
+        db.Index('ix_blog_posts_created_at_id', created_at.desc().nulls_last(), id.desc()).ddl_if(dialect='postgresql'),
+        db.Index('ix_blog_posts_search_vector', 'search_vector', postgresql_using='gin'),
+    )
+    
     @property
     def is_published(self):
         """Check if post is published"""
         return self.status == 'published' and self.published_at is not None
     
     @property
-    def reading_time(self):
-        """Estimate reading time in minutes"""
-        words_per_minute = 200
-        word_count = len(self.content.split())
-        return max(1, word_count // words_per_minute)
+    def featured_responsive(self):
+        """Variants metadata, only when generated for the current featured image"""
+        variants = self.featured_image_variants
+        if variants and variants.get('source') == self.featured_image:
+            return variants
+        return None
+    
+    @property
+    def summary(self):
+        """Excerpt, or the beginning of the content when there is none"""
+        if self.excerpt:
+            return self.excerpt
+        text = self.content_preview if self.content_preview is not None else (self.content or '')
+        return text[:150] + '...' if len(text) > 150 else text
     
     def __repr__(self):
         return f'<BlogPost {self.title}>'
@@ -118,6 +148,8 @@ class BlogPostImage(db.Model):
     caption = db.Column(db.Text)
     order = db.Column(db.Integer, default=0)
     is_active = db.Column(db.Boolean, default=True)
+    # Responsive variants of image_url with srcset (app.services.image_pipeline)
+    variants = db.Column(db.JSON)
     created_at = db.Column(db.DateTime, default=get_local_datetime)
     updated_at = db.Column(db.DateTime, default=get_local_datetime, onupdate=get_local_datetime)
     
@@ -126,6 +158,13 @@ class BlogPostImage(db.Model):
     
     def __repr__(self):
         return f'<BlogPostImage {self.id} for post {self.post_id}>'
+    
+    @property
+    def responsive(self):
+        """Variants metadata, only when generated for the current image"""
+        if self.variants and self.variants.get('source') == self.image_url:
+            return self.variants
+        return None
 
 class BlogComment(db.Model):
     """Blog comments with threaded support"""
@@ -164,5 +203,128 @@ class BlogComment(db.Model):
     parent = db.relationship('BlogComment', remote_side=[id], backref='replies')
     moderator = db.relationship('User', foreign_keys=[moderated_by], backref='moderated_comments')
     
+    # Keyset pagination of admin comment list (app.utils.pagination_utils); NULLS LAST index on PostgreSQL only
+    __table_args__ = (
+        db.Index('ix_blog_comments_created_at_id', created_at.desc().nulls_last(), id.desc()).ddl_if(dialect='postgresql'),
+        # Single-query thread loading (app.services.blog_comments)
+        db.Index('ix_blog_comments_post_thread', post_id, is_approved, parent_id, created_at),
+    )
+    
     def __repr__(self):
         return f'<BlogComment {self.author_name} on post {self.post_id}>'
+
+
+# --- Stored counters and paths -------------------------------------------------------
+
+def text_stats(content):
+    """(word_count, reading_time in minutes) of post content"""
+    word_count = len((content or '').split())
+    return word_count, max(1, word_count // WORDS_PER_MINUTE)
+
+
+@event.listens_for(BlogPost.content, 'set')
+def _update_text_stats(target, value, oldvalue, initiator):
+    target.word_count, target.reading_time = text_stats(value)
+
+
+_COUNTER_ASSOCIATIONS = {
+    BlogCategory: (blog_post_categories, blog_post_categories.c.category_id),
+    BlogTag: (blog_post_tags, blog_post_tags.c.tag_id),
+}
+
+
+@event.listens_for(db.session, 'before_flush')
+def _collect_blog_counter_changes(session, flush_context, instances):
+    """Remembers categories/tags whose published post count may change in this flush"""
+    counted = session.info.setdefault('blog_counted', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        state = inspect(obj)
+        if isinstance(obj, BlogPost):
+            status_changed = obj in session.new or obj in session.deleted or state.attrs.status.history.has_changes()
+            for attr in ('categories', 'tags'):
+                history = state.attrs[attr].history
+                counted.update(history.added, history.deleted)
+                if status_changed:
+                    counted.update(getattr(obj, attr))
+        elif isinstance(obj, (BlogCategory, BlogTag)):
+            if obj in session.new or state.attrs.posts.history.has_changes():
+                counted.add(obj)
+            if isinstance(obj, BlogCategory) and (obj in session.new or obj in session.deleted or
+                                                  state.attrs.title.history.has_changes() or
+                                                  state.attrs.parent_id.history.has_changes() or
+                                                  state.attrs.parent.history.has_changes()):
+                session.info['blog_category_paths'] = True
+
+
+@event.listens_for(db.session, 'after_flush')
+def _apply_blog_counter_changes(session, flush_context):
+    counted = session.info.pop('blog_counted', set())
+    connection = session.connection()
+
+    for model, (association, key) in _COUNTER_ASSOCIATIONS.items():
+        objects = [obj for obj in counted if isinstance(obj, model) and obj.id is not None
+                   and not inspect(obj).was_deleted]
+        if not objects:
+            continue
+        ids = {obj.id for obj in objects}
+        table = model.__table__
+        # Lock the counter rows (in id order) before counting: a concurrent save of the same
+        # category/tag waits here and its count then includes the post committed meanwhile
+        connection.execute(select(table.c.id).where(table.c.id.in_(ids)).order_by(table.c.id).with_for_update())
+        counts = dict(connection.execute(
+            select(key, func.count(association.c.post_id))
+            .join(BlogPost.__table__, BlogPost.__table__.c.id == association.c.post_id)
+            .where(key.in_(ids), BlogPost.__table__.c.status == 'published')
+            .group_by(key)
+        ).all())
+        for obj in objects:
+            connection.execute(table.update().where(table.c.id == obj.id).values(posts_count=counts.get(obj.id, 0)))
+            set_committed_value(obj, 'posts_count', counts.get(obj.id, 0))
+
+    if session.info.pop('blog_category_paths', False):
+        rebuild_category_paths(session)
+
+
+def category_paths(rows):
+    """
+    Materialised paths of categories
+
+    Args:
+        rows: (id, parent_id, title) of all categories
+
+    Returns:
+        Dict: id -> (path, full_path)
+    """
+    by_id = {row[0]: row for row in rows}
+    paths = {}
+
+    def resolve(category_id, seen):
+        if category_id in paths:
+            return paths[category_id]
+        _, parent_id, title = by_id[category_id]
+        if parent_id in by_id and parent_id not in seen:
+            parent_path, parent_titles = resolve(parent_id, seen | {category_id})
+            paths[category_id] = (f'{parent_path}{category_id}/', f'{parent_titles} > {title}')
+        else:
+            paths[category_id] = (f'/{category_id}/', title)
+        return paths[category_id]
+
+    for category_id in by_id:
+        resolve(category_id, {category_id})
+    return paths
+
+
+def rebuild_category_paths(session):
+    """Recomputes path/full_path of all categories (small table) and stores the changed ones"""
+    table = BlogCategory.__table__
+    connection = session.connection()
+    rows = connection.execute(select(table.c.id, table.c.parent_id, table.c.title, table.c.path, table.c.full_path)).all()
+    current = {row.id: (row.path, row.full_path) for row in rows}
+    loaded = {obj.id: obj for obj in session.identity_map.values() if isinstance(obj, BlogCategory)}
+
+    for category_id, (path, full_path) in category_paths([(row.id, row.parent_id, row.title) for row in rows]).items():
+        if current[category_id] != (path, full_path):
+            connection.execute(table.update().where(table.c.id == category_id).values(path=path, full_path=full_path))
+        if category_id in loaded:
+            set_committed_value(loaded[category_id], 'path', path)
+            set_committed_value(loaded[category_id], 'full_path', full_path)
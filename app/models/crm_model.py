@@ -5,6 +5,7 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from sqlalchemy.orm import validates
 from app.models import db
 # Import moved to avoid circular dependency
 from datetime import datetime
@@ -39,6 +40,7 @@ class Contact(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     phone = db.Column(db.String(20), nullable=False)
+    phone_normalized = db.Column(db.String(20))  # E.164 form of phone (app.utils.phone_utils), used for dedupe
     email = db.Column(db.String(120))
     company = db.Column(db.String(200))
     source_file = db.Column(db.String(200))  # Name of imported file
@@ -61,9 +63,37 @@ class Contact(db.Model):
     assigned_ankieter = db.relationship('User', backref='assigned_contacts')
     import_file = db.relationship('ImportFile', backref='contacts')
     
+    # Non-unique: duplicates are detected on import (find_ids_by_phones), single saves never conflict
+    __table_args__ = (
+        db.Index('ix_crm_contacts_phone_normalized', 'phone_normalized',
+                 postgresql_where=db.text('phone_normalized IS NOT NULL')),
+        # Keyset pagination of ankieter contact list (app.utils.pagination_utils); NULLS LAST index on PostgreSQL only
+        db.Index('ix_crm_contacts_ankieter_created_at_id', assigned_ankieter_id, created_at.desc().nulls_last(), id.desc()).ddl_if(dialect='postgresql'),
+    )
+    
     def __repr__(self):
         return f'<Contact {self.name} ({self.phone})>'
     
+    @validates('phone')
+    def _set_phone_normalized(self, key, phone):
+        """Keep phone_normalized in sync with phone"""
+        from app.utils.phone_utils import normalize_phone
+        self.phone_normalized = normalize_phone(phone)
+        return phone
+    
+    @staticmethod
+    def find_ids_by_phones(normalized_phones, chunk_size=1000):
+        """Map normalised phones to existing contact ids (indexed IN queries, chunked)"""
+        phones = [phone for phone in set(normalized_phones) if phone]
+        found = {}
+        for start in range(0, len(phones), chunk_size):
+            rows = db.session.query(Contact.phone_normalized, Contact.id).filter(
+                Contact.phone_normalized.in_(phones[start:start + chunk_size])
+            ).all()
+            for phone, contact_id in rows:
+                found.setdefault(phone, contact_id)
+        return found
+    
     def get_tags(self):
         """Get tags as list"""
         import json
@@ -110,6 +140,15 @@ class Contact(db.Model):
         #     return False
         
         return True
+    
+    @classmethod
+    def callable_clause(cls):
+        """SQL equivalent of can_be_called() for filtering contacts in queries"""
+        from sqlalchemy import and_, func
+        return and_(
+            func.coalesce(cls.is_blacklisted, False) == False,
+            func.coalesce(cls.call_attempts, 0) < func.coalesce(cls.max_call_attempts, 3)
+        )
 
 class Call(db.Model):
     """Call model for tracking phone calls"""
@@ -145,6 +184,12 @@ class Call(db.Model):
     ankieter = db.relationship('User', backref='calls')
     event = db.relationship('EventSchedule', backref='crm_calls')
     
+    # Indexes for queue dispatch (QueueManager.get_next_dispatch) and contact call history
+    __table_args__ = (
+        db.Index('ix_crm_calls_queue_dispatch', 'ankieter_id', 'queue_status', 'priority', 'scheduled_date', 'created_at'),
+        db.Index('ix_crm_calls_contact_call_date', 'contact_id', 'call_date'),
+    )
+    
     def __repr__(self):
         return f'<Call {self.contact.name} - {self.status}>'
     
@@ -202,12 +247,25 @@ class BlacklistEntry(db.Model):
     blacklister = db.relationship('User', backref='blacklist_entries')
     contact = db.relationship('Contact', backref='blacklist_entry')
     
+    # Keyset pagination of active blacklist (app.utils.pagination_utils); NULLS LAST index on PostgreSQL only
+    __table_args__ = (
+        db.Index('ix_crm_blacklist_active_created_at_id', is_active, created_at.desc().nulls_last(), id.desc()).ddl_if(dialect='postgresql'),
+    )
+    
     def __repr__(self):
         return f'<BlacklistEntry {self.phone} - {self.reason}>'
     
     @staticmethod
     def is_blacklisted(phone, campaign_id=None):
         """Check if phone number is blacklisted globally or for specific campaign"""
+        try:
+            from app.services.crm_blacklist_index import blacklist_index
+            hit = blacklist_index.lookup(phone, campaign_id)
+            return (True, hit) if hit else (False, None)
+        except Exception:
+            # Index unavailable - query database directly
+            pass
+        
         try:
             # Check global blacklist first
             global_blacklist = BlacklistEntry.query.filter_by(
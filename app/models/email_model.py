@@ -98,6 +98,8 @@ class EmailQueue(db.Model):
         db.Index('ix_email_queue_duplicate_pending', 'recipient_email', 'subject', 'status'),
         db.Index('ix_email_queue_campaign_duplicate', 'recipient_email', 'campaign_id', 'content_hash'),
         db.Index('ix_email_queue_custom_key', 'duplicate_check_key'),
+        # Keyset pagination of queue list (app.utils.pagination_utils); NULLS LAST index on PostgreSQL only
+        db.Index('ix_email_queue_created_at_id', created_at.desc().nulls_last(), id.desc()).ddl_if(dialect='postgresql'),
     )
     
     def __init__(self, **kwargs):
@@ -268,6 +270,27 @@ class EmailLog(db.Model):
     campaign = db.relationship('EmailCampaign', backref='email_logs')
     event = db.relationship('EventSchedule', backref='email_logs')
     
+    # Indexes for log search (see EmailLogSearch). The time-of-day expression index
+    # ix_email_logs_sent_time_local is PostgreSQL-only and lives in the migration;
+    # the NULLS LAST keyset index is created on PostgreSQL only (SQLite create_all).
+    __table_args__ = (
+        db.Index('ix_email_logs_sent_at_id', sent_at.desc().nulls_last(), id.desc()).ddl_if(dialect='postgresql'),
+        db.Index('ix_email_logs_email_trgm', 'email', postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}),
+        db.Index('ix_email_logs_subject_trgm', 'subject', postgresql_using='gin', postgresql_ops={'subject': 'gin_trgm_ops'}),
+        db.Index('ix_email_logs_error_message_trgm', 'error_message', postgresql_using='gin', postgresql_ops={'error_message': 'gin_trgm_ops'}),
+    )
+    
     def __repr__(self):
         return f'<EmailLog {self.email} - {self.status}>'
 
+
+class EmailRateBucket(db.Model):
+    """Shared token bucket state for email provider rate limits (see email_v2.rate_limiter)"""
+    __tablename__ = 'email_rate_buckets'
+    
+    name = db.Column(db.String(100), primary_key=True)  # '<provider>:minute', '<provider>:hour'
+    tokens = db.Column(db.Float, nullable=False)  # Tokens left at updated_at
+    updated_at = db.Column(db.Float, nullable=False)  # Unix timestamp (database clock)
+    
+    def __repr__(self):
+        return f'<EmailRateBucket {self.name} - {self.tokens:.2f}>'
@@ -0,0 +1,53 @@
+"""
+Social Publication Model - outbox publikacji postów bloga w mediach społecznościowych
+"""
+import uuid
+from app.utils.timezone_utils import get_local_datetime
+from . import db
+
+def _idempotency_key():
+    return uuid.uuid4().hex
+
+class SocialPublication(db.Model):
+    """Outbox row - one publication of a blog post on one platform, delivered in the background"""
+    __tablename__ = 'social_publications'
+
+    id = db.Column(db.Integer, primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey('blog_posts.id', ondelete='CASCADE'), nullable=False)
+    platform = db.Column(db.String(20), nullable=False)  # facebook, twitter, linkedin
+    idempotency_key = db.Column(db.String(32), nullable=False, unique=True, default=_idempotency_key)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, sending, sent, failed, cancelled
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=5)
+    last_error = db.Column(db.Text)
+    response = db.Column(db.Text)  # Platform response on success (e.g. published post ID)
+    run_after = db.Column(db.DateTime(timezone=True), default=get_local_datetime)  # Earliest time of the next attempt
+    started_at = db.Column(db.DateTime(timezone=True))
+    sent_at = db.Column(db.DateTime(timezone=True))
+    created_at = db.Column(db.DateTime(timezone=True), default=get_local_datetime)
+    updated_at = db.Column(db.DateTime(timezone=True), default=get_local_datetime, onupdate=get_local_datetime)
+
+    # Relationships
+    post = db.relationship('BlogPost', backref=db.backref('social_publications', cascade='all, delete-orphan', lazy='dynamic'))
+
+    __table_args__ = (
+        # A post is published at most once per platform, however many times it is saved
+        db.UniqueConstraint('post_id', 'platform', name='uq_social_publications_post_platform'),
+        db.Index('ix_social_publications_status_run_after', 'status', 'run_after'),
+    )
+
+    def __repr__(self):
+        return f'<SocialPublication {self.platform} post {self.post_id} - {self.status}>'
+
+    def to_dict(self):
+        return {
+            'platform': self.platform,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'last_error': self.last_error,
+            'response': self.response,
+            'run_after': self.run_after.isoformat() if self.run_after else None,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
@@ -21,6 +21,15 @@ class User(UserMixin, db.Model):
     created_at = db.Column(db.DateTime, default=lambda: __import__('app.utils.timezone_utils', fromlist=['get_local_now']).get_local_now())
     last_login = db.Column(db.DateTime)
     
+    # Keyset pagination of admin user list (app.utils.pagination_utils); NULLS LAST index on PostgreSQL only
+    __table_args__ = (
+        db.Index('ix_users_created_at_id', created_at.desc().nulls_last(), id.desc()).ddl_if(dialect='postgresql'),
+        # Admin autocomplete (app.services.user_search); prefix indexes on lower(...)
+        # text_pattern_ops are created in migration f3a8c2d5b7e9
+        db.Index('ix_users_first_name_trgm', 'first_name', postgresql_using='gin', postgresql_ops={'first_name': 'gin_trgm_ops'}),
+        db.Index('ix_users_email_trgm', 'email', postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}),
+    )
+    
     def check_password(self, password):
         """Check if provided password matches the hash"""
         from werkzeug.security import check_password_hash
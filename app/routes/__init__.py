@@ -12,6 +12,8 @@ from .users_route import users_bp
 from .footer_route import footer_bp
 from .crm_routes import crm_bp
 from .ankieter_routes import ankieter_bp
+from .assets_route import assets_bp
+from .sitemap_route import sitemap_bp
 
 __all__ = [
     'public_bp',
@@ -24,5 +26,7 @@ __all__ = [
     'users_bp',
     'footer_bp',
     'crm_bp',
-    'ankieter_bp'
+    'ankieter_bp',
+    'assets_bp',
+    'sitemap_bp'
 ]
\ No newline at end of file
@@ -0,0 +1,12 @@
+"""
+Static asset routes - fingerprinted, precompressed files from static/dist
+"""
+from flask import Blueprint
+from app.utils.static_assets import send_asset
+
+assets_bp = Blueprint('assets', __name__)
+
+@assets_bp.route('/assets/<path:filename>')
+def serve_asset(filename):
+    """Serve fingerprinted asset (built by python -m app.utils.static_assets)"""
+    return send_asset(filename)
@@ -4,6 +4,7 @@ Blog routes
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, current_app
 from flask_login import login_required, current_user
 from app.blueprints.blog_controller import BlogController
+from app.services.category_tree import category_tree
 
 blog_bp = Blueprint('blog', __name__, url_prefix='/blog')
 
@@ -32,9 +33,8 @@ def index():
     from app.blueprints.public_controller import PublicController
     db_data = PublicController.get_database_data()
     
-    # Get popular tags for tag cloud
-    tags_data = BlogController.get_tags()
-    popular_tags = tags_data['tags'] if tags_data['success'] else []
+    # Popular tags for tag cloud (already loaded with post counts for the sidebar)
+    popular_tags = data['tags']
     
     return render_template('blog/index.html', 
                          posts=data['posts'], 
@@ -84,23 +84,31 @@ def post_detail(slug):
 @blog_bp.route('/category/<category_slug>/<post_slug>')
 def post_detail_with_category(category_slug, post_slug):
     """Blog post detail page with category in URL"""
+    # Child category pages share this URL shape (/category/<parent>/<child>)
+    if category_tree.resolve([category_slug, post_slug]):
+        return category_hierarchy_detail(category_slug, post_slug)
+    return _post_detail_in_category([category_slug], post_slug)
+
+@blog_bp.route('/category/<parent_slug>/<child_slug>/<post_slug>')
+def post_detail_with_category_hierarchy(parent_slug, child_slug, post_slug):
+    """Blog post detail page with category hierarchy in URL"""
+    return _post_detail_in_category([parent_slug, child_slug], post_slug)
+
+def _post_detail_in_category(category_slugs, post_slug):
     data = BlogController.get_blog_post(post_slug)
     
     if not data['success']:
         flash(data['error'], 'error')
         return redirect(url_for('blog.index'))
     
-    # Verify the category matches
-    category = next((cat for cat in data['post'].categories if cat.slug == category_slug), None)
+    # Verify the category path matches one of the post's categories
+    node = category_tree.resolve(category_slugs, active_only=False)
+    category = next((cat for cat in data['post'].categories if node and cat.id == node.id), None)
     if not category:
         # If category doesn't match, redirect to correct category
-        if data['post'].categories:
-            primary_category = data['post'].categories[0]
-            return redirect(url_for('blog.post_detail_with_category', 
-                                  category_slug=primary_category.slug, 
-                                  post_slug=post_slug), code=301)
-        else:
-            return redirect(url_for('blog.post_detail', slug=post_slug), code=301)
+        post_url = BlogController.get_post_url_with_category(data['post'])
+        if post_url != request.path:
+            return redirect(post_url, code=301)
     
     post = data['post']
     related_posts = data['related_posts']
@@ -161,23 +169,20 @@ def category_hierarchy_detail(parent_slug, child_slug):
     """Category detail page with hierarchy in URL"""
     page = request.args.get('page', 1, type=int)
     
-    # Get child category
-    from app.models import BlogCategory
-    child_category = BlogCategory.query.filter_by(slug=child_slug, is_active=True).first()
+    # Get child category (slug path resolved from the in-memory category tree)
+    node = category_tree.by_slug(child_slug)
     
-    if not child_category:
+    if not node:
         flash('Kategoria nie została znaleziona', 'error')
         return redirect(url_for('blog.index'))
     
     # Verify parent relationship
-    if not child_category.parent or child_category.parent.slug != parent_slug:
+    if node.url_slugs != (parent_slug, child_slug):
         # Redirect to correct URL
-        if child_category.parent:
-            return redirect(url_for('blog.category_hierarchy_detail', 
-                                  parent_slug=child_category.parent.slug, 
-                                  child_slug=child_slug), code=301)
-        else:
-            return redirect(url_for('blog.category_detail', slug=child_slug), code=301)
+        return redirect(node.url, code=301)
+    
+    from app.models import BlogCategory, db
+    child_category = db.session.get(BlogCategory, node.id)
     
     data = BlogController.get_blog_posts(page=page, per_page=6, category_slug=child_slug)
     
@@ -194,7 +199,7 @@ def category_hierarchy_detail(parent_slug, child_slug):
                          categories=data['categories'],
                          tags=data['tags'],
                          category=child_category,
-                         parent_category=child_category.parent,
+                         parent_category=db.session.get(BlogCategory, node.parent_id),
                          **db_data)
 
 @blog_bp.route('/tag/<slug>')
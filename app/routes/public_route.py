@@ -8,6 +8,7 @@ from app.services.email_v2 import EmailManager
 from app.utils.timezone_utils import get_local_now, convert_to_local
 from app.utils.blog_utils import generate_blog_link
 from app.utils.validation_utils import validate_email, validate_phone
+from app.utils.static_assets import DirectoryIndex
 # encrypt_email import removed - using new UnsubscribeManager system
 from app.models import db, EventSchedule, User, UserGroup
 import logging
@@ -566,75 +567,17 @@ def register_event(event_id):
                 logger.info(f"✅ EventRegistration created successfully")
                 print(f"✅ EventRegistration created successfully")
             
-            logger.info(f"🔍 About to get or create event group for event {event_id}")
-            # Get or create event group
-            from app.services.group_manager import GroupManager
-            group_manager = GroupManager()
-            
-            # Get event group
-            event_group = UserGroup.query.filter_by(group_type='event_based', event_id=event_id).first()
-            if not event_group:
-                # Create event group if it doesn't exist
-                logger.info(f"🔍 Creating new event group for event {event_id}")
-                event_group = UserGroup(
-                    name=f"Wydarzenie: {event.title}",
-                    description=f"Grupa uczestników wydarzenia: {event.title}",
-                    group_type='event_based',
-                    event_id=event_id
-                )
-                db.session.add(event_group)
-                db.session.commit()
-                logger.info(f"✅ Event group created: {event_group.name}")
-            else:
-                logger.info(f"✅ Found existing event group: {event_group.name}")
-            
-            # Synchronize event group
-            logger.info(f"🔍 Starting group synchronization for event {event_id}")
-            print(f"🔍 Starting group synchronization for event {event_id}")
-            
-            try:
-                success, message = group_manager.async_sync_event_group(event_id)
-                if success:
-                    logger.info(f"✅ Group synchronized: {message}")
-                    print(f"✅ Group synchronized: {event.title}")
-                else:
-                    logger.error(f"❌ Group synchronization error: {message}")
-                    print(f"❌ Group synchronization error: {message}")
-            except Exception as sync_error:
-                logger.error(f"❌ Failed to sync group: {sync_error}", exc_info=True)
-                print(f"❌ Failed to sync group: {sync_error}")
-                import traceback
-                traceback.print_exc()
-            
-            # Send confirmation email
-            email_manager = EmailManager()
-            
-            # Generate unsubscribe and delete account URLs using new UnsubscribeManager
-            from app.services.unsubscribe_manager import unsubscribe_manager
-            
-            context = {
-                'user_name': created_user.first_name,
-                'event_title': event.title,
-                'event_date': event.event_date.strftime('%d.%m.%Y') if event.event_date else '',
-                'event_time': event.event_date.strftime('%H:%M') if event.event_date else '',
-                'event_location': event.location or 'Online',
-                'event_description': event.description or '',
-                'unsubscribe_url': unsubscribe_manager.get_unsubscribe_url(created_user.email),
-                'delete_account_url': unsubscribe_manager.get_delete_account_url(created_user.email)
-            }
-            
-            success, message = email_manager.send_template_email(
-                to_email=created_user.email,
-                template_name='event_registration',
-                context=context
-            )
+            # Make sure the registration (and user changes) are committed before follow-up jobs
+            db.session.commit()
             
-            if success:
-                print(f"✅ Confirmation email sent to {created_user.email}")
-            else:
-                print(f"❌ Failed to send confirmation email: {message}")
+            # Group synchronization and confirmation email run in the background job pipeline
+            from app.services.background_jobs import job_pipeline
+            job_pipeline.enqueue('event_registration_followup', {
+                'user_id': created_user.id,
+                'event_id': event_id
+            })
             
-            # Return success - user is already registered and email sent
+            # Return success - user is registered, confirmation email is queued
             return jsonify({
                 'success': True, 
                 'message': 'Rejestracja zakończona pomyślnie. Sprawdź email z potwierdzeniem.'
@@ -655,33 +598,31 @@ def register_event(event_id):
         traceback.print_exc()
         return jsonify({'success': False, 'message': 'Wystąpił nieoczekiwany błąd. Spróbuj ponownie.'}), 500
 
+# Index of upload directories for /uploads/<filename>
+_upload_index = DirectoryIndex()
+
 @public_bp.route('/uploads/<filename>')
 def uploaded_file(filename):
     """Serve uploaded files"""
     import os
     from flask import current_app
     
-    # Get the absolute path to the static directory
-    static_dir = os.path.join(current_app.root_path, '..', 'static')
+    static_dir = current_app.static_folder
+    uploads_dir = os.path.join(static_dir, 'uploads')
+    benefits_dir = os.path.join(static_dir, 'images', 'benefits')
     
-    try:
-        # First try uploads directory
-        uploads_dir = os.path.join(static_dir, 'uploads')
-        return send_from_directory(uploads_dir, filename)
-    except FileNotFoundError:
-        try:
-            # Then try benefits directory with .jpg extension
-            benefits_dir = os.path.join(static_dir, 'images', 'benefits')
-            return send_from_directory(benefits_dir, filename + '.jpg')
-        except FileNotFoundError:
-            try:
-                # Try benefits directory without extension (in case filename already has .jpg)
-                benefits_dir = os.path.join(static_dir, 'images', 'benefits')
-                return send_from_directory(benefits_dir, filename)
-            except FileNotFoundError:
-                # Return a default image if file not found
-                hero_dir = os.path.join(static_dir, 'images', 'hero')
-                return send_from_directory(hero_dir, 'hero-bg.jpg')
+    # Same lookup order as before (uploads, benefits with .jpg, benefits), resolved
+    # from the in-memory directory index instead of trying each path on disk
+    found = _upload_index.find([
+        (uploads_dir, filename),
+        (benefits_dir, filename + '.jpg'),
+        (benefits_dir, filename)
+    ])
+    if found:
+        return send_from_directory(*found)
+    
+    # Return a default image if file not found
+    return send_from_directory(os.path.join(static_dir, 'images', 'hero'), 'hero-bg.jpg')
 
 # Legal documents routes
 @public_bp.route('/privacy-policy')
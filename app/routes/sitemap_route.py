@@ -0,0 +1,32 @@
+"""
+Sitemap & feed routes - static files built by cron (process_email_queue.py --sitemap)
+"""
+import re
+from flask import Blueprint, abort
+from app.services.sitemap_service import send_generated
+
+sitemap_bp = Blueprint('sitemap', __name__)
+
+_CHUNK_NAME = re.compile(r'^sitemap-\d+\.xml\.gz$')
+
+@sitemap_bp.route('/sitemap.xml')
+def sitemap_index():
+    """Sitemap index"""
+    return send_generated('sitemap.xml', 'application/xml')
+
+@sitemap_bp.route('/sitemaps/<name>')
+def sitemap_chunk(name):
+    """Gzipped sitemap file listed in the index"""
+    if not _CHUNK_NAME.match(name):
+        abort(404)
+    return send_generated(name, 'application/gzip', precompressed=False)
+
+@sitemap_bp.route('/blog/feed.rss')
+def feed_rss():
+    """RSS feed of the latest blog posts"""
+    return send_generated('feed.rss', 'application/rss+xml')
+
+@sitemap_bp.route('/blog/feed.atom')
+def feed_atom():
+    """Atom feed of the latest blog posts"""
+    return send_generated('feed.atom', 'application/atom+xml')
@@ -0,0 +1,300 @@
+"""
+Background Jobs - lekki, wewnątrzprocesowy pipeline efektów ubocznych po commit
+
+Zasady:
+1. Każde zadanie jest najpierw zapisywane w tabeli background_jobs (przetrwa restart)
+2. Identyfikator trafia do ograniczonej kolejki w pamięci obsługiwanej przez pulę wątków
+3. Gdy kolejka jest pełna, zadanie czeka w bazie na ponowienie (sweep lub cron)
+4. Nieudane zadania są ponawiane z wykładniczym opóźnieniem aż do max_attempts
+"""
+import queue
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import Callable, Dict, Any, Optional
+from sqlalchemy import update, or_
+from app.models import db, BackgroundJob
+from app.utils.timezone_utils import get_local_now
+
+logger = logging.getLogger(__name__)
+
+
+class JobPipeline:
+    """Pula wątków z ograniczoną kolejką i ponawianiem opartym o bazę danych"""
+
+    def __init__(self, workers: int = 4, queue_size: int = 500,
+                 retry_interval: int = 60, base_backoff: int = 30):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_interval = retry_interval  # Co ile sekund wątki sprawdzają zaległe zadania
+        self.base_backoff = base_backoff  # Opóźnienie pierwszego ponowienia w sekundach
+        self.stale_after = 600  # Zadania 'running' starsze niż 10 min uznajemy za porzucone
+
+        self._app = None
+        self._queue = None
+        self._threads = []
+        self._handlers: Dict[str, Callable[..., Any]] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self._started = False
+
+    def init_app(self, app):
+        """Konfiguruje pipeline dla aplikacji (wątki startują leniwie przy pierwszym zadaniu)"""
+        self._app = app
+        self.workers = app.config.get('BACKGROUND_JOB_WORKERS', self.workers)
+        self.queue_size = app.config.get('BACKGROUND_JOB_QUEUE_SIZE', self.queue_size)
+        self.retry_interval = app.config.get('BACKGROUND_JOB_RETRY_INTERVAL', self.retry_interval)
+        app.extensions['job_pipeline'] = self
+
+    def register(self, job_type: str):
+        """Dekorator rejestrujący handler dla danego typu zadania"""
+        def decorator(func):
+            self._handlers[job_type] = func
+            return func
+        return decorator
+
+    @property
+    def inline(self) -> bool:
+        """W trybie testowym zadania wykonujemy synchronicznie"""
+        return bool(self._app and self._app.config.get('TESTING'))
+
+    def enqueue(self, job_type: str, payload: Dict = None, max_attempts: int = 5) -> Optional[int]:
+        """
+        Zapisuje zadanie w bazie i przekazuje je do puli wątków
+
+        Wywoływać po commit głównego wiersza - zadanie jest commitowane osobno.
+
+        Args:
+            job_type: Typ zadania (musi mieć zarejestrowany handler)
+            payload: Argumenty handlera (JSON)
+            max_attempts: Maksymalna liczba prób
+
+        Returns:
+            ID zadania lub None w przypadku błędu zapisu
+        """
+        if job_type not in self._handlers:
+            logger.error(f"❌ Brak handlera dla zadania: {job_type}")
+            return None
+
+        try:
+            job = BackgroundJob(
+                job_type=job_type,
+                payload=payload or {},
+                max_attempts=max_attempts,
+                run_after=get_local_now()
+            )
+            db.session.add(job)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"❌ Nie udało się zapisać zadania {job_type}: {e}")
+            return None
+
+        if self.inline:
+            self.run_job(job.id)
+        else:
+            self._dispatch(job.id)
+        return job.id
+
+    def run_job(self, job_id: int) -> bool:
+        """
+        Wykonuje pojedyncze zadanie (wymaga kontekstu aplikacji)
+
+        Zadanie jest przejmowane atomowo (pending -> running), więc to samo ID
+        w kolejce kilku wątków lub procesów zostanie wykonane tylko raz.
+        """
+        now = get_local_now()
+        claimed = db.session.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job_id, BackgroundJob.status == 'pending')
+            .values(status='running', attempts=BackgroundJob.attempts + 1, started_at=now)
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return False
+
+        job = db.session.get(BackgroundJob, job_id)
+        handler = self._handlers.get(job.job_type)
+        try:
+            if handler is None:
+                raise LookupError(f"Brak handlera dla zadania: {job.job_type}")
+            handler(**(job.payload or {}))
+            job.status = 'done'
+            job.last_error = None
+            job.finished_at = get_local_now()
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            job = db.session.get(BackgroundJob, job_id)
+            job.last_error = str(e)
+            if job.attempts >= (job.max_attempts or 1):
+                job.status = 'failed'
+                job.finished_at = get_local_now()
+                logger.error(f"❌ Zadanie {job.job_type} #{job_id} nieudane po {job.attempts} próbach: {e}")
+            else:
+                job.status = 'pending'
+                job.run_after = get_local_now() + timedelta(seconds=self.base_backoff * 2 ** (job.attempts - 1))
+                logger.warning(f"⚠️ Zadanie {job.job_type} #{job_id} - próba {job.attempts} nieudana, ponowienie: {job.run_after}")
+            db.session.commit()
+            return False
+
+    def retry_pending_jobs(self, limit: int = 100) -> Dict[str, int]:
+        """
+        Wykonuje synchronicznie zaległe zadania (dla crona lub po restarcie procesu)
+
+        Returns:
+            Dict ze statystykami: processed, success, failed
+        """
+        stats = {'processed': 0, 'success': 0, 'failed': 0}
+        self._release_stale_jobs()
+        for job_id in self._due_job_ids(limit):
+            stats['processed'] += 1
+            if self.run_job(job_id):
+                stats['success'] += 1
+            else:
+                stats['failed'] += 1
+        return stats
+
+    def get_stats(self) -> Dict[str, int]:
+        """Liczba zadań w poszczególnych statusach oraz zajętość kolejki w pamięci"""
+        rows = db.session.query(BackgroundJob.status, db.func.count(BackgroundJob.id)) \
+            .group_by(BackgroundJob.status).all()
+        stats = {status: count for status, count in rows}
+        stats['in_memory'] = self._queue.qsize() if self._queue else 0
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        """Zatrzymuje wątki robocze (niedokończone zadania zostają w bazie)"""
+        with self._lock:
+            if not self._started:
+                return
+            for _ in self._threads:
+                self._queue.put(None)
+            if wait:
+                for thread in self._threads:
+                    thread.join(timeout=5)
+            self._threads = []
+            self._started = False
+
+    def _ensure_started(self):
+        if self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            self._queue = queue.Queue(maxsize=self.queue_size)
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    name=f'job-pipeline-{index}',
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            self._started = True
+            logger.info(f"🚀 Job pipeline uruchomiony: {self.workers} wątków, kolejka {self.queue_size}")
+
+    def _dispatch(self, job_id: int):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(job_id)
+        except queue.Full:
+            # Zadanie zostaje w bazie jako 'pending' i zostanie podjęte przez sweep
+            logger.warning(f"⚠️ Kolejka zadań pełna - zadanie #{job_id} czeka na ponowienie")
+
+    def _worker_loop(self):
+        while True:
+            try:
+                job_id = self._queue.get(timeout=self.retry_interval)
+            except queue.Empty:
+                job_id = 0
+
+            if job_id is None:
+                break
+
+            with self._app.app_context():
+                try:
+                    if job_id:
+                        self.run_job(job_id)
+                    self._maybe_sweep()
+                except Exception as e:
+                    logger.error(f"❌ Błąd wątku job pipeline: {e}")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+
+    def _maybe_sweep(self):
+        """Przekazuje do kolejki zadania, których termin ponowienia minął"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep < self.retry_interval:
+                return
+            self._last_sweep = now
+
+        self._release_stale_jobs()
+        free_slots = self.queue_size - self._queue.qsize()
+        for job_id in self._due_job_ids(free_slots):
+            try:
+                self._queue.put_nowait(job_id)
+            except queue.Full:
+                break
+
+    def _due_job_ids(self, limit: int):
+        if limit <= 0:
+            return []
+        rows = db.session.query(BackgroundJob.id).filter(
+            BackgroundJob.status == 'pending',
+            or_(BackgroundJob.run_after.is_(None), BackgroundJob.run_after <= get_local_now())
+        ).order_by(BackgroundJob.run_after.asc()).limit(limit).all()
+        return [row.id for row in rows]
+
+    def _release_stale_jobs(self):
+        """Przywraca do 'pending' zadania porzucone przez zatrzymany proces"""
+        threshold = get_local_now() - timedelta(seconds=self.stale_after)
+        released = db.session.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.status == 'running', BackgroundJob.started_at < threshold)
+            .values(status='pending')
+        ).rowcount
+        db.session.commit()
+        if released:
+            logger.warning(f"⚠️ Przywrócono {released} porzuconych zadań")
+
+
+# Globalna instancja
+job_pipeline = JobPipeline()
+
+
+@job_pipeline.register('blog_comment_enrichment')
+def _enrich_blog_comment(comment_id, ip_address=None, user_agent=None):
+    from app.blueprints.blog_controller import BlogController
+    BlogController.enrich_comment_metadata(comment_id, ip_address, user_agent)
+
+
+@job_pipeline.register('blog_comment_notification')
+def _notify_about_blog_comment(comment_id, admin_id=None):
+    from app.blueprints.blog_controller import BlogController
+    BlogController.notify_admins_about_comment(comment_id, admin_id)
+
+
+@job_pipeline.register('event_registration_followup')
+def _event_registration_followup(user_id, event_id):
+    from app.blueprints.public_controller import PublicController
+    PublicController.finalize_event_registration(user_id, event_id)
+
+
+@job_pipeline.register('blog_image_variants')
+def _blog_image_variants(post_id=None, image_id=None):
+    from app.services.image_pipeline import ImagePipeline
+    if post_id:
+        ImagePipeline.process_featured_image(post_id)
+    if image_id:
+        ImagePipeline.process_gallery_image(image_id)
+
+
+@job_pipeline.register('social_publication')
+def _social_publication(publication_id):
+    from app.services.social_outbox import SocialOutbox
+    SocialOutbox.deliver(publication_id)
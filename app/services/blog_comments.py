@@ -0,0 +1,45 @@
+"""
+Blog Comments - drzewo komentarzy posta jednym zapytaniem
+
+- wszystkie komentarze posta pobierane jednym zapytaniem po indeksie
+  ix_blog_comments_post_thread (post_id, is_approved, parent_id, created_at),
+  w kolejności indeksu (parent_id, created_at; komentarze najwyższego poziomu,
+  parent_id NULL, na końcu)
+- drzewo składane w pamięci w O(n); odpowiedzi ustawiane w relacji replies
+  bez dodatkowych zapytań i bez oznaczania obiektów jako zmienionych
+"""
+from typing import List
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models import BlogComment
+
+
+class CommentTree:
+    """Ładowanie wątków komentarzy"""
+
+    @staticmethod
+    def load(post_id: int, approved_only: bool = True) -> List[BlogComment]:
+        """
+        Komentarze najwyższego poziomu posta z odpowiedziami (comment.replies) na dowolnej głębokości
+
+        Przy approved_only odpowiedzi do niezatwierdzonych komentarzy są pomijane.
+        """
+        query = BlogComment.query.filter(BlogComment.post_id == post_id)
+        if approved_only:
+            query = query.filter(BlogComment.is_approved.is_(True))
+        # Kolejność indeksu - korzenie (NULL) trafiają na koniec, drzewo nie zależy od kolejności grup
+        comments = query.order_by(BlogComment.parent_id.asc(), BlogComment.created_at.asc()).all()
+
+        by_id = {comment.id: comment for comment in comments}
+        children = {comment.id: [] for comment in comments}
+        roots = []
+        for comment in comments:
+            if comment.parent_id is None:
+                roots.append(comment)
+            elif comment.parent_id in children:
+                children[comment.parent_id].append(comment)
+
+        for comment in comments:
+            set_committed_value(comment, 'replies', children[comment.id])
+            if comment.parent_id in by_id:
+                set_committed_value(comment, 'parent', by_id[comment.parent_id])
+        return roots
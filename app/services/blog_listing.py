@@ -0,0 +1,138 @@
+"""
+Blog Listing - lekkie zapytania list postów bloga
+
+Strony list (blog, kategoria, tag, wyszukiwanie) i /api/blog/posts:
+- tylko kolumny potrzebne na liście; zamiast pełnej treści początek treści
+  (BlogPost.content_preview) dla BlogPost.summary
+- autor, kategorie i tagi ładowane selectinload - stała liczba zapytań na stronę
+  zamiast 3 zapytań na każdy post
+- liczby postów kategorii i tagów oraz czas czytania postów to zapisane kolumny
+  (utrzymywane przy zapisie, app/models/blog_model.py) - bez ładowania postów i treści
+
+Uruchomienie modułu (python -m app.services.blog_listing) porównuje liczbę zapytań,
+rozmiar odpowiedzi i czas dla starego i nowego sposobu ładowania.
+"""
+from typing import Dict, List
+from sqlalchemy import func
+from sqlalchemy.orm import load_only, selectinload, with_expression
+from app import db
+from app.models import BlogPost, BlogCategory, BlogTag, User
+
+# BlogPost.summary skraca do 150 znaków - jeden znak więcej mówi, czy treść jest dłuższa
+PREVIEW_LENGTH = 151
+
+LISTING_COLUMNS = (
+    BlogPost.id, BlogPost.title, BlogPost.slug, BlogPost.excerpt, BlogPost.featured_image,
+    BlogPost.featured_image_variants, BlogPost.author_id, BlogPost.status, BlogPost.reading_time,
+    BlogPost.created_at, BlogPost.published_at
+)
+
+
+def listing_options():
+    """Opcje ładowania BlogPost dla stron list"""
+    return (
+        load_only(*LISTING_COLUMNS),
+        with_expression(BlogPost.content_preview, func.substr(BlogPost.content, 1, PREVIEW_LENGTH)),
+        selectinload(BlogPost.author).load_only(User.id, User.first_name, User.email),
+        selectinload(BlogPost.categories).selectinload(BlogCategory.parent),
+        selectinload(BlogPost.tags),
+    )
+
+
+def listing_query():
+    """Opublikowane posty z opcjami listy (bez sortowania)"""
+    return BlogPost.query.filter_by(status='published').options(*listing_options())
+
+
+def serialize_post(post: BlogPost, include_content: bool = False) -> Dict:
+    """Post na liście API"""
+    data = {
+        'id': post.id,
+        'title': post.title,
+        'slug': post.slug,
+        'excerpt': post.excerpt,
+        'summary': post.summary,
+        'published_at': post.published_at.isoformat() if post.published_at else None,
+        'author': post.author.first_name if post.author else 'Unknown',
+        'categories': [{'id': cat.id, 'title': cat.title, 'slug': cat.slug} for cat in post.categories],
+        'tags': [{'id': tag.id, 'name': tag.name, 'slug': tag.slug} for tag in post.tags],
+        'featured_image': post.featured_image,
+        'featured_image_variants': post.featured_responsive,
+        'reading_time': post.reading_time
+    }
+    if include_content:
+        data['content'] = post.content
+    return data
+
+
+def sidebar_categories() -> List[BlogCategory]:
+    """Aktywne kategorie z podkategoriami i liczbą postów"""
+    return BlogCategory.query.filter_by(is_active=True) \
+        .options(selectinload(BlogCategory.children), selectinload(BlogCategory.parent)) \
+        .order_by(BlogCategory.title).all()
+
+
+def sidebar_tags() -> List[BlogTag]:
+    """Aktywne tagi z liczbą postów"""
+    return BlogTag.query.filter_by(is_active=True).order_by(BlogTag.name).all()
+
+
+if __name__ == "__main__":
+    """Benchmark: zapytania, rozmiar odpowiedzi i czas - stare vs nowe ładowanie listy"""
+    import json
+    import time
+    from sqlalchemy import event
+    from app import create_app
+
+    app = create_app()
+    per_page = 10
+
+    def old_listing():
+        posts = BlogPost.query.filter_by(status='published') \
+            .order_by(BlogPost.published_at.desc().nulls_last()) \
+            .paginate(page=1, per_page=per_page, error_out=False)
+        payload = [{
+            'id': post.id,
+            'title': post.title,
+            'slug': post.slug,
+            'excerpt': post.excerpt,
+            'content': post.content,
+            'published_at': post.published_at.isoformat() if post.published_at else None,
+            'author': post.author.first_name if post.author else 'Unknown',
+            'categories': [{'id': cat.id, 'title': cat.title, 'slug': cat.slug} for cat in post.categories],
+            'tags': [{'id': tag.id, 'name': tag.name, 'slug': tag.slug} for tag in post.tags],
+            'featured_image': post.featured_image
+        } for post in posts.items]
+        categories = BlogCategory.query.filter_by(is_active=True).order_by(BlogCategory.title).all()
+        tags = BlogTag.query.filter_by(is_active=True).order_by(BlogTag.name).all()
+        # Counts from loaded posts, as before the stored posts_count columns
+        payload.append({
+            'categories': {c.id: [len(c.posts), [len(child.posts) for child in c.children]] for c in categories},
+            'tags': {t.id: len(t.posts) for t in tags}
+        })
+        return payload
+
+    def new_listing():
+        posts = listing_query().order_by(BlogPost.published_at.desc().nulls_last()) \
+            .paginate(page=1, per_page=per_page, error_out=False)
+        payload = [serialize_post(post) for post in posts.items]
+        categories = sidebar_categories()
+        tags = sidebar_tags()
+        payload.append({
+            'categories': {c.id: [c.posts_count, [child.posts_count for child in c.children]] for c in categories},
+            'tags': {t.id: t.posts_count for t in tags}
+        })
+        return payload
+
+    with app.app_context():
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+        for label, func_ in (('przed', old_listing), ('po', new_listing)):
+            db.session.remove()
+            statements.clear()
+            start = time.perf_counter()
+            payload = func_()
+            elapsed = time.perf_counter() - start
+            size = len(json.dumps(payload, default=str).encode('utf-8'))
+            print(f"{label:>6}: {len(statements):4d} zapytań, {size / 1024:8.1f} KiB, {elapsed * 1000:8.1f} ms")
@@ -0,0 +1,224 @@
+"""
+Blog Search - wyszukiwanie pełnotekstowe postów bloga
+
+Na PostgreSQL:
+- kolumna blog_posts.search_vector (tsvector z wagami: tytuł A, zajawka B, treść C)
+  utrzymywana przez trigger (migracja c7f1a4d9e2b8), indeks GIN ix_blog_posts_search_vector
+- konfiguracja językowa z funkcji blog_search_config() - 'polish' gdy słownik jest
+  zainstalowany, inaczej 'simple'; każde słowo zapytania dopasowywane także jako prefiks
+  (zdrow -> zdrowie, zdrowia), co obsługuje odmianę również bez słownika
+- kolejność wg ts_rank, fragmenty z wyróżnieniem przez ts_headline tylko dla bieżącej strony
+
+Na innych bazach (np. SQLite w testach) - indeks odwrócony w pamięci procesu
+z tymi samymi wagami, przebudowywany gdy zmienią się posty.
+"""
+import re
+import html
+import bisect
+import threading
+from typing import Dict, List, Optional, Tuple
+from markupsafe import Markup, escape
+from sqlalchemy import func, case, text, false
+from app import db
+from app.models import BlogPost
+
+# Wagi jak domyślne w ts_rank ({D, C, B, A} = {0.1, 0.2, 0.4, 1.0})
+FIELD_WEIGHTS = (('title', 1.0), ('excerpt', 0.4), ('content', 0.2))
+
+MAX_TERMS = 8
+SNIPPET_WORDS = 30
+
+# Znaczniki wyróżnienia (zamieniane na <mark> po escapowaniu fragmentu)
+_START_SEL = '\x02'
+_STOP_SEL = '\x03'
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+_TAGS = re.compile(r'<[^>]+>')
+
+
+def plain_text(value: Optional[str]) -> str:
+    """Treść bez znaczników HTML"""
+    return html.unescape(_TAGS.sub(' ', value or ''))
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    return _WORD.findall((value or '').lower())
+
+
+def query_terms(query: Optional[str]) -> List[str]:
+    """Unikalne słowa zapytania (bez znaków specjalnych tsquery)"""
+    terms = []
+    for term in tokenize(query):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def _highlight(fragment: str) -> Markup:
+    """Escapuje fragment i zamienia znaczniki na <mark>"""
+    return Markup(str(escape(fragment)).replace(_START_SEL, '<mark>').replace(_STOP_SEL, '</mark>'))
+
+
+class PythonSearchIndex:
+    """Indeks odwrócony postów opublikowanych (fallback poza PostgreSQL)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signature = None
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._vocabulary: List[str] = []
+
+    @staticmethod
+    def _current_signature():
+        return db.session.query(func.count(BlogPost.id), func.max(BlogPost.updated_at)) \
+            .filter(BlogPost.status == 'published').one()
+
+    def _rebuild(self, signature):
+        postings = {}
+        rows = db.session.query(BlogPost.id, BlogPost.title, BlogPost.excerpt, BlogPost.content) \
+            .filter(BlogPost.status == 'published').all()
+        for row in rows:
+            for field, weight in FIELD_WEIGHTS:
+                value = getattr(row, field)
+                tokens = tokenize(plain_text(value) if field == 'content' else value)
+                if not tokens:
+                    continue
+                # Normalizacja długością pola, podobnie jak ts_rank z normalizacją logarytmiczną
+                score = weight / len(tokens) ** 0.5
+                for token in tokens:
+                    scores = postings.setdefault(token, {})
+                    scores[row.id] = scores.get(row.id, 0.0) + score
+
+        with self._lock:
+            self._postings = postings
+            self._vocabulary = sorted(postings)
+            self._signature = signature
+
+    def _ensure_fresh(self):
+        signature = tuple(self._current_signature())
+        if signature != self._signature:
+            self._rebuild(signature)
+
+    def _prefix_matches(self, term: str) -> List[str]:
+        start = bisect.bisect_left(self._vocabulary, term)
+        matches = []
+        for token in self._vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            matches.append(token)
+        return matches
+
+    def search(self, terms: List[str]) -> List[Tuple[int, float]]:
+        """Posty zawierające wszystkie słowa (jako prefiksy), malejąco wg wyniku"""
+        self._ensure_fresh()
+        totals = None
+        for term in terms:
+            scores = {}
+            for token in self._prefix_matches(term):
+                for post_id, score in self._postings[token].items():
+                    scores[post_id] = scores.get(post_id, 0.0) + score
+            if totals is None:
+                totals = scores
+            else:
+                totals = {post_id: totals[post_id] + score for post_id, score in scores.items() if post_id in totals}
+            if not totals:
+                return []
+        return sorted((totals or {}).items(), key=lambda item: (-item[1], -item[0]))
+
+
+_python_index = PythonSearchIndex()
+
+
+class BlogSearch:
+    """Budowanie zapytań wyszukiwania postów"""
+
+    @staticmethod
+    def is_postgres() -> bool:
+        return db.engine.dialect.name == 'postgresql'
+
+    @staticmethod
+    def _tsquery(terms: List[str]):
+        # Każde słowo jako prefiks, wszystkie wymagane
+        return func.to_tsquery(func.blog_search_config(), ' & '.join(f'{term}:*' for term in terms))
+
+    @classmethod
+    def apply(cls, query, search: Optional[str]):
+        """
+        Ogranicza zapytanie BlogPost do wyników wyszukiwania i sortuje wg trafności
+
+        Zapytanie nie powinno mieć własnego order_by (zostaje zastąpione).
+        """
+        terms = query_terms(search)
+        if not terms:
+            return query.filter(false())
+
+        if cls.is_postgres():
+            vector = BlogPost.search_vector
+            tsquery = cls._tsquery(terms)
+            return query.filter(vector.op('@@')(tsquery)).order_by(None).order_by(
+                func.ts_rank(vector, tsquery).desc(),
+                BlogPost.published_at.desc().nulls_last(),
+                BlogPost.id.desc()
+            )
+
+        ranked = _python_index.search(terms)
+        if not ranked:
+            return query.filter(false())
+        ids = [post_id for post_id, _ in ranked]
+        position = case({post_id: index for index, post_id in enumerate(ids)}, value=BlogPost.id)
+        return query.filter(BlogPost.id.in_(ids)).order_by(None).order_by(position)
+
+    @classmethod
+    def snippets(cls, posts: List[BlogPost], search: Optional[str]) -> Dict[int, Markup]:
+        """Fragmenty treści z wyróżnionymi słowami dla podanych postów (jedna strona wyników)"""
+        terms = query_terms(search)
+        if not posts or not terms:
+            return {}
+
+        if cls.is_postgres():
+            options = (f'StartSel={_START_SEL}, StopSel={_STOP_SEL}, '
+                       f'MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}, MaxFragments=2')
+            rows = db.session.execute(
+                text(
+                    "SELECT id, ts_headline(blog_search_config(), "
+                    "regexp_replace(coalesce(content, ''), '<[^>]+>', ' ', 'g'), "
+                    "to_tsquery(blog_search_config(), :tsquery), :options) "
+                    "FROM blog_posts WHERE id = ANY(:ids)"
+                ),
+                {
+                    'tsquery': ' & '.join(f'{term}:*' for term in terms),
+                    'options': options,
+                    'ids': [post.id for post in posts]
+                }
+            ).all()
+            return {post_id: _highlight(html.unescape(headline)) for post_id, headline in rows}
+
+        return {post.id: cls._python_snippet(post, terms) for post in posts}
+
+    @staticmethod
+    def _python_snippet(post: BlogPost, terms: List[str]) -> Markup:
+        words = plain_text(post.content).split()
+        matches = [i for i, word in enumerate(words)
+                   if any(token.startswith(term) for token in tokenize(word) for term in terms)]
+        start = max(0, matches[0] - SNIPPET_WORDS // 3) if matches else 0
+        window = words[start:start + SNIPPET_WORDS]
+
+        marked = []
+        for word in window:
+            if any(token.startswith(term) for token in tokenize(word) for term in terms):
+                word = f'{_START_SEL}{word}{_STOP_SEL}'
+            marked.append(word)
+
+        fragment = ' '.join(marked)
+        if start > 0:
+            fragment = '… ' + fragment
+        if start + SNIPPET_WORDS < len(words):
+            fragment += ' …'
+        return _highlight(fragment)
+
+    @classmethod
+    def attach_snippets(cls, posts: List[BlogPost], search: Optional[str]):
+        """Ustawia post.search_snippet (Markup) dla postów bieżącej strony"""
+        snippets = cls.snippets(posts, search)
+        for post in posts:
+            post.search_snippet = snippets.get(post.id)
@@ -355,6 +355,10 @@ class CampaignService:
                 except json.JSONDecodeError:
                     content_variables = {}
             
+            # Podpisz linki do wypisania dla wszystkich odbiorców naraz
+            from app.services.unsubscribe_manager import unsubscribe_manager
+            unsubscribe_urls = unsubscribe_manager.bulk_get_urls((user.id, user.email) for user in all_recipients)
+            
             # Dodaj emaile do kolejki
             added_count = 0
             for user in all_recipients:
@@ -366,18 +370,7 @@ class CampaignService:
                 }
                 
                 # Dodaj linki do wypisania
-                try:
-                    from app.services.unsubscribe_manager import unsubscribe_manager
-                    context.update({
-                        'unsubscribe_url': unsubscribe_manager.get_unsubscribe_url(user.email),
-                        'delete_account_url': unsubscribe_manager.get_delete_account_url(user.email)
-                    })
-                except Exception as e:
-                    logger.warning(f"⚠️ Błąd generowania linków unsubscribe: {e}")
-                    context.update({
-                        'unsubscribe_url': 'mailto:kontakt@klublepszezycie.pl',
-                        'delete_account_url': 'mailto:kontakt@klublepszezycie.pl'
-                    })
+                context.update(unsubscribe_urls[user.email])
                 
                 # Dodaj email do kolejki
                 success, message, queue_id = self.email_manager._add_to_queue(
@@ -441,6 +434,10 @@ class CampaignService:
             from app.services.email_v2.templates.engine import EmailTemplateEngine
             template_engine = EmailTemplateEngine()
             
+            # Podpisz linki do wypisania dla wszystkich odbiorców naraz
+            from app.services.unsubscribe_manager import unsubscribe_manager
+            unsubscribe_urls = unsubscribe_manager.bulk_get_urls((user.id, user.email) for user in recipients)
+            
             added_count = 0
             
             for user in recipients:
@@ -453,18 +450,7 @@ class CampaignService:
                     }
                     
                     # Dodaj linki do wypisania
-                    try:
-                        from app.services.unsubscribe_manager import unsubscribe_manager
-                        context.update({
-                            'unsubscribe_url': unsubscribe_manager.get_unsubscribe_url(user.email),
-                            'delete_account_url': unsubscribe_manager.get_delete_account_url(user.email)
-                        })
-                    except Exception as e:
-                        logger.warning(f"⚠️ Błąd generowania linków unsubscribe: {e}")
-                        context.update({
-                            'unsubscribe_url': 'mailto:kontakt@klublepszezycie.pl',
-                            'delete_account_url': 'mailto:kontakt@klublepszezycie.pl'
-                        })
+                    context.update(unsubscribe_urls[user.email])
                     
                     # Renderuj subject i content
                     rendered_subject = template_engine.render_template(template.subject, context)
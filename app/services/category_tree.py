@@ -0,0 +1,161 @@
+"""
+Category Tree - drzewo kategorii bloga w pamięci procesu
+
+Zamiast osobnych zapytań o rodzica i dziecko przy każdym adresie /blog/category/...
+i leniwego ładowania category.parent dla każdego linku na liście:
+- wszystkie kategorie wczytywane jednym zapytaniem (bez encji ORM) do słownika
+  id -> węzeł (slug, rodzic, dzieci, aktywność, ścieżka slugów w adresie, URL)
+- rozwiązywanie ścieżki slugów i generowanie URL-i to odczyty ze słownika, bez bazy
+- drzewo wersjonowane (liczba kategorii, ostatnia zmiana): wersja w bazie sprawdzana
+  co CATEGORY_TREE_CHECK_INTERVAL sekund, drzewo przebudowywane tylko po jej zmianie
+  (zapisy z innych procesów); zapisy categories_api unieważniają drzewo od razu
+"""
+import time
+import logging
+import threading
+from collections import namedtuple
+from typing import Dict, Iterable, Optional, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy import func
+from app.models import db, BlogCategory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_INTERVAL = 60
+
+URL_PREFIX = '/blog/category/'
+
+# Węzeł drzewa - url_slugs to segmenty adresu kategorii ((rodzic, slug) lub (slug,))
+CategoryNode = namedtuple('CategoryNode', [
+    'id', 'slug', 'title', 'parent_id', 'children', 'is_active', 'url_slugs', 'url'
+])
+
+
+def _config(key: str, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+class CategoryTree:
+    """Migawka drzewa kategorii (id -> węzeł, slug -> id) z wersją"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nodes: Dict[int, CategoryNode] = {}
+        self._by_slug: Dict[str, int] = {}
+        self._version: Optional[Tuple] = None
+        self._checked_at: Optional[float] = None
+
+    @staticmethod
+    def _current_version() -> Tuple:
+        count, changed = db.session.query(func.count(BlogCategory.id), func.max(BlogCategory.updated_at)).one()
+        return count, changed.isoformat() if changed else None
+
+    def rebuild(self, version: Optional[Tuple] = None):
+        """Wczytuje wszystkie kategorie (jedno zapytanie) i podmienia migawkę"""
+        if version is None:
+            version = self._current_version()
+        rows = db.session.query(
+            BlogCategory.id, BlogCategory.slug, BlogCategory.title, BlogCategory.parent_id, BlogCategory.is_active
+        ).order_by(BlogCategory.sort_order, BlogCategory.title).all()
+
+        by_id = {row.id: row for row in rows}
+        children = {row.id: [] for row in rows}
+        for row in rows:
+            if row.parent_id in children:
+                children[row.parent_id].append(row.id)
+
+        nodes = {}
+        for row in rows:
+            parent = by_id.get(row.parent_id)
+            url_slugs = (parent.slug, row.slug) if parent else (row.slug,)
+            nodes[row.id] = CategoryNode(
+                id=row.id,
+                slug=row.slug,
+                title=row.title,
+                parent_id=row.parent_id if parent else None,
+                children=tuple(children[row.id]),
+                is_active=bool(row.is_active),
+                url_slugs=url_slugs,
+                url=URL_PREFIX + '/'.join(url_slugs)
+            )
+
+        with self._lock:
+            self._nodes = nodes
+            self._by_slug = {node.slug: node.id for node in nodes.values()}
+            self._version = version
+            self._checked_at = time.monotonic()
+
+        logger.debug(f"🌳 Drzewo kategorii: {len(nodes)} kategorii, wersja {version}")
+
+    def invalidate(self):
+        """Wymusza sprawdzenie wersji i przebudowę przy następnym odczycie"""
+        with self._lock:
+            self._version = None
+            self._checked_at = None
+
+    def _ensure_fresh(self):
+        checked_at = self._checked_at
+        interval = int(_config('CATEGORY_TREE_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL))
+        if checked_at is not None and time.monotonic() - checked_at <= interval:
+            return
+        version = self._current_version()
+        if version == self._version:
+            with self._lock:
+                self._checked_at = time.monotonic()
+            return
+        self.rebuild(version)
+
+    @property
+    def version(self) -> Optional[Tuple]:
+        self._ensure_fresh()
+        return self._version
+
+    def node(self, category_id: int) -> Optional[CategoryNode]:
+        self._ensure_fresh()
+        return self._nodes.get(category_id)
+
+    def by_slug(self, slug: str, active_only: bool = True) -> Optional[CategoryNode]:
+        self._ensure_fresh()
+        node = self._nodes.get(self._by_slug.get(slug))
+        if node is None or (active_only and not node.is_active):
+            return None
+        return node
+
+    def resolve(self, slugs: Iterable[str], active_only: bool = True) -> Optional[CategoryNode]:
+        """
+        Kategoria dla segmentów adresu (['rodzic', 'dziecko'] lub ['kategoria'])
+
+        Returns:
+            Węzeł, gdy ostatni slug istnieje i segmenty zgadzają się z jego adresem, inaczej None
+        """
+        slugs = tuple(slugs)
+        node = self.by_slug(slugs[-1], active_only) if slugs else None
+        if node is None or node.url_slugs != slugs:
+            return None
+        return node
+
+    def parent(self, category_id: int) -> Optional[CategoryNode]:
+        node = self.node(category_id)
+        return self._nodes.get(node.parent_id) if node else None
+
+    def children(self, category_id: int, active_only: bool = True) -> Tuple[CategoryNode, ...]:
+        node = self.node(category_id)
+        if node is None:
+            return ()
+        return tuple(child for child in (self._nodes[child_id] for child_id in node.children)
+                     if child.is_active or not active_only)
+
+    def category_url(self, category_id: int) -> Optional[str]:
+        node = self.node(category_id)
+        return node.url if node else None
+
+    def post_url(self, post_slug: str, category_id: Optional[int] = None) -> str:
+        """Adres posta w kategorii (/blog/category/.../<slug>) lub /blog/<slug> bez kategorii"""
+        base = self.category_url(category_id) if category_id is not None else None
+        return f"{base}/{post_slug}" if base else f"/blog/{post_slug}"
+
+
+# Globalna instancja
+category_tree = CategoryTree()
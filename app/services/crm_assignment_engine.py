@@ -0,0 +1,295 @@
+"""
+Contact assignment engine for CRM queue
+
+Claims unassigned contacts atomically so that many ankieters starting work at
+the same time never receive the same contact:
+- PostgreSQL: UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING id
+  (rows locked by another claim are skipped instead of waited on)
+- Call queue entries for claimed contacts are inserted in one bulk statement
+- batch size follows each ankieter's dialling rate
+
+Run as a script to simulate N concurrent agents against the configured database:
+    python -m app.services.crm_assignment_engine --agents 30 --contacts 3000 --agent-id 1
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import logging
+from datetime import timedelta
+from typing import List, Optional
+from sqlalchemy import select, update, func
+from app.models import db
+from app.models.crm_model import Contact, Call
+from app.config.crm_config import (
+    CALL_STATUSES,
+    ASSIGNMENT_MIN_BATCH,
+    ASSIGNMENT_MAX_BATCH,
+    ASSIGNMENT_DEFAULT_BATCH,
+    ASSIGNMENT_RATE_WINDOW_MINUTES,
+    ASSIGNMENT_LOOKAHEAD_MINUTES
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ContactAssignmentEngine:
+    """Atomic, contention-free assignment of contacts to ankieters"""
+
+    @staticmethod
+    def _now():
+        from app.utils.timezone_utils import get_local_now
+        return get_local_now()
+
+    @staticmethod
+    def dial_rate(ankieter_id) -> float:
+        """Calls per minute made by ankieter in the last ASSIGNMENT_RATE_WINDOW_MINUTES"""
+        since = ContactAssignmentEngine._now() - timedelta(minutes=ASSIGNMENT_RATE_WINDOW_MINUTES)
+        calls_made = db.session.query(func.count(Call.id)).filter(
+            Call.ankieter_id == ankieter_id,
+            Call.call_date >= since,
+            Call.status.in_(list(CALL_STATUSES))
+        ).scalar() or 0
+        return calls_made / ASSIGNMENT_RATE_WINDOW_MINUTES
+
+    @staticmethod
+    def adaptive_batch_size(ankieter_id) -> int:
+        """
+        Number of contacts to claim for ankieter
+
+        Enough to keep the queue filled for ASSIGNMENT_LOOKAHEAD_MINUTES at the
+        ankieter's current dialling rate, minus what is already pending, clamped
+        to ASSIGNMENT_MIN_BATCH..ASSIGNMENT_MAX_BATCH. Returns 0 when the pending
+        queue already covers the look-ahead window. Without dialling history the
+        queue is topped up to ASSIGNMENT_DEFAULT_BATCH.
+        """
+        pending = db.session.query(func.count(Call.id)).filter(
+            Call.ankieter_id == ankieter_id,
+            Call.queue_status == 'pending'
+        ).scalar() or 0
+
+        rate = ContactAssignmentEngine.dial_rate(ankieter_id)
+        if rate <= 0:
+            return max(0, ASSIGNMENT_DEFAULT_BATCH - pending)
+
+        wanted = int(round(rate * ASSIGNMENT_LOOKAHEAD_MINUTES)) - pending
+        if wanted <= 0:
+            return 0
+        return max(ASSIGNMENT_MIN_BATCH, min(ASSIGNMENT_MAX_BATCH, wanted))
+
+    @staticmethod
+    def claim_contacts(ankieter_id, limit: int, campaign_id: Optional[int] = None) -> List[int]:
+        """
+        Atomically assign up to `limit` unassigned, callable contacts to ankieter
+
+        Returns:
+            List of claimed contact ids (flushed, not committed)
+        """
+        if limit <= 0:
+            return []
+
+        candidates = select(Contact.id).where(
+            Contact.assigned_ankieter_id.is_(None),
+            Contact.is_active == True,
+            Contact.callable_clause()
+        )
+        if campaign_id is not None:
+            candidates = candidates.where(Contact.campaign_id == campaign_id)
+
+        # SKIP LOCKED: concurrent claims take disjoint rows instead of blocking
+        candidates = candidates.order_by(Contact.id).limit(limit).with_for_update(skip_locked=True)
+
+        result = db.session.execute(
+            update(Contact)
+            .where(Contact.id.in_(candidates.scalar_subquery()))
+            .where(Contact.assigned_ankieter_id.is_(None))
+            .values(assigned_ankieter_id=ankieter_id, updated_at=ContactAssignmentEngine._now())
+            .returning(Contact.id)
+            .execution_options(synchronize_session=False)
+        )
+        return [row[0] for row in result]
+
+    @staticmethod
+    def _bulk_create_calls(contact_ids: List[int], ankieter_id, priority='low', queue_type='new'):
+        """Insert queue entries for contacts in one statement"""
+        if not contact_ids:
+            return
+        now = ContactAssignmentEngine._now()
+        db.session.bulk_insert_mappings(Call, [{
+            'contact_id': contact_id,
+            'ankieter_id': ankieter_id,
+            'priority': priority,
+            'queue_status': 'pending',
+            'queue_type': queue_type,
+            'status': 'pending',
+            'call_date': now,
+            'created_at': now,
+            'updated_at': now
+        } for contact_id in contact_ids])
+
+    @staticmethod
+    def assign_batch(ankieter_id, limit: Optional[int] = None, campaign_id: Optional[int] = None) -> List[int]:
+        """
+        Claim contacts for ankieter and create their queue entries in one transaction
+
+        Args:
+            ankieter_id: Ankieter ID
+            limit: Batch size (None = adaptive_batch_size)
+            campaign_id: Only claim contacts from this campaign
+
+        Returns:
+            List of assigned contact ids
+        """
+        if limit is None:
+            limit = ContactAssignmentEngine.adaptive_batch_size(ankieter_id)
+        if limit <= 0:
+            return []
+
+        try:
+            contact_ids = ContactAssignmentEngine.claim_contacts(ankieter_id, limit, campaign_id)
+            ContactAssignmentEngine._bulk_create_calls(contact_ids, ankieter_id)
+            db.session.commit()
+            return contact_ids
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def assign_contact(contact_id, ankieter_id, priority='low'):
+        """
+        Assign a single contact to ankieter without creating duplicate pending entries
+
+        The contact row is locked (SELECT ... FOR UPDATE) for the duration of the
+        check-then-insert, so concurrent calls for the same contact are serialised.
+        """
+        try:
+            contact = db.session.query(Contact).filter(Contact.id == contact_id).with_for_update().first()
+            if not contact:
+                db.session.rollback()
+                return None
+
+            existing = Call.query.filter_by(
+                contact_id=contact_id,
+                ankieter_id=ankieter_id,
+                queue_status='pending'
+            ).first()
+            if existing:
+                db.session.commit()
+                return existing
+
+            call_entry = Call(
+                contact_id=contact_id,
+                ankieter_id=ankieter_id,
+                priority=priority,
+                queue_status='pending',
+                status='pending',
+                call_date=ContactAssignmentEngine._now()
+            )
+            db.session.add(call_entry)
+            db.session.commit()
+            return call_entry
+        except Exception:
+            db.session.rollback()
+            raise
+
+
+def _run_harness(agents: int, contacts: int, agent_ids: List[int], batch: Optional[int]):
+    """Simulate `agents` concurrent ankieters claiming a fresh pool of contacts"""
+    import time
+    import threading
+    from collections import Counter
+    from app import create_app
+    from app.models.crm_model import Campaign
+
+    app = create_app()
+
+    with app.app_context():
+        campaign = Campaign(name=f'assignment-harness-{int(time.time())}', is_active=False)
+        db.session.add(campaign)
+        db.session.flush()
+        db.session.bulk_insert_mappings(Contact, [{
+            'name': f'Harness {i}',
+            'phone': f'+48000{i:06d}',
+            'phone_normalized': f'+48000{i:06d}',
+            'campaign_id': campaign.id,
+            'is_active': True,
+            'is_blacklisted': False,
+            'call_attempts': 0,
+            'max_call_attempts': 3
+        } for i in range(contacts)])
+        db.session.commit()
+        campaign_id = campaign.id
+
+    claimed = {}
+    errors = []
+    barrier = threading.Barrier(agents)
+
+    def agent(index):
+        ankieter_id = agent_ids[index % len(agent_ids)]
+        taken = []
+        with app.app_context():
+            barrier.wait()
+            try:
+                while True:
+                    ids = ContactAssignmentEngine.assign_batch(ankieter_id, limit=batch, campaign_id=campaign_id)
+                    if not ids:
+                        break
+                    taken.extend(ids)
+            except Exception as e:
+                errors.append(f'agent {index}: {e}')
+            finally:
+                db.session.remove()
+        claimed[index] = taken
+
+    threads = [threading.Thread(target=agent, args=(i,)) for i in range(agents)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    all_ids = [contact_id for ids in claimed.values() for contact_id in ids]
+    duplicates = [contact_id for contact_id, count in Counter(all_ids).items() if count > 1]
+
+    with app.app_context():
+        harness_ids = select(Contact.id).where(Contact.campaign_id == campaign_id).scalar_subquery()
+        calls_per_contact = db.session.query(Call.contact_id, func.count(Call.id)) \
+            .filter(Call.contact_id.in_(harness_ids)) \
+            .group_by(Call.contact_id) \
+            .having(func.count(Call.id) > 1).count()
+        unassigned = db.session.query(func.count(Contact.id)).filter(
+            Contact.campaign_id == campaign_id,
+            Contact.assigned_ankieter_id.is_(None)
+        ).scalar()
+
+        # Cleanup harness data
+        db.session.query(Call).filter(Call.contact_id.in_(harness_ids)).delete(synchronize_session=False)
+        db.session.query(Contact).filter(Contact.campaign_id == campaign_id).delete(synchronize_session=False)
+        db.session.query(Campaign).filter(Campaign.id == campaign_id).delete(synchronize_session=False)
+        db.session.commit()
+
+    print(f"Agenci: {agents}, kontakty: {contacts}, batch: {batch or 'adaptacyjny'}")
+    print(f"Czas: {elapsed:.2f}s ({len(all_ids) / elapsed:,.0f} przypisań/s)")
+    print(f"Przypisane: {len(all_ids)}, nieprzypisane: {unassigned}")
+    print(f"Duplikaty przypisań: {len(duplicates)}, kontakty z wieloma wpisami kolejki: {calls_per_contact}")
+    print(f"Rozkład na agentów: min {min(map(len, claimed.values()))}, max {max(map(len, claimed.values()))}")
+    for error in errors:
+        print(f"❌ {error}")
+
+    return not duplicates and not calls_per_contact and not errors and unassigned == 0
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Symulacja równoległego przypisywania kontaktów')
+    parser.add_argument('--agents', type=int, default=30, help='Liczba równoległych ankieterów')
+    parser.add_argument('--contacts', type=int, default=3000, help='Liczba tymczasowych kontaktów')
+    parser.add_argument('--agent-id', type=int, action='append', required=True,
+                        help='ID istniejącego użytkownika (można podać wielokrotnie)')
+    parser.add_argument('--batch', type=int, default=None, help='Stały rozmiar batcha (domyślnie adaptacyjny)')
+    args = parser.parse_args()
+
+    ok = _run_harness(args.agents, args.contacts, args.agent_id, args.batch)
+    sys.exit(0 if ok else 1)
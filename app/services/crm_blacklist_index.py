@@ -0,0 +1,170 @@
+"""
+In-memory blacklist index for CRM
+
+Holds active blacklist entries (global and per campaign) keyed by normalised
+phone number, with a bloom filter in front so the common "not blacklisted"
+answer costs one probe for both scopes. The index is built from the database
+on first use, refreshed after BLACKLIST_INDEX_TTL_SECONDS (entries written by
+other worker processes become visible) and updated in place by local writes.
+"""
+import math
+import time
+import hashlib
+import logging
+import threading
+from collections import namedtuple
+from typing import Dict, Iterable, Optional
+from app.models import db
+from app.config.crm_config import BLACKLIST_INDEX_TTL_SECONDS
+from app.utils.phone_utils import normalize_phone
+
+logger = logging.getLogger(__name__)
+
+# Lightweight view of a blacklist entry (same attribute names as BlacklistEntry)
+BlacklistHit = namedtuple('BlacklistHit', ['phone', 'campaign_id', 'reason'])
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (no false negatives, ~error_rate false positives)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class BlacklistIndex:
+    """Membership index of active blacklist entries"""
+
+    def __init__(self, ttl_seconds: int = BLACKLIST_INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._global: Dict[str, BlacklistHit] = {}
+        self._campaigns: Dict[int, Dict[str, BlacklistHit]] = {}
+        self._bloom = BloomFilter(1)
+        self._built_at: Optional[float] = None
+
+    @staticmethod
+    def normalize_phone(phone) -> str:
+        """Lookup key for phone (canonical E.164 form, '' when unusable)"""
+        return normalize_phone(phone) or ''
+
+    def rebuild(self):
+        """Load all active entries from the database (one query)"""
+        from app.models.crm_model import BlacklistEntry
+
+        rows = db.session.query(
+            BlacklistEntry.phone, BlacklistEntry.campaign_id, BlacklistEntry.reason
+        ).filter(BlacklistEntry.is_active == True).all()
+
+        global_entries = {}
+        campaign_entries = {}
+        bloom = BloomFilter(len(rows) * 2 + 1024)
+
+        for phone, campaign_id, reason in rows:
+            key = self.normalize_phone(phone)
+            if not key:
+                continue
+            hit = BlacklistHit(phone, campaign_id, reason)
+            if campaign_id is None:
+                global_entries.setdefault(key, hit)
+            else:
+                campaign_entries.setdefault(campaign_id, {}).setdefault(key, hit)
+            bloom.add(key)
+
+        with self._lock:
+            self._global = global_entries
+            self._campaigns = campaign_entries
+            self._bloom = bloom
+            self._built_at = time.monotonic()
+
+        logger.info(f"📋 Indeks blacklisty: {len(global_entries)} globalnych, "
+                    f"{sum(len(v) for v in campaign_entries.values())} kampanijnych")
+
+    def invalidate(self):
+        """Force rebuild on next lookup"""
+        with self._lock:
+            self._built_at = None
+
+    def _ensure_fresh(self):
+        built_at = self._built_at
+        if built_at is None or time.monotonic() - built_at > self.ttl_seconds:
+            self.rebuild()
+
+    def _lookup_key(self, key: str, campaign_id=None) -> Optional[BlacklistHit]:
+        if not key or key not in self._bloom:
+            return None
+        hit = self._global.get(key)
+        if hit is None and campaign_id is not None:
+            hit = self._campaigns.get(campaign_id, {}).get(key)
+        return hit
+
+    def lookup(self, phone, campaign_id=None) -> Optional[BlacklistHit]:
+        """Blacklist entry covering phone (global first, then campaign) or None"""
+        self._ensure_fresh()
+        return self._lookup_key(self.normalize_phone(phone), campaign_id)
+
+    def is_blacklisted_many(self, phones: Iterable, campaign_id=None) -> Dict[str, BlacklistHit]:
+        """
+        Batch membership check
+
+        Returns:
+            Dict {phone: BlacklistHit} for blacklisted phones only (keys as given)
+        """
+        self._ensure_fresh()
+        hits = {}
+        for phone in phones:
+            hit = self._lookup_key(self.normalize_phone(phone), campaign_id)
+            if hit is not None:
+                hits[phone] = hit
+        return hits
+
+    def add(self, phone, campaign_id=None, reason=None):
+        """Register a new active entry (call after the row is written)"""
+        key = self.normalize_phone(phone)
+        if not key:
+            return
+        hit = BlacklistHit(phone, campaign_id, reason)
+        with self._lock:
+            if campaign_id is None:
+                self._global.setdefault(key, hit)
+            else:
+                self._campaigns.setdefault(campaign_id, {}).setdefault(key, hit)
+            self._bloom.add(key)
+
+    def remove(self, phone, campaign_id=None):
+        """Drop an entry (bloom bits stay set until the next rebuild)"""
+        key = self.normalize_phone(phone)
+        with self._lock:
+            if campaign_id is None:
+                self._global.pop(key, None)
+            else:
+                self._campaigns.get(campaign_id, {}).pop(key, None)
+
+    def get_stats(self) -> Dict:
+        return {
+            'global_entries': len(self._global),
+            'campaign_entries': sum(len(v) for v in self._campaigns.values()),
+            'bloom_bits': self._bloom.size,
+            'bloom_hashes': self._bloom.hash_count,
+            'age_seconds': round(time.monotonic() - self._built_at, 1) if self._built_at else None
+        }
+
+
+# Global instance (one per worker process)
+blacklist_index = BlacklistIndex()
@@ -9,8 +9,9 @@ import pandas as pd
 import json
 from datetime import datetime
 from app.models import db
-from app.models.crm_model import ImportFile, ImportRecord, Contact, BlacklistEntry
+from app.models.crm_model import ImportFile, ImportRecord, Contact
 from app.config.crm_config import DEFAULT_MAX_CALL_ATTEMPTS
+from app.utils.phone_utils import normalize_phone
 
 class FileImportService:
     """Service for importing and processing XLSX files line by line"""
@@ -279,10 +280,22 @@ class FileImportService:
             processed_count = 0
             skipped_count = 0
             
+            # Extract all records first, then resolve existing contacts and blacklist in batch
+            extracted = []
             for record in records:
+                raw_data = record.get_raw_data()
+                contact_data = FileImportService._extract_contact_data(raw_data, column_mapping) \
+                    if raw_data and isinstance(raw_data, dict) else {}
+                extracted.append((record, raw_data, contact_data))
+            
+            phones = [contact_data.get('phone') for _, _, contact_data in extracted if contact_data.get('phone')]
+            known_phones = Contact.find_ids_by_phones(phones)
+            
+            from app.services.crm_blacklist_index import blacklist_index
+            blacklisted = blacklist_index.is_blacklisted_many(phones, campaign_id=campaign_id)
+            
+            for record, raw_data, contact_data in extracted:
                 try:
-                    raw_data = record.get_raw_data()
-                    
                     # Validate raw_data
                     if not raw_data or not isinstance(raw_data, dict):
                         record.error_message = 'Invalid raw data format'
@@ -290,9 +303,6 @@ class FileImportService:
                         skipped_count += 1
                         continue
                     
-                    # Extract data based on mapping
-                    contact_data = FileImportService._extract_contact_data(raw_data, column_mapping)
-                    
                     # Validate required fields - only phone is required
                     if not contact_data.get('phone'):
                         record.error_message = 'Missing required field (phone)'
@@ -300,25 +310,18 @@ class FileImportService:
                         skipped_count += 1
                         continue
                     
-                    # Check if contact already exists
-                    existing_contact = Contact.query.filter_by(
-                        phone=contact_data['phone']
-                    ).first()
-                    
-                    if existing_contact:
-                        record.contact_id = existing_contact.id
+                    # Check if contact already exists (in database or earlier in this file)
+                    if contact_data['phone'] in known_phones:
+                        record.contact_id = known_phones[contact_data['phone']]
                         record.processed = True
                         record.error_message = 'Contact already exists'
                         skipped_count += 1
                         continue
                     
                     # Check if phone is on blacklist
-                    is_blacklisted, blacklist_entry = BlacklistEntry.is_blacklisted(
-                        phone=contact_data['phone'],
-                        campaign_id=campaign_id
-                    )
+                    blacklist_entry = blacklisted.get(contact_data['phone'])
                     
-                    if is_blacklisted:
+                    if blacklist_entry:
                         # Skip this contact if blacklisted
                         record.processed = True
                         if blacklist_entry.campaign_id:
@@ -348,6 +351,7 @@ class FileImportService:
                     
                     db.session.add(contact)
                     db.session.flush()  # Get the ID
+                    known_phones[contact_data['phone']] = contact.id
                     
                     # Link record to contact
                     record.contact_id = contact.id
@@ -455,8 +459,7 @@ class FileImportService:
             if 'phone' in column_mapping and column_mapping['phone'] and column_mapping['phone'] in raw_data:
                 phone_value = raw_data[column_mapping['phone']]
                 if phone_value is not None:
-                    phone = str(phone_value).strip()
-                    data['phone'] = FileImportService._clean_phone_number(phone)
+                    data['phone'] = normalize_phone(phone_value)
         except Exception as e:
             print(f"Error extracting contact data: {e}")
             print(f"Raw data: {raw_data}")
@@ -501,24 +504,6 @@ class FileImportService:
         
         return data
     
-    @staticmethod
-    def _clean_phone_number(phone):
-        """Clean and format phone number"""
-        import re
-        # Remove all non-digit characters except +
-        cleaned = re.sub(r'[^\d+]', '', phone)
-        
-        # Add +48 if no country code
-        if not cleaned.startswith('+'):
-            if cleaned.startswith('48'):
-                cleaned = '+' + cleaned
-            elif cleaned.startswith('0'):
-                cleaned = '+48' + cleaned[1:]
-            else:
-                cleaned = '+48' + cleaned
-        
-        return cleaned
-    
     @staticmethod
     def get_import_files(ankieter_id=None):
         """Get list of import files"""
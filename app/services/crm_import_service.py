@@ -10,6 +10,7 @@ from datetime import datetime
 from app.models import db
 from app.models.crm_model import Contact, ImportFile
 from app.config.crm_config import CSV_COLUMNS, DEFAULT_MAX_CALL_ATTEMPTS
+from app.utils.phone_utils import normalize_phone, normalize_phone_series
 
 class ImportService:
     """Service for importing contacts from XLSX files"""
@@ -40,6 +41,13 @@ class ImportService:
             imported_count = 0
             skipped_count = 0
             
+            # Existing contacts for all phones in file (one indexed lookup instead of one per row)
+            known_phones = {}
+            if 'phone' in column_mapping:
+                known_phones = Contact.find_ids_by_phones(
+                    normalize_phone_series(df[column_mapping['phone']]).dropna().unique()
+                )
+            
             for index, row in df.iterrows():
                 try:
                     # Extract contact data
@@ -49,12 +57,8 @@ class ImportService:
                         skipped_count += 1
                         continue
                     
-                    # Check if contact already exists
-                    existing_contact = Contact.query.filter_by(
-                        phone=contact_data['phone']
-                    ).first()
-                    
-                    if existing_contact:
+                    # Check if contact already exists (in database or earlier in this file)
+                    if contact_data['phone'] in known_phones:
                         skipped_count += 1
                         continue
                     
@@ -76,6 +80,7 @@ class ImportService:
                         contact.set_tags(contact_data['tags'])
                     
                     db.session.add(contact)
+                    known_phones[contact_data['phone']] = None
                     imported_count += 1
                     
                 except Exception as e:
@@ -136,10 +141,7 @@ class ImportService:
             data['name'] = str(row[column_mapping['name']]).strip()
         
         if 'phone' in column_mapping:
-            phone = str(row[column_mapping['phone']]).strip()
-            # Clean phone number
-            phone = ImportService._clean_phone_number(phone)
-            data['phone'] = phone
+            data['phone'] = normalize_phone(row[column_mapping['phone']])
         
         # Optional fields
         if 'email' in column_mapping:
@@ -159,24 +161,6 @@ class ImportService:
         
         return data
     
-    @staticmethod
-    def _clean_phone_number(phone):
-        """Clean and format phone number"""
-        # Remove all non-digit characters except +
-        import re
-        cleaned = re.sub(r'[^\d+]', '', phone)
-        
-        # Add +48 if no country code
-        if not cleaned.startswith('+'):
-            if cleaned.startswith('48'):
-                cleaned = '+' + cleaned
-            elif cleaned.startswith('0'):
-                cleaned = '+48' + cleaned[1:]
-            else:
-                cleaned = '+48' + cleaned
-        
-        return cleaned
-    
     @staticmethod
     def get_import_history(ankieter_id=None):
         """Get import history"""
@@ -6,117 +6,138 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from datetime import datetime, timedelta
+from sqlalchemy import case, or_, func
 from app.models import db
-from app.models.crm_model import Contact, Call, BlacklistEntry
+from app.models.crm_model import Contact, Call, BlacklistEntry, Campaign
 from app.config.crm_config import DEFAULT_MAX_CALL_ATTEMPTS
 
 class QueueManager:
     """Service for managing call queue and contact assignment"""
     
+    # Queue tiers in dispatch order: callbacks, leads, new contacts
+    PRIORITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+    
+    # Number of previous calls returned with dispatched contact
+    HISTORY_LIMIT = 5
+    
     @staticmethod
-    def get_next_contact_for_ankieter(ankieter_id):
-        """Get next contact for ankieter based on priority and scheduled time"""
-        from app.utils.timezone_utils import get_local_now
-        now = get_local_now()
-        
-        # First try high priority (scheduled callbacks) - only if scheduled time has passed
-        high_priority = Call.query.filter_by(
-            ankieter_id=ankieter_id,
-            priority='high',
-            queue_status='pending'
+    def _next_call_cte(ankieter_id, now):
+        """
+        Ranked query selecting the single next pending queue entry
+        
+        Tiers are ordered with CASE on priority; callbacks by scheduled time (only
+        when due), leads and new contacts by creation time. Contacts that cannot be
+        called are filtered in SQL, so a non-callable row never hides the rest of
+        its tier.
+        """
+        priority_rank = case(QueueManager.PRIORITY_ORDER, value=Call.priority)
+        due_time = case((Call.priority == 'high', Call.scheduled_date), else_=Call.created_at)
+        
+        return db.session.query(
+            Call.id.label('call_id'),
+            Call.contact_id.label('contact_id')
+        ).join(
+            Contact, Contact.id == Call.contact_id
         ).filter(
-            (Call.scheduled_date.is_(None)) | (Call.scheduled_date <= now)
-        ).order_by(Call.scheduled_date.asc()).first()
-        
-        if high_priority and high_priority.contact.can_be_called():
-            return high_priority.contact
-        
-        # Then medium priority (leads)
-        medium_priority = Call.query.filter_by(
-            ankieter_id=ankieter_id,
-            priority='medium',
-            queue_status='pending'
-        ).order_by(Call.created_at.asc()).first()
-        
-        if medium_priority and medium_priority.contact.can_be_called():
-            return medium_priority.contact
-        
-        # Finally low priority (new contacts)
-        low_priority = Call.query.filter_by(
-            ankieter_id=ankieter_id,
-            priority='low',
-            queue_status='pending'
-        ).order_by(Call.created_at.asc()).first()
-        
-        if low_priority and low_priority.contact.can_be_called():
-            return low_priority.contact
+            Call.ankieter_id == ankieter_id,
+            Call.queue_status == 'pending',
+            Call.priority.in_(list(QueueManager.PRIORITY_ORDER)),
+            or_(Call.priority != 'high', Call.scheduled_date.is_(None), Call.scheduled_date <= now),
+            Contact.callable_clause()
+        ).order_by(
+            priority_rank, due_time.asc().nulls_last(), Call.id.asc()
+        ).limit(1).cte('next_call')
+    
+    @staticmethod
+    def get_next_dispatch(ankieter_id, history_limit=None):
+        """
+        Get next queue entry for ankieter together with contact, campaign script
+        and recent call history - all in one database round trip
+        
+        Returns:
+            Dict with call, contact, campaign_script, call_history or None if queue is empty
+        """
+        from app.utils.timezone_utils import get_local_now
         
-        return None
+        if history_limit is None:
+            history_limit = QueueManager.HISTORY_LIMIT
+        
+        next_call = QueueManager._next_call_cte(ankieter_id, get_local_now())
+        
+        columns = [Call, Contact, Campaign.script_content]
+        if history_limit > 0:
+            position = func.row_number().over(order_by=(Call.call_date.desc(), Call.id.desc()))
+            history = db.session.query(
+                Call.id.label('id'),
+                Call.call_date.label('call_date'),
+                Call.status.label('status'),
+                Call.notes.label('notes'),
+                Call.duration_minutes.label('duration_minutes'),
+                position.label('position')
+            ).join(
+                next_call, Call.contact_id == next_call.c.contact_id
+            ).subquery('history')
+            
+            columns += [
+                history.c.id.label('history_id'),
+                history.c.call_date.label('history_call_date'),
+                history.c.status.label('history_status'),
+                history.c.notes.label('history_notes'),
+                history.c.duration_minutes.label('history_duration_minutes')
+            ]
+        
+        query = db.session.query(*columns).select_from(next_call) \
+            .join(Call, Call.id == next_call.c.call_id) \
+            .join(Contact, Contact.id == next_call.c.contact_id) \
+            .outerjoin(Campaign, Campaign.id == Contact.campaign_id)
+        
+        if history_limit > 0:
+            query = query.outerjoin(history, history.c.position <= history_limit) \
+                .order_by(history.c.position)
+        
+        rows = query.all()
+        if not rows:
+            return None
+        
+        call, contact, campaign_script = rows[0][0], rows[0][1], rows[0][2]
+        
+        call_history = []
+        if history_limit > 0:
+            for row in rows:
+                if row.history_id is None:
+                    continue
+                call_history.append({
+                    'id': row.history_id,
+                    'call_date': row.history_call_date.isoformat() if row.history_call_date else None,
+                    'status': row.history_status,
+                    'notes': row.history_notes,
+                    'duration_minutes': row.history_duration_minutes
+                })
+        
+        return {
+            'call': call,
+            'contact': contact,
+            'campaign_script': campaign_script,
+            'call_history': call_history
+        }
+    
+    @staticmethod
+    def get_next_contact_for_ankieter(ankieter_id):
+        """Get next contact for ankieter based on priority and scheduled time"""
+        dispatch = QueueManager.get_next_dispatch(ankieter_id, history_limit=0)
+        return dispatch['contact'] if dispatch else None
     
     @staticmethod
     def assign_contact_to_ankieter(contact_id, ankieter_id, priority='low'):
-        """Assign contact to ankieter"""
-        # Check if already assigned
-        existing = Call.query.filter_by(
-            contact_id=contact_id,
-            ankieter_id=ankieter_id,
-            queue_status='pending'
-        ).first()
-        
-        if existing:
-            return existing
-        
-        # Create new call entry
-        call_entry = Call(
-            contact_id=contact_id,
-            ankieter_id=ankieter_id,
-            priority=priority,
-            queue_status='pending',
-            status='pending',  # Domyślny status dla nowego rekordu
-            call_date=__import__('app.utils.timezone_utils', fromlist=['get_local_now']).get_local_now()
-        )
-        
-        db.session.add(call_entry)
-        
-        
-        db.session.commit()
-        
-        return call_entry
+        """Assign contact to ankieter (contact row locked, no duplicate pending entries)"""
+        from app.services.crm_assignment_engine import ContactAssignmentEngine
+        return ContactAssignmentEngine.assign_contact(contact_id, ankieter_id, priority)
     
     @staticmethod
-    def auto_assign_contacts_to_ankieter(ankieter_id, limit=10):
-        """Automatically assign contacts to ankieter"""
-        # Get unassigned contacts that can be called
-        unassigned_contacts = Contact.query.filter(
-            Contact.assigned_ankieter_id.is_(None),
-            Contact.is_active == True,
-            Contact.is_blacklisted == False,
-            Contact.call_attempts < Contact.max_call_attempts
-        ).limit(limit).all()
-        
-        assigned_count = 0
-        for contact in unassigned_contacts:
-            # Assign to ankieter
-            contact.assigned_ankieter_id = ankieter_id
-            
-            # Create call entry
-            call_entry = Call(
-                contact_id=contact.id,
-                ankieter_id=ankieter_id,
-                priority='low',
-                queue_status='pending',
-                queue_type='new',
-                status='pending',  # Domyślny status dla nowego rekordu
-                call_date=__import__('app.utils.timezone_utils', fromlist=['get_local_now']).get_local_now()
-            )
-            
-            db.session.add(call_entry)
-            
-            
-            assigned_count += 1
-        
-        db.session.commit()
-        return assigned_count
+    def auto_assign_contacts_to_ankieter(ankieter_id, limit=None):
+        """Automatically assign contacts to ankieter (batch adapts to dialling rate when limit is None)"""
+        from app.services.crm_assignment_engine import ContactAssignmentEngine
+        return len(ContactAssignmentEngine.assign_batch(ankieter_id, limit=limit))
     
     @staticmethod
     def schedule_callback(contact_id, ankieter_id, callback_date, notes=None):
@@ -173,6 +194,7 @@ class QueueManager:
         db.session.commit()  # Commit call record first
         
         # Process based on status - implementation of business rules
+        blacklist_entry = None
         if call_status == 'lead':
             # LEAD - Sukces! Podbij liczniki, oznacz jako zakończony, nigdy więcej nie dzwoń
             contact.business_reason = 'lead'
@@ -187,7 +209,7 @@ class QueueManager:
         elif call_status == 'blacklist':
             # CZARNA LISTA - Dodaj do blacklist, oznacz jako zakończony, nigdy więcej nie dzwoń
             contact.business_reason = 'blacklist'
-            QueueManager._add_to_blacklist(contact_id, ankieter_id, 'blacklist')
+            blacklist_entry = QueueManager._add_to_blacklist(contact_id, ankieter_id, 'blacklist')
             QueueManager._mark_queue_completed(contact_id, ankieter_id)
             
             print(f"✅ BLACKLIST: Kontakt {contact.name} dodany do czarnej listy")
@@ -240,6 +262,11 @@ class QueueManager:
                 QueueManager.schedule_callback(contact_id, ankieter_id, default_callback, notes)
         
         db.session.commit()
+        
+        # Index the new entry only once it is committed
+        if blacklist_entry is not None:
+            from app.services.crm_blacklist_index import blacklist_index
+            blacklist_index.add(blacklist_entry.phone, reason=blacklist_entry.reason)
         return {'success': True, 'message': 'Wynik połączenia zapisany pomyślnie'}
     
     @staticmethod
@@ -257,15 +284,16 @@ class QueueManager:
     
     @staticmethod
     def _add_to_blacklist(contact_id, ankieter_id, reason):
-        """Add contact to blacklist"""
+        """Add contact to blacklist; returns the new entry (not committed, not yet indexed) or None"""
         contact = Contact.query.get(contact_id)
         if not contact:
-            return
+            return None
+        
+        from app.services.crm_blacklist_index import blacklist_index
         
         # Check if already blacklisted
-        existing = BlacklistEntry.query.filter_by(phone=contact.phone).first()
-        if existing:
-            return existing
+        if blacklist_index.lookup(contact.phone, contact.campaign_id):
+            return None
         
         # Create blacklist entry
         blacklist_entry = BlacklistEntry(
@@ -285,26 +313,17 @@ class QueueManager:
     @staticmethod
     def get_ankieter_queue_stats(ankieter_id):
         """Get queue statistics for ankieter"""
+        rows = db.session.query(Call.priority, func.count(Call.id)).filter(
+            Call.ankieter_id == ankieter_id,
+            Call.queue_status == 'pending'
+        ).group_by(Call.priority).all()
+        
+        counts = {priority: count for priority, count in rows}
         stats = {
-            'pending_high': Call.query.filter_by(
-                ankieter_id=ankieter_id,
-                priority='high',
-                queue_status='pending'
-            ).count(),
-            'pending_medium': Call.query.filter_by(
-                ankieter_id=ankieter_id,
-                priority='medium',
-                queue_status='pending'
-            ).count(),
-            'pending_low': Call.query.filter_by(
-                ankieter_id=ankieter_id,
-                priority='low',
-                queue_status='pending'
-            ).count(),
-            'total_pending': Call.query.filter_by(
-                ankieter_id=ankieter_id,
-                queue_status='pending'
-            ).count()
+            'pending_high': counts.get('high', 0),
+            'pending_medium': counts.get('medium', 0),
+            'pending_low': counts.get('low', 0),
+            'total_pending': sum(counts.values())
         }
         
         return stats
@@ -318,19 +318,21 @@ class EmailCronService:
             return {}
     
     def cleanup_old_emails(self, days: int = 30) -> int:
-        """Usuwa stare emaile z kolejki"""
+        """Usuwa stare emaile z kolejki (porcjami, RetentionEngine)"""
         try:
+            from app.services.retention_service import RetentionEngine
+            
             cutoff_date = get_local_now() - timedelta(days=days)
             
             # Usuń stare wysłane emaile
-            deleted = EmailQueue.query.filter(
+            stats = RetentionEngine().purge(
+                EmailQueue,
                 EmailQueue.status.in_(['sent', 'failed']),
                 EmailQueue.sent_at < cutoff_date
-            ).delete()
-            
-            db.session.commit()
+            )
+            deleted = stats['deleted']
             
-            self.logger.info(f"🗑️ Usunięto {deleted} starych emaili")
+            self.logger.info(f"🗑️ Usunięto {deleted} starych emaili ({stats['rows_per_second']} wierszy/s)")
             return deleted
             
         except Exception as e:
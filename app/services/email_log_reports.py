@@ -0,0 +1,158 @@
+"""
+Email Log Reports - warstwa zapytań raportowych dla logów emaili
+
+- listy logów z relacjami ładowanymi przez selectinload (bez zapytań per wiersz)
+- statystyki: wszystkie okna czasowe w jednym zapytaniu z agregacją warunkową,
+  zakresy sent_at zamiast func.date(), nazwy top-10 pobierane przez JOIN
+- payload statystyk cache'owany w pamięci procesu na krótki czas (STATS_CACHE_TTL)
+"""
+import time
+import threading
+from datetime import datetime, timedelta, time as dt_time
+from typing import Dict, List, Any
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from app import db
+from app.models.email_model import EmailLog, EmailTemplate
+from app.models.events_model import EventSchedule
+
+# Czas życia cache statystyk w sekundach
+STATS_CACHE_TTL = 30
+
+_stats_cache = {'payload': None, 'expires_at': 0.0}
+_stats_lock = threading.Lock()
+
+
+class EmailLogReports:
+    """Zapytania raportowe dla logów emaili"""
+
+    @staticmethod
+    def relation_options():
+        """Ładowanie szablonu, kampanii i wydarzenia dla całej strony jednym zapytaniem na relację"""
+        return (
+            selectinload(EmailLog.template),
+            selectinload(EmailLog.campaign),
+            selectinload(EmailLog.event)
+        )
+
+    @classmethod
+    def with_relations(cls, query):
+        return query.options(*cls.relation_options())
+
+    @staticmethod
+    def serialize_logs(logs: List[EmailLog]) -> List[Dict[str, Any]]:
+        """Serializuje logi do formatu API (relacje muszą być już załadowane)"""
+        result = []
+        for log in logs:
+            event = log.event if log.event_id else None
+            result.append({
+                'id': log.id,
+                'email': log.email,
+                'subject': log.subject,
+                'status': log.status,
+                'sent_at': log.sent_at.isoformat() if log.sent_at else None,
+                'error_message': log.error_message,
+                'template_id': log.template_id,
+                'template_name': log.template.name if log.template else f'Usunięty szablon (ID: {log.template_id})',
+                'campaign_id': log.campaign_id,
+                'campaign_name': log.campaign.name if log.campaign else f'Usunięta kampania (ID: {log.campaign_id})' if log.campaign_id else None,
+                'event_id': log.event_id,
+                'event_info': {
+                    'id': event.id,
+                    'title': event.title,
+                    'event_date': event.event_date.isoformat() if event.event_date else None
+                } if event else None,
+                'recipient_data': log.recipient_data
+            })
+        return result
+
+    @staticmethod
+    def _window_counts(now: datetime) -> Dict[str, int]:
+        """Liczniki okien czasowych w jednym przebiegu (COUNT(*) FILTER (WHERE ...))"""
+        today_start = datetime.combine(now.date(), dt_time.min)
+        tomorrow_start = today_start + timedelta(days=1)
+
+        row = db.session.query(
+            func.count(EmailLog.id),
+            func.count(EmailLog.id).filter(EmailLog.sent_at >= today_start, EmailLog.sent_at < tomorrow_start),
+            func.count(EmailLog.id).filter(EmailLog.sent_at >= now - timedelta(days=7)),
+            func.count(EmailLog.id).filter(EmailLog.sent_at >= now - timedelta(days=30)),
+            func.count(EmailLog.id).filter(EmailLog.sent_at >= now - timedelta(hours=24))
+        ).one()
+
+        return {
+            'total_emails': row[0] or 0,
+            'today_emails': row[1] or 0,
+            'week_emails': row[2] or 0,
+            'month_emails': row[3] or 0,
+            'recent_emails': row[4] or 0
+        }
+
+    @staticmethod
+    def _template_breakdown(limit: int = 10) -> List[Dict[str, Any]]:
+        count = func.count(EmailLog.id)
+        rows = db.session.query(EmailLog.template_id, EmailTemplate.name, count) \
+            .outerjoin(EmailTemplate, EmailTemplate.id == EmailLog.template_id) \
+            .filter(EmailLog.template_id.isnot(None)) \
+            .group_by(EmailLog.template_id, EmailTemplate.name) \
+            .order_by(count.desc()).limit(limit).all()
+
+        return [{
+            'template_id': template_id,
+            'count': total,
+            'template_name': name or f'Usunięty szablon (ID: {template_id})'
+        } for template_id, name, total in rows]
+
+    @staticmethod
+    def _event_breakdown(limit: int = 10) -> List[Dict[str, Any]]:
+        count = func.count(EmailLog.id)
+        rows = db.session.query(EmailLog.event_id, EventSchedule.title, count) \
+            .outerjoin(EventSchedule, EventSchedule.id == EmailLog.event_id) \
+            .filter(EmailLog.event_id.isnot(None)) \
+            .group_by(EmailLog.event_id, EventSchedule.title) \
+            .order_by(count.desc()).limit(limit).all()
+
+        return [{
+            'event_id': event_id,
+            'count': total,
+            'event_name': title or f'Usunięte wydarzenie (ID: {event_id})'
+        } for event_id, title, total in rows]
+
+    @classmethod
+    def build_stats(cls) -> Dict[str, Any]:
+        """Buduje payload statystyk (4 zapytania niezależnie od liczby szablonów i wydarzeń)"""
+        now = datetime.now()
+        stats = cls._window_counts(now)
+
+        status_rows = db.session.query(EmailLog.status, func.count(EmailLog.id)) \
+            .group_by(EmailLog.status).all()
+
+        stats.update({
+            'status_breakdown': {status: count for status, count in status_rows},
+            'template_breakdown': cls._template_breakdown(),
+            'event_breakdown': cls._event_breakdown(),
+            'last_updated': now.isoformat()
+        })
+        return stats
+
+    @classmethod
+    def get_stats(cls, use_cache: bool = True) -> Dict[str, Any]:
+        """Zwraca statystyki logów (z cache o czasie życia STATS_CACHE_TTL)"""
+        if use_cache:
+            with _stats_lock:
+                if _stats_cache['payload'] is not None and _stats_cache['expires_at'] > time.monotonic():
+                    return _stats_cache['payload']
+
+        payload = cls.build_stats()
+
+        with _stats_lock:
+            _stats_cache['payload'] = payload
+            _stats_cache['expires_at'] = time.monotonic() + STATS_CACHE_TTL
+        return payload
+
+    @staticmethod
+    def invalidate_stats_cache():
+        """Unieważnia cache statystyk (np. po czyszczeniu logów)"""
+        with _stats_lock:
+            _stats_cache['payload'] = None
+            _stats_cache['expires_at'] = 0.0
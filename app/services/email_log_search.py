@@ -0,0 +1,112 @@
+"""
+Email Log Search - indeksowane wyszukiwanie i stronicowanie logów emaili
+
+Na PostgreSQL:
+- wyszukiwanie ILIKE korzysta z indeksów GIN pg_trgm (email, subject, error_message)
+- filtr godziny używa indeksowanego wyrażenia (sent_at AT TIME ZONE <strefa>)::time
+- stronicowanie keyset po (sent_at DESC NULLS LAST, id DESC) zamiast OFFSET + COUNT(*)
+  (app.utils.pagination_utils, indeks ix_email_logs_sent_at_id)
+
+Na innych bazach (np. SQLite w testach) filtry działają tak samo, tylko bez indeksów.
+"""
+import os
+from datetime import datetime
+from typing import Dict
+from sqlalchemy import or_, func, cast
+from app import db
+from app.models.email_model import EmailLog
+
+# Strefa czasowa wyrażenia indeksu ix_email_logs_sent_time_local (musi być zgodna z migracją)
+LOG_TIMEZONE = os.getenv('TIMEZONE', 'Europe/Warsaw')
+
+
+class EmailLogSearch:
+    """Budowanie zapytań wyszukiwania logów emaili z użyciem indeksów"""
+
+    # Trigramy nie pomagają dla krótszych fraz - wtedy zostaje zwykłe ILIKE
+    MIN_TRIGRAM_LENGTH = 3
+
+    @staticmethod
+    def is_postgres() -> bool:
+        return db.engine.dialect.name == 'postgresql'
+
+    @staticmethod
+    def _escape_like(term: str) -> str:
+        """Escapuje znaki specjalne LIKE, aby fraza była traktowana dosłownie"""
+        return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    @classmethod
+    def time_of_day_expr(cls):
+        """Godzina wysłania w lokalnej strefie (indeksowane wyrażenie na PostgreSQL)"""
+        if cls.is_postgres():
+            return cast(func.timezone(LOG_TIMEZONE, EmailLog.sent_at), db.Time)
+        return cast(EmailLog.sent_at, db.Time)
+
+    @classmethod
+    def search_clause(cls, term: str):
+        """Warunek wyszukiwania po email, temacie i komunikacie błędu"""
+        pattern = f'%{cls._escape_like(term.strip())}%'
+        return or_(
+            EmailLog.email.ilike(pattern, escape='\\'),
+            EmailLog.subject.ilike(pattern, escape='\\'),
+            EmailLog.error_message.ilike(pattern, escape='\\')
+        )
+
+    @classmethod
+    def apply_filters(cls, query, filters: Dict = None):
+        """
+        Nakłada filtry na zapytanie EmailLog
+
+        Args:
+            query: Zapytanie bazowe (EmailLog.query)
+            filters: search, status, event_id, campaign_id, template_id,
+                     date_from, date_to (YYYY-MM-DD), time_from, time_to (HH:MM)
+        """
+        if not filters:
+            return query
+
+        if filters.get('search') and filters['search'].strip():
+            query = query.filter(cls.search_clause(filters['search']))
+
+        if filters.get('status') and filters['status'] != 'all':
+            query = query.filter(EmailLog.status == filters['status'])
+
+        if filters.get('event_id'):
+            query = query.filter(EmailLog.event_id == filters['event_id'])
+
+        if filters.get('campaign_id'):
+            query = query.filter(EmailLog.campaign_id == filters['campaign_id'])
+
+        if filters.get('template_id'):
+            query = query.filter(EmailLog.template_id == filters['template_id'])
+
+        if filters.get('date_from'):
+            try:
+                query = query.filter(EmailLog.sent_at >= datetime.fromisoformat(filters['date_from']))
+            except ValueError:
+                pass
+
+        if filters.get('date_to'):
+            try:
+                query = query.filter(EmailLog.sent_at <= datetime.fromisoformat(filters['date_to'] + ' 23:59:59'))
+            except ValueError:
+                pass
+
+        time_expr = None
+        if filters.get('time_from'):
+            try:
+                time_from_obj = datetime.strptime(filters['time_from'], '%H:%M').time()
+                time_expr = cls.time_of_day_expr()
+                query = query.filter(time_expr >= time_from_obj)
+            except ValueError:
+                pass
+
+        if filters.get('time_to'):
+            try:
+                time_to_obj = datetime.strptime(filters['time_to'], '%H:%M').time()
+                time_expr = time_expr if time_expr is not None else cls.time_of_day_expr()
+                query = query.filter(time_expr <= time_to_obj)
+            except ValueError:
+                pass
+
+        return query
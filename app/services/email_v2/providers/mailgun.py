@@ -3,10 +3,10 @@ Mailgun provider - główny dostawca e-maili
 """
 import os
 import requests
-import time
 from typing import Dict, Any, List, Tuple
 
 from .base import BaseEmailProvider
+from ..rate_limiter import TokenBucketLimiter
 
 class MailgunProvider(BaseEmailProvider):
     """Provider Mailgun z inteligentnym rate limiting"""
@@ -25,16 +25,16 @@ class MailgunProvider(BaseEmailProvider):
         else:
             self.api_url = f"https://api.mailgun.net/v3/{self.domain}/messages"
         
-        # Rate limiting
-        self.rate_limit_delay = float(os.getenv('MAILGUN_RATE_DELAY', '0.1'))  # 100ms
+        # Rate limiting (współdzielony przez wszystkie procesy)
         self.max_emails_per_minute = int(os.getenv('MAILGUN_MAX_PER_MINUTE', '600'))
         self.max_emails_per_hour = int(os.getenv('MAILGUN_MAX_PER_HOUR', '10000'))
-        
-        # Liczniki
-        self.emails_sent_this_minute = 0
-        self.emails_sent_this_hour = 0
-        self.minute_start_time = time.time()
-        self.hour_start_time = time.time()
+        self.rate_limiter = TokenBucketLimiter(
+            'mailgun',
+            per_minute=self.max_emails_per_minute,
+            per_hour=self.max_emails_per_hour,
+            burst=int(os.getenv('MAILGUN_RATE_BURST', '10')),
+            max_wait=float(os.getenv('EMAIL_RATE_LIMIT_MAX_WAIT', '30'))
+        )
         
         # Domyślne dane nadawcy
         self.from_email = os.getenv('MAILGUN_FROM_EMAIL', f'noreply@{self.domain}')
@@ -95,7 +95,6 @@ class MailgunProvider(BaseEmailProvider):
                 self.logger.info(f"📬 Mailgun response: status_code={response.status_code}")
             
             if response.status_code == 200:
-                self._update_counters()
                 # Pobierz Message ID z odpowiedzi Mailgun
                 try:
                     response_data = response.json()
@@ -141,7 +140,6 @@ class MailgunProvider(BaseEmailProvider):
             
             # Podziel na mniejsze batche
             batch_size = int(os.getenv('MAILGUN_BATCH_SIZE', '50'))
-            delay_between_batches = float(os.getenv('MAILGUN_BATCH_DELAY', '1.0'))
             
             for i in range(0, len(emails), batch_size):
                 batch = emails[i:i + batch_size]
@@ -155,10 +153,6 @@ class MailgunProvider(BaseEmailProvider):
                 stats['sent'] += batch_sent
                 stats['failed'] += batch_failed
                 errors.extend(batch_errors)
-                
-                # Opóźnienie między batchami
-                if i + batch_size < len(emails):
-                    time.sleep(delay_between_batches)
             
             success = stats['failed'] == 0
             message = f"Wysłano {stats['sent']} e-maili, błędów: {stats['failed']}"
@@ -173,32 +167,12 @@ class MailgunProvider(BaseEmailProvider):
         return bool(self.api_key and self.domain)
     
     def _check_rate_limits(self) -> bool:
-        """Sprawdza limity wysyłania"""
-        now = time.time()
-        
-        # Reset liczników co minutę
-        if now - self.minute_start_time >= 60:
-            self.emails_sent_this_minute = 0
-            self.minute_start_time = now
-        
-        # Reset liczników co godzinę
-        if now - self.hour_start_time >= 3600:
-            self.emails_sent_this_hour = 0
-            self.hour_start_time = now
-        
-        # Sprawdź limity
-        if self.emails_sent_this_minute >= self.max_emails_per_minute:
-            return False
-        
-        if self.emails_sent_this_hour >= self.max_emails_per_hour:
-            return False
-        
-        return True
+        """Czeka na token współdzielonego limitu (False gdy limit nie zwolni się w czasie EMAIL_RATE_LIMIT_MAX_WAIT)"""
+        return self.rate_limiter.acquire()
     
-    def _update_counters(self):
-        """Aktualizuje liczniki wysłanych e-maili"""
-        self.emails_sent_this_minute += 1
-        self.emails_sent_this_hour += 1
+    def get_rate_limit_status(self) -> Dict[str, Any]:
+        """Aktualna dostępność limitu wysyłki"""
+        return self.rate_limiter.capacity()
     
     def _send_batch_internal(self, emails: List[Dict[str, Any]]) -> Tuple[int, int, List[str]]:
         """Wysyła pojedynczy batch e-maili"""
@@ -208,13 +182,7 @@ class MailgunProvider(BaseEmailProvider):
         
         for email_data in emails:
             try:
-                # Sprawdź rate limiting
-                if not self._check_rate_limits():
-                    errors.append("Przekroczono limity wysyłania")
-                    failed += 1
-                    continue
-                
-                # Wyślij e-mail
+                # Wyślij e-mail (send_email czeka na token limitu)
                 success, message = self.send_email(
                     to_email=email_data['to_email'],
                     subject=email_data['subject'],
@@ -230,9 +198,6 @@ class MailgunProvider(BaseEmailProvider):
                     failed += 1
                     errors.append(message)
                 
-                # Opóźnienie między e-mailami
-                time.sleep(self.rate_limit_delay)
-                
             except Exception as e:
                 failed += 1
                 errors.append(str(e))
@@ -3,12 +3,12 @@ SMTP provider - fallback dostawca e-maili
 """
 import os
 import smtplib
-import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Dict, Any, List, Tuple
 
 from .base import BaseEmailProvider
+from ..rate_limiter import TokenBucketLimiter
 
 class SMTPProvider(BaseEmailProvider):
     """SMTP provider jako fallback dla Mailgun"""
@@ -27,16 +27,16 @@ class SMTPProvider(BaseEmailProvider):
         self.from_email = os.getenv('SMTP_FROM_EMAIL', self.smtp_username)
         self.from_name = os.getenv('SMTP_FROM_NAME', 'Klub Lepszego Życia')
         
-        # Rate limiting (bardziej konserwatywny niż Mailgun)
-        self.rate_limit_delay = float(os.getenv('SMTP_RATE_DELAY', '1.0'))  # 1 sekunda
+        # Rate limiting (bardziej konserwatywny niż Mailgun, współdzielony przez wszystkie procesy)
         self.max_emails_per_minute = int(os.getenv('SMTP_MAX_PER_MINUTE', '60'))
         self.max_emails_per_hour = int(os.getenv('SMTP_MAX_PER_HOUR', '1000'))
-        
-        # Liczniki
-        self.emails_sent_this_minute = 0
-        self.emails_sent_this_hour = 0
-        self.minute_start_time = time.time()
-        self.hour_start_time = time.time()
+        self.rate_limiter = TokenBucketLimiter(
+            'smtp',
+            per_minute=self.max_emails_per_minute,
+            per_hour=self.max_emails_per_hour,
+            burst=int(os.getenv('SMTP_RATE_BURST', '1')),
+            max_wait=float(os.getenv('EMAIL_RATE_LIMIT_MAX_WAIT', '30'))
+        )
     
     def send_email(self, to_email: str, subject: str, html_content: str = None, 
                    text_content: str = None, from_email: str = None, 
@@ -73,7 +73,6 @@ class SMTPProvider(BaseEmailProvider):
                 server.login(self.smtp_username, self.smtp_password)
                 server.send_message(msg)
             
-            self._update_counters()
             return True, "E-mail wysłany pomyślnie przez SMTP"
             
         except Exception as e:
@@ -90,7 +89,6 @@ class SMTPProvider(BaseEmailProvider):
             
             # SMTP jest wolniejszy, więc mniejsze batche
             batch_size = int(os.getenv('SMTP_BATCH_SIZE', '10'))
-            delay_between_batches = float(os.getenv('SMTP_BATCH_DELAY', '5.0'))
             
             for i in range(0, len(emails), batch_size):
                 batch = emails[i:i + batch_size]
@@ -104,10 +102,6 @@ class SMTPProvider(BaseEmailProvider):
                 stats['sent'] += batch_sent
                 stats['failed'] += batch_failed
                 errors.extend(batch_errors)
-                
-                # Opóźnienie między batchami
-                if i + batch_size < len(emails):
-                    time.sleep(delay_between_batches)
             
             success = stats['failed'] == 0
             message = f"Wysłano {stats['sent']} e-maili przez SMTP, błędów: {stats['failed']}"
@@ -122,32 +116,12 @@ class SMTPProvider(BaseEmailProvider):
         return bool(self.smtp_username and self.smtp_password)
     
     def _check_rate_limits(self) -> bool:
-        """Sprawdza limity wysyłania SMTP"""
-        now = time.time()
-        
-        # Reset liczników co minutę
-        if now - self.minute_start_time >= 60:
-            self.emails_sent_this_minute = 0
-            self.minute_start_time = now
-        
-        # Reset liczników co godzinę
-        if now - self.hour_start_time >= 3600:
-            self.emails_sent_this_hour = 0
-            self.hour_start_time = now
-        
-        # Sprawdź limity
-        if self.emails_sent_this_minute >= self.max_emails_per_minute:
-            return False
-        
-        if self.emails_sent_this_hour >= self.max_emails_per_hour:
-            return False
-        
-        return True
+        """Czeka na token współdzielonego limitu (False gdy limit nie zwolni się w czasie EMAIL_RATE_LIMIT_MAX_WAIT)"""
+        return self.rate_limiter.acquire()
     
-    def _update_counters(self):
-        """Aktualizuje liczniki wysłanych e-maili"""
-        self.emails_sent_this_minute += 1
-        self.emails_sent_this_hour += 1
+    def get_rate_limit_status(self) -> Dict[str, Any]:
+        """Aktualna dostępność limitu wysyłki"""
+        return self.rate_limiter.capacity()
     
     def _send_batch_internal(self, emails: List[Dict[str, Any]]) -> Tuple[int, int, List[str]]:
         """Wysyła pojedynczy batch e-maili przez SMTP"""
@@ -157,13 +131,7 @@ class SMTPProvider(BaseEmailProvider):
         
         for email_data in emails:
             try:
-                # Sprawdź rate limiting
-                if not self._check_rate_limits():
-                    errors.append("Przekroczono limity wysyłania SMTP")
-                    failed += 1
-                    continue
-                
-                # Wyślij e-mail
+                # Wyślij e-mail (send_email czeka na token limitu)
                 success, message = self.send_email(
                     to_email=email_data['to_email'],
                     subject=email_data['subject'],
@@ -179,9 +147,6 @@ class SMTPProvider(BaseEmailProvider):
                     failed += 1
                     errors.append(message)
                 
-                # Opóźnienie między e-mailami
-                time.sleep(self.rate_limit_delay)
-                
             except Exception as e:
                 failed += 1
                 errors.append(str(e))
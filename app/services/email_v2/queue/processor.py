@@ -189,35 +189,46 @@ class EmailQueueProcessor:
                 'error': str(e)
             }
     
-    def cleanup_old_emails(self, days: int = 30) -> Dict[str, Any]:
+    def cleanup_old_emails(self, days: int = 30, archive_dir: str = None) -> Dict[str, Any]:
         """
         Czyści stare e-maile z kolejki
         
+        Usuwanie porcjami (RetentionEngine) - krótkie transakcje zamiast jednego DELETE.
+        
         Args:
             days: Liczba dni po których usunąć e-maile
+            archive_dir: Katalog archiwum JSONL.gz (domyślnie RETENTION_ARCHIVE_DIR)
             
         Returns:
             Dict[str, Any]: Statystyki czyszczenia
         """
         try:
+            from app.services.retention_service import RetentionEngine
+            
             cutoff_date = get_local_now() - timedelta(days=days)
+            engine = RetentionEngine(archive_dir=archive_dir)
             
             # Usuń stare wysłane e-maile
-            deleted_sent = EmailQueue.query.filter(
+            sent_stats = engine.purge(
+                EmailQueue,
                 EmailQueue.status == 'sent',
-                EmailQueue.sent_at < cutoff_date
-            ).delete(synchronize_session=False)
+                EmailQueue.sent_at < cutoff_date,
+                label='sent'
+            )
             
             # Usuń stare nieudane e-maile (po max retries)
-            deleted_failed = EmailQueue.query.filter(
+            failed_stats = engine.purge(
+                EmailQueue,
                 EmailQueue.status == 'failed',
                 EmailQueue.retry_count >= self.max_retries,
-                EmailQueue.updated_at < cutoff_date
-            ).delete(synchronize_session=False)
-            
-            db.session.commit()
+                EmailQueue.updated_at < cutoff_date,
+                label='failed'
+            )
             
+            deleted_sent = sent_stats['deleted']
+            deleted_failed = failed_stats['deleted']
             total_deleted = deleted_sent + deleted_failed
+            seconds = sent_stats['seconds'] + failed_stats['seconds']
             
             self.logger.info(f"🗑️ Usunięto {total_deleted} starych e-maili z kolejki")
             
@@ -225,6 +236,9 @@ class EmailQueueProcessor:
                 'deleted_sent': deleted_sent,
                 'deleted_failed': deleted_failed,
                 'total_deleted': total_deleted,
+                'seconds': round(seconds, 3),
+                'rows_per_second': round(total_deleted / seconds, 1) if seconds > 0 else 0.0,
+                'archive_files': [f for f in (sent_stats['archive_file'], failed_stats['archive_file']) if f],
                 'message': f"Usunięto {total_deleted} starych e-maili"
             }
             
@@ -555,10 +569,8 @@ class EmailQueueProcessor:
             # Dodaj linki do wypisania
             try:
                 from app.services.unsubscribe_manager import unsubscribe_manager
-                context.update({
-                    'unsubscribe_url': unsubscribe_manager.get_unsubscribe_url(email.recipient_email),
-                    'delete_account_url': unsubscribe_manager.get_delete_account_url(email.recipient_email)
-                })
+                # Użytkownik jest już załadowany - podpisz bez dodatkowych zapytań
+                context.update(unsubscribe_manager.get_urls_for_user(user.id if user else None))
             except Exception as e:
                 self.logger.warning(f"⚠️ Błąd generowania linków unsubscribe: {e}")
                 context.update({
@@ -44,6 +44,12 @@ class EmailScheduler:
     PRIORITY_EVENT = 1       # Przypomnienia o wydarzeniach
     PRIORITY_CAMPAIGN = 2    # Kampanie emailowe
     
+    # Linki używane, gdy nie udało się podpisać tokenów wypisania
+    UNSUBSCRIBE_FALLBACK = {
+        'unsubscribe_url': 'mailto:kontakt@klublepszezycie.pl',
+        'delete_account_url': 'mailto:kontakt@klublepszezycie.pl'
+    }
+    
     def __init__(self):
         """Inicjalizacja EmailScheduler"""
         self.logger = logging.getLogger(__name__)
@@ -151,6 +157,9 @@ class EmailScheduler:
                 except json.JSONDecodeError:
                     self.logger.warning(f"⚠️ Błąd parsowania zmiennych kampanii {campaign_id}")
             
+            # Podpisz linki do wypisania dla wszystkich odbiorców naraz
+            unsubscribe_urls = self._get_unsubscribe_urls(recipients)
+            
             # Dodaj emaile do kolejki
             scheduled_count = 0
             for recipient in recipients:
@@ -167,18 +176,7 @@ class EmailScheduler:
                     })
                     
                     # Dodaj linki do wypisania
-                    try:
-                        from app.services.unsubscribe_manager import unsubscribe_manager
-                        recipient_context.update({
-                            'unsubscribe_url': unsubscribe_manager.get_unsubscribe_url(recipient.email),
-                            'delete_account_url': unsubscribe_manager.get_delete_account_url(recipient.email)
-                        })
-                    except Exception as e:
-                        self.logger.warning(f"⚠️ Błąd generowania linków unsubscribe: {e}")
-                        recipient_context.update({
-                            'unsubscribe_url': 'mailto:kontakt@klublepszezycie.pl',
-                            'delete_account_url': 'mailto:kontakt@klublepszezycie.pl'
-                        })
+                    recipient_context.update(unsubscribe_urls.get(recipient.email, self.UNSUBSCRIBE_FALLBACK))
                     
                     # Jeśli jest szablon, użyj go
                     if template:
@@ -347,6 +345,9 @@ class EmailScheduler:
             if not templates_cache:
                 return False, "Brak aktywnych szablonów przypomnień"
             
+            # Podpisz linki do wypisania dla wszystkich uczestników naraz
+            unsubscribe_urls = self._get_unsubscribe_urls(participants)
+            
             # Dodaj przypomnienia do kolejki
             scheduled_count = 0
             skipped_duplicates = 0
@@ -415,18 +416,7 @@ class EmailScheduler:
                         }
                         
                         # Dodaj linki do wypisania
-                        try:
-                            from app.services.unsubscribe_manager import unsubscribe_manager
-                            context.update({
-                                'unsubscribe_url': unsubscribe_manager.get_unsubscribe_url(participant.email),
-                                'delete_account_url': unsubscribe_manager.get_delete_account_url(participant.email)
-                            })
-                        except Exception as e:
-                            self.logger.warning(f"⚠️ Błąd generowania linków unsubscribe: {e}")
-                            context.update({
-                                'unsubscribe_url': 'mailto:kontakt@klublepszezycie.pl',
-                                'delete_account_url': 'mailto:kontakt@klublepszezycie.pl'
-                            })
+                        context.update(unsubscribe_urls.get(participant.email, self.UNSUBSCRIBE_FALLBACK))
                         
                         # Renderuj szablon
                         html_content, text_content = self._render_template(template, context)
@@ -534,6 +524,31 @@ class EmailScheduler:
             self.logger.error(f"❌ Błąd pobierania uczestników wydarzenia {event_id}: {e}")
             return []
     
+    def _get_unsubscribe_urls(self, recipients) -> Dict[str, Dict[str, str]]:
+        """
+        Podpisuje linki wypisania i usunięcia konta dla wszystkich odbiorców w jednym przebiegu
+        
+        Returns:
+            Dict email -> {'unsubscribe_url': ..., 'delete_account_url': ...}
+        """
+        try:
+            from app.services.unsubscribe_manager import unsubscribe_manager
+            
+            pairs = [(recipient.id, recipient.email) for recipient in recipients]
+            
+            # Niestandardowe emaile (bez user_id) mogą należeć do istniejących kont - jedno zapytanie dla wszystkich
+            missing_emails = [email for user_id, email in pairs if not user_id]
+            if missing_emails:
+                known_ids = dict(
+                    db.session.query(User.email, User.id).filter(User.email.in_(missing_emails)).all()
+                )
+                pairs = [(user_id or known_ids.get(email), email) for user_id, email in pairs]
+            
+            return unsubscribe_manager.bulk_get_urls(pairs)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Błąd generowania linków unsubscribe: {e}")
+            return {}
+    
     def _get_campaign_recipients(self, campaign: EmailCampaign) -> List[User]:
         """Pobiera odbiorców kampanii"""
         try:
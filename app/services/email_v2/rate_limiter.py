@@ -0,0 +1,293 @@
+"""
+Współdzielony limiter wysyłki e-maili (token bucket)
+
+Limity providerów (MAILGUN_MAX_PER_MINUTE, SMTP_MAX_PER_HOUR, ...) obowiązują
+wspólnie dla wszystkich procesów cron i workerów, a nie dla pojedynczej instancji:
+- stan kubełków trzymany w Redis (skrypt Lua, atomowo) albo w tabeli
+  email_rate_buckets (SELECT ... FOR UPDATE w osobnej, krótkiej transakcji)
+- każdy provider ma dwa kubełki: minutowy (pojemność = burst) i godzinowy
+  (pojemność = limit na minutę z limitu godzinowego); wysyłka zabiera token z obu
+- acquire() czeka dokładnie tyle, ile brakuje do następnego tokenu, zamiast stałego sleep
+
+Backend (EMAIL_RATE_LIMIT_BACKEND): auto (Redis gdy skonfigurowany, inaczej baza),
+redis, database, memory (tylko w obrębie procesu).
+"""
+import os
+import time
+import logging
+import threading
+from collections import namedtuple
+from typing import Dict, List, Optional
+from flask import has_app_context
+from sqlalchemy import select, update, insert, text
+
+try:
+    import redis
+except ImportError:  # Redis jest opcjonalny
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Kubełek: nazwa, pojemność (tokeny), uzupełnianie (tokeny/s)
+Bucket = namedtuple('Bucket', ['name', 'capacity', 'rate'])
+
+
+def _refill(tokens: float, updated_at: float, bucket: Bucket, now: float) -> float:
+    return min(bucket.capacity, tokens + max(0.0, now - updated_at) * bucket.rate)
+
+
+def _wait_time(levels: List[float], buckets: List[Bucket]) -> float:
+    """Czas do chwili, gdy każdy kubełek ma co najmniej jeden token"""
+    return max([(1 - tokens) / bucket.rate for tokens, bucket in zip(levels, buckets) if tokens < 1] or [0.0])
+
+
+class MemoryBackend:
+    """Stan w pamięci procesu (bez współdzielenia między procesami)"""
+
+    name = 'memory'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}
+
+    def _levels(self, buckets, now):
+        return [_refill(*self._state.get(bucket.name, (bucket.capacity, now)), bucket, now) for bucket in buckets]
+
+    def try_acquire(self, buckets: List[Bucket]) -> float:
+        with self._lock:
+            now = time.time()
+            levels = self._levels(buckets, now)
+            wait = _wait_time(levels, buckets)
+            if wait == 0:
+                for tokens, bucket in zip(levels, buckets):
+                    self._state[bucket.name] = (tokens - 1, now)
+            return wait
+
+    def levels(self, buckets: List[Bucket]) -> List[float]:
+        with self._lock:
+            return self._levels(buckets, time.time())
+
+
+class DatabaseBackend:
+    """Stan w tabeli email_rate_buckets (blokada wierszy kubełków na czas pobrania tokenu)"""
+
+    name = 'database'
+
+    @staticmethod
+    def _table():
+        from app.models import EmailRateBucket
+        return EmailRateBucket.__table__
+
+    @staticmethod
+    def _now(conn) -> float:
+        # Zegar bazy - wspólny dla wszystkich hostów
+        if conn.dialect.name == 'postgresql':
+            return float(conn.execute(text("SELECT extract(epoch FROM clock_timestamp())")).scalar())
+        return time.time()
+
+    def _ensure_rows(self, conn, buckets, now):
+        table = self._table()
+        existing = set(conn.execute(
+            select(table.c.name).where(table.c.name.in_([bucket.name for bucket in buckets]))
+        ).scalars())
+        missing = [{'name': bucket.name, 'tokens': bucket.capacity, 'updated_at': now}
+                   for bucket in buckets if bucket.name not in existing]
+        if not missing:
+            return
+        if conn.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+            conn.execute(pg_insert(table).on_conflict_do_nothing(index_elements=['name']), missing)
+        else:
+            conn.execute(insert(table), missing)
+
+    def _rows(self, conn, buckets, lock):
+        table = self._table()
+        query = select(table.c.name, table.c.tokens, table.c.updated_at) \
+            .where(table.c.name.in_([bucket.name for bucket in buckets])).order_by(table.c.name)
+        if lock:
+            query = query.with_for_update()
+        return {name: (tokens, updated_at) for name, tokens, updated_at in conn.execute(query)}
+
+    def try_acquire(self, buckets: List[Bucket]) -> float:
+        from app import db
+
+        table = self._table()
+        with db.engine.begin() as conn:
+            now = self._now(conn)
+            self._ensure_rows(conn, buckets, now)
+            rows = self._rows(conn, buckets, lock=True)
+            levels = [_refill(*rows.get(bucket.name, (bucket.capacity, now)), bucket, now) for bucket in buckets]
+            wait = _wait_time(levels, buckets)
+            if wait == 0:
+                for tokens, bucket in zip(levels, buckets):
+                    conn.execute(update(table).where(table.c.name == bucket.name)
+                                 .values(tokens=tokens - 1, updated_at=now))
+            return wait
+
+    def levels(self, buckets: List[Bucket]) -> List[float]:
+        from app import db
+
+        with db.engine.connect() as conn:
+            now = self._now(conn)
+            rows = self._rows(conn, buckets, lock=False)
+        return [_refill(*rows.get(bucket.name, (bucket.capacity, now)), bucket, now) for bucket in buckets]
+
+
+class RedisBackend:
+    """Stan w Redis - pobranie tokenu z wszystkich kubełków jednym skryptem Lua"""
+
+    name = 'redis'
+
+    # KEYS: kubełki, ARGV: [pojemność, tempo] dla każdego kubełka, ARGV[last]: 1 = pobierz token
+    SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local consume = tonumber(ARGV[#ARGV]) == 1
+local levels = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local rate = tonumber(ARGV[i * 2])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    levels[i] = tostring(tokens)
+    if tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / rate)
+    end
+end
+if consume and wait == 0 then
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[i * 2 - 1])
+        local rate = tonumber(ARGV[i * 2])
+        redis.call('HSET', key, 'tokens', tostring(tonumber(levels[i]) - 1), 'ts', tostring(now))
+        redis.call('EXPIRE', key, math.ceil(capacity / rate) + 60)
+    end
+end
+table.insert(levels, 1, tostring(wait))
+return levels
+"""
+
+    def __init__(self, url: str):
+        self.client = redis.Redis.from_url(url)
+        self.client.ping()
+        self._script = self.client.register_script(self.SCRIPT)
+
+    def _run(self, buckets, consume):
+        args = []
+        for bucket in buckets:
+            args.extend([bucket.capacity, bucket.rate])
+        args.append(1 if consume else 0)
+        result = self._script(keys=[f'email_rate:{bucket.name}' for bucket in buckets], args=args)
+        return [float(value) for value in result]
+
+    def try_acquire(self, buckets: List[Bucket]) -> float:
+        return self._run(buckets, consume=True)[0]
+
+    def levels(self, buckets: List[Bucket]) -> List[float]:
+        return self._run(buckets, consume=False)[1:]
+
+
+_memory_backend = MemoryBackend()
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Wybiera backend zgodnie z EMAIL_RATE_LIMIT_BACKEND (raz na proces)"""
+    global _backend
+    if _backend is not None:
+        return _backend
+
+    with _backend_lock:
+        if _backend is not None:
+            return _backend
+
+        kind = os.getenv('EMAIL_RATE_LIMIT_BACKEND', 'auto').lower()
+        redis_url = os.getenv('EMAIL_RATE_LIMIT_REDIS_URL', '')
+
+        if kind in ('auto', 'redis') and redis_url:
+            if redis is None:
+                logger.warning("⚠️ EMAIL_RATE_LIMIT_REDIS_URL ustawiony, ale pakiet redis nie jest zainstalowany")
+            else:
+                try:
+                    _backend = RedisBackend(redis_url)
+                except Exception as e:
+                    logger.warning(f"⚠️ Redis niedostępny dla limitera e-maili: {e}")
+
+        if _backend is None and kind in ('auto', 'redis', 'database'):
+            if not has_app_context():
+                # Bez kontekstu aplikacji nie ma połączenia z bazą - nie zapamiętujemy wyboru
+                return _memory_backend
+            _backend = DatabaseBackend()
+
+        if _backend is None:
+            _backend = _memory_backend
+
+        logger.info(f"📧 Limiter e-maili: backend {_backend.name}")
+        return _backend
+
+
+class TokenBucketLimiter:
+    """Limit wysyłki providera wspólny dla wszystkich procesów"""
+
+    def __init__(self, name: str, per_minute: int, per_hour: int, burst: int = 1, max_wait: float = 30.0):
+        self.name = name
+        self.per_minute = per_minute
+        self.per_hour = per_hour
+        self.max_wait = max_wait
+        self.buckets = [
+            Bucket(f'{name}:minute', max(1, min(burst, per_minute)), per_minute / 60.0),
+            Bucket(f'{name}:hour', max(1, per_hour // 60), per_hour / 3600.0),
+        ]
+
+    def try_acquire(self) -> float:
+        """Pobiera token jeśli dostępny; zwraca 0 albo czas oczekiwania w sekundach"""
+        try:
+            return get_backend().try_acquire(self.buckets)
+        except Exception as e:
+            # Awaria współdzielonego backendu nie może zatrzymać wysyłki
+            logger.error(f"❌ Błąd limitera {self.name}, używam limitu lokalnego: {e}")
+            return _memory_backend.try_acquire(self.buckets)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Czeka na token najwyżej `timeout` sekund (domyślnie max_wait)
+
+        Returns:
+            True gdy token pobrany, False gdy limit nie zwolni się w czasie oczekiwania
+        """
+        timeout = self.max_wait if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return True
+            remaining = deadline - time.monotonic()
+            if wait > remaining:
+                return False
+            time.sleep(wait)
+
+    def capacity(self) -> Dict:
+        """Aktualnie dostępne tokeny (dla API monitoringu)"""
+        try:
+            backend = get_backend()
+            levels = backend.levels(self.buckets)
+        except Exception as e:
+            return {'name': self.name, 'error': str(e)}
+
+        return {
+            'name': self.name,
+            'backend': backend.name,
+            'per_minute': self.per_minute,
+            'per_hour': self.per_hour,
+            'buckets': [{
+                'bucket': bucket.name.split(':', 1)[1],
+                'capacity': bucket.capacity,
+                'refill_per_second': round(bucket.rate, 4),
+                'available': round(max(0.0, tokens), 2)
+            } for tokens, bucket in zip(levels, self.buckets)],
+            'available_now': int(max(0.0, min(levels))) if levels else 0
+        }
@@ -0,0 +1,165 @@
+"""
+Image Pipeline - responsywne warianty obrazów bloga w tle
+
+Zamiast miniatury tworzonej synchronicznie w żądaniu admina:
+- po zapisaniu pliku zadanie trafia do JobPipeline (blog_image_variants)
+- zdekodowanie i skalowanie wykonuje pula procesów (IMAGE_PIPELINE_PROCESSES),
+  więc duże zdjęcia nie blokują ani żądania, ani wątków aplikacji (GIL)
+- szerokości IMAGE_VARIANT_WIDTHS w formatach IMAGE_VARIANT_FORMATS
+  (webp, jpeg; avif gdy Pillow go obsługuje), pliki <nazwa>_<szerokość>w.<rozszerzenie>
+  zapisywane atomowo obok oryginału
+- metadane (wymiary, srcset dla każdego formatu) zapisywane w
+  BlogPost.featured_image_variants / BlogPostImage.variants
+"""
+import os
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from flask import current_app, has_app_context
+from app import db
+from app.models import BlogPost, BlogPostImage
+from app.utils.file_utils import delete_image_variants
+from app.utils.image_utils import render_responsive_variants, supported_variant_formats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WIDTHS = '400,800,1200,1600'
+DEFAULT_FORMATS = 'webp,jpeg'
+DEFAULT_QUALITY = 82
+DEFAULT_TIMEOUT = 120
+
+UPLOADS_URL_PREFIX = '/static/uploads/'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _config(key: str, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+def _csv(value) -> List[str]:
+    return [item.strip().lower() for item in str(value).split(',') if item.strip()]
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Pula procesów tworzona leniwie (raz na proces aplikacji)"""
+    global _executor
+    if _executor is not None:
+        return _executor
+    with _executor_lock:
+        if _executor is None:
+            processes = int(_config('IMAGE_PIPELINE_PROCESSES', 0)) or min(2, os.cpu_count() or 1)
+            _executor = ProcessPoolExecutor(max_workers=processes)
+            logger.info(f"🖼️ Image pipeline: pula {processes} procesów")
+        return _executor
+
+
+def shutdown(wait: bool = True):
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+class ImagePipeline:
+    """Generowanie i zapisywanie responsywnych wariantów obrazów bloga"""
+
+    @staticmethod
+    def local_path(url: Optional[str]) -> Optional[str]:
+        """Ścieżka pliku dla URL z /static/uploads/ (None dla obrazów zewnętrznych)"""
+        if not url or not url.startswith(UPLOADS_URL_PREFIX):
+            return None
+        relative = url[len(UPLOADS_URL_PREFIX):]
+        if '..' in relative.split('/'):
+            return None
+        return os.path.join(_config('UPLOAD_FOLDER', 'static/uploads'), *relative.split('/'))
+
+    @staticmethod
+    def build_variants(url: str) -> Optional[Dict]:
+        """
+        Tworzy warianty obrazu w puli procesów i zwraca metadane
+
+        Returns:
+            Dict: source, width, height, srcset {format: 'url 400w, ...'}, fallback,
+            files {format: [{width, height, url}]} lub None gdy obraz nie jest lokalny
+        """
+        path = ImagePipeline.local_path(url)
+        if not path or not os.path.exists(path):
+            logger.warning(f"⚠️ Obraz do przetworzenia nie istnieje: {url}")
+            return None
+
+        widths = sorted({int(width) for width in _csv(_config('IMAGE_VARIANT_WIDTHS', DEFAULT_WIDTHS))})
+        formats = supported_variant_formats(_csv(_config('IMAGE_VARIANT_FORMATS', DEFAULT_FORMATS)))
+        if not formats:
+            return None
+
+        quality = int(_config('IMAGE_VARIANT_QUALITY', DEFAULT_QUALITY))
+        timeout = int(_config('IMAGE_PIPELINE_TIMEOUT', DEFAULT_TIMEOUT))
+        result = get_executor().submit(render_responsive_variants, path, widths, formats, quality).result(timeout=timeout)
+
+        base_url = url.rsplit('/', 1)[0]
+        files = {
+            name: [{'width': item['width'], 'height': item['height'], 'url': f"{base_url}/{item['filename']}"}
+                   for item in sorted(items, key=lambda item: item['width'])]
+            for name, items in result['variants'].items()
+        }
+        return {
+            'source': url,
+            'width': result['width'],
+            'height': result['height'],
+            'srcset': {name: ', '.join(f"{item['url']} {item['width']}w" for item in items)
+                       for name, items in files.items()},
+            'fallback': files['jpeg'][-1]['url'] if files.get('jpeg') else url,
+            'files': files
+        }
+
+    @classmethod
+    def process_featured_image(cls, post_id: int):
+        post = db.session.get(BlogPost, post_id)
+        if not post or not post.featured_image:
+            return
+        if post.featured_responsive:
+            return
+
+        metadata = cls.build_variants(post.featured_image)
+        if metadata is None:
+            return
+        previous = post.featured_image_variants
+        post.featured_image_variants = metadata
+        db.session.commit()
+        if previous and previous.get('source') != metadata['source']:
+            delete_image_variants(previous)
+        logger.info(f"🖼️ Warianty obrazu wyróżniającego posta {post_id}: {metadata['srcset']}")
+
+    @classmethod
+    def process_gallery_image(cls, image_id: int):
+        image = db.session.get(BlogPostImage, image_id)
+        if not image or image.responsive:
+            return
+
+        metadata = cls.build_variants(image.image_url)
+        if metadata is None:
+            return
+        previous = image.variants
+        image.variants = metadata
+        db.session.commit()
+        if previous and previous.get('source') != metadata['source']:
+            delete_image_variants(previous)
+        logger.info(f"🖼️ Warianty obrazu galerii {image_id}: {metadata['srcset']}")
+
+    @staticmethod
+    def enqueue_featured_image(post_id: int):
+        """Zleca wygenerowanie wariantów (wywoływać po commit)"""
+        from app.services.background_jobs import job_pipeline
+        job_pipeline.enqueue('blog_image_variants', {'post_id': post_id}, max_attempts=3)
+
+    @staticmethod
+    def enqueue_gallery_image(image_id: int):
+        """Zleca wygenerowanie wariantów (wywoływać po commit)"""
+        from app.services.background_jobs import job_pipeline
+        job_pipeline.enqueue('blog_image_variants', {'image_id': image_id}, max_attempts=3)
@@ -0,0 +1,156 @@
+"""
+Log Partitioning - utrzymanie miesięcznych partycji tabel logów
+
+Tabele email_logs, user_logs i system_logs mogą być partycjonowane miesięcznie
+(migracja a9d3e6b1c4f7, LOG_PARTITIONING=true). Ten moduł:
+- tworzy partycje na LOG_PARTITION_MONTHS_AHEAD miesięcy do przodu
+- wygasza partycje starsze niż LOG_PARTITION_RETENTION_MONTHS (DROP albo DETACH,
+  LOG_PARTITION_EXPIRE_ACTION) - retencja bez usuwania pojedynczych wierszy
+- pozwala LogService.cleanup_old_logs usunąć całe partycje sprzed daty granicznej
+
+Na tabelach niepartycjonowanych (lub poza PostgreSQL) wszystkie operacje są pomijane.
+"""
+import re
+import logging
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy import text
+from app import db
+
+logger = logging.getLogger(__name__)
+
+# Tabela -> kolumna partycjonowania (zgodne z migracją a9d3e6b1c4f7)
+PARTITIONED_TABLES = {
+    'email_logs': 'sent_at',
+    'user_logs': 'created_at',
+    'system_logs': 'created_at',
+}
+
+DEFAULT_MONTHS_AHEAD = 3
+DEFAULT_RETENTION_MONTHS = 12
+EXPIRE_ACTIONS = ('drop', 'detach')
+
+
+def _config(key: str, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class LogPartitionManager:
+    """Tworzenie i wygaszanie miesięcznych partycji tabel logów"""
+
+    def __init__(self, months_ahead: Optional[int] = None, retention_months: Optional[int] = None,
+                 expire_action: Optional[str] = None):
+        self.months_ahead = months_ahead if months_ahead is not None else \
+            int(_config('LOG_PARTITION_MONTHS_AHEAD', DEFAULT_MONTHS_AHEAD))
+        self.retention_months = retention_months if retention_months is not None else \
+            int(_config('LOG_PARTITION_RETENTION_MONTHS', DEFAULT_RETENTION_MONTHS))
+        self.expire_action = expire_action or _config('LOG_PARTITION_EXPIRE_ACTION', 'drop')
+        if self.expire_action not in EXPIRE_ACTIONS:
+            raise ValueError(f'Nieobsługiwana akcja wygaszania partycji: {self.expire_action}')
+
+    @staticmethod
+    def partition_name(table: str, month: date) -> str:
+        return f'{table}_p{month:%Y_%m}'
+
+    @staticmethod
+    def is_partitioned(table: str) -> bool:
+        if db.engine.dialect.name != 'postgresql':
+            return False
+        return db.session.execute(
+            text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:table)"),
+            {'table': table}
+        ).scalar() or False
+
+    @staticmethod
+    def list_partitions(table: str) -> List[Tuple[str, date]]:
+        """Miesięczne partycje tabeli jako (nazwa, początek miesiąca), rosnąco (bez DEFAULT)"""
+        names = db.session.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table)"
+        ), {'table': table}).scalars().all()
+
+        pattern = re.compile(rf'^{re.escape(table)}_p(\d{{4}})_(\d{{2}})$')
+        partitions = []
+        for name in names:
+            match = pattern.match(name)
+            if match:
+                partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+        return sorted(partitions, key=lambda item: item[1])
+
+    def ensure_future_partitions(self, table: str, today: Optional[date] = None) -> List[str]:
+        """Tworzy brakujące partycje od bieżącego miesiąca do months_ahead do przodu"""
+        current = month_start(today or date.today())
+        existing = {month for _, month in self.list_partitions(table)}
+        created = []
+
+        for offset in range(self.months_ahead + 1):
+            month = add_months(current, offset)
+            if month in existing:
+                continue
+            name = self.partition_name(table, month)
+            db.session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            ))
+            db.session.commit()
+            created.append(name)
+        return created
+
+    def expire_partitions(self, table: str, cutoff, action: Optional[str] = None) -> List[str]:
+        """
+        Usuwa (DROP) lub odłącza (DETACH) partycje zawierające wyłącznie dane sprzed `cutoff`
+
+        Returns:
+            Lista nazw wygaszonych partycji
+        """
+        action = action or self.expire_action
+        cutoff_date = cutoff.date() if isinstance(cutoff, datetime) else cutoff
+        expired = []
+
+        for name, month in self.list_partitions(table):
+            # Górna granica partycji (wyłączna) musi być nie późniejsza niż data graniczna
+            if add_months(month, 1) > cutoff_date:
+                break
+            if action == 'detach':
+                db.session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            else:
+                db.session.execute(text(f"DROP TABLE {name}"))
+            db.session.commit()
+            expired.append(name)
+
+        if expired:
+            logger.info(f"🗑️ {table}: wygaszone partycje ({action}): {', '.join(expired)}")
+        return expired
+
+    def run_maintenance(self, today: Optional[date] = None) -> Dict[str, Dict]:
+        """Zadanie okresowe: partycje na przyszłe miesiące i wygaszenie przeterminowanych"""
+        today = today or date.today()
+        retention_cutoff = add_months(month_start(today), -self.retention_months) if self.retention_months > 0 else None
+        results = {}
+
+        for table in PARTITIONED_TABLES:
+            if not self.is_partitioned(table):
+                continue
+            try:
+                results[table] = {
+                    'created': self.ensure_future_partitions(table, today),
+                    'expired': self.expire_partitions(table, retention_cutoff) if retention_cutoff else []
+                }
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"❌ Błąd utrzymania partycji {table}: {e}")
+                results[table] = {'created': [], 'expired': [], 'error': str(e)}
+        return results
@@ -82,7 +82,7 @@ def show_stats():
         logger.error(f"❌ Błąd podczas pobierania statystyk: {e}")
         return {}
 
-def cleanup_old_emails(days=30):
+def cleanup_old_emails(days=30, archive_dir=None):
     """Czyści stare emaile z kolejki"""
     logger = logging.getLogger(__name__)
     
@@ -94,12 +94,15 @@ def cleanup_old_emails(days=30):
             logger.info(f"🗑️ Czyszczę emaile starsze niż {days} dni...")
             
             processor = EmailQueueProcessor()
-            stats = processor.cleanup_old_emails(days=days)
+            stats = processor.cleanup_old_emails(days=days, archive_dir=archive_dir)
             
             logger.info(f"✅ Czyszczenie zakończone:")
             logger.info(f"   Usunięto wysłane: {stats.get('deleted_sent', 0)}")
             logger.info(f"   Usunięto nieudane: {stats.get('deleted_failed', 0)}")
             logger.info(f"   Razem: {stats.get('total_deleted', 0)}")
+            logger.info(f"   Wierszy/s: {stats.get('rows_per_second', 0)}")
+            for archive_file in stats.get('archive_files', []):
+                logger.info(f"   Archiwum: {archive_file}")
             
             return stats
             
@@ -177,6 +180,104 @@ def schedule_event_reminders():
         logger.error(f"❌ Błąd planowania przypomnień: {e}")
         return {'scheduled': 0, 'total': 0, 'error': str(e)}
 
+def run_background_jobs(limit=100):
+    """Wykonuje zaległe zadania pipeline'u w tle (ponowienia po błędach lub restarcie)"""
+    logger = logging.getLogger(__name__)
+    
+    try:
+        app = create_app()
+        with app.app_context():
+            from app.services.background_jobs import job_pipeline
+            
+            logger.info(f"⚙️ Wykonuję zaległe zadania w tle (limit: {limit})...")
+            
+            stats = job_pipeline.retry_pending_jobs(limit=limit)
+            
+            logger.info(f"✅ Zadania w tle zakończone:")
+            logger.info(f"   Przetworzonych: {stats.get('processed', 0)}")
+            logger.info(f"   Sukces: {stats.get('success', 0)}")
+            logger.info(f"   Błędy: {stats.get('failed', 0)}")
+            
+            return stats
+            
+    except Exception as e:
+        logger.error(f"❌ Błąd wykonywania zadań w tle: {e}")
+        return {'processed': 0, 'success': 0, 'failed': 0, 'error': str(e)}
+
+def rebuild_sitemaps(force=False):
+    """Przebudowuje zmienione pliki map strony i kanałów RSS/Atom"""
+    logger = logging.getLogger(__name__)
+    
+    try:
+        app = create_app()
+        with app.app_context():
+            from app.services.sitemap_service import SitemapBuilder
+            
+            logger.info(f"🗺️ Budowanie map strony i kanałów{' (pełne)' if force else ''}...")
+            
+            stats = SitemapBuilder().build(force=force)
+            
+            logger.info(f"✅ Mapy strony: {stats['urls']} adresów w {stats['chunks']} plikach"
+                        f"{' (pełna przebudowa)' if stats['full'] else ''}")
+            logger.info(f"   Wczytanych postów: {stats['posts_loaded']}")
+            logger.info(f"   Zapisanych plików: {stats['files_written']}, usuniętych: {stats['files_removed']}")
+            
+            return stats
+            
+    except Exception as e:
+        logger.error(f"❌ Błąd budowania map strony: {e}")
+        return {'error': str(e)}
+
+def run_social_outbox(limit=50):
+    """Wysyła zaległe publikacje postów w mediach społecznościowych (ponowienia po błędach)"""
+    logger = logging.getLogger(__name__)
+    
+    try:
+        app = create_app()
+        with app.app_context():
+            from app.services.social_outbox import SocialOutbox
+            
+            logger.info(f"📣 Wysyłam zaległe publikacje social media (limit: {limit})...")
+            
+            stats = SocialOutbox.relay(limit=limit)
+            
+            logger.info(f"✅ Publikacje social media zakończone:")
+            logger.info(f"   Przetworzonych: {stats.get('processed', 0)}")
+            logger.info(f"   Opublikowanych: {stats.get('sent', 0)}")
+            logger.info(f"   Błędy: {stats.get('failed', 0)}")
+            logger.info(f"   Przerwanych (wynik nieznany): {stats.get('abandoned', 0)}")
+            
+            return stats
+            
+    except Exception as e:
+        logger.error(f"❌ Błąd wysyłania publikacji social media: {e}")
+        return {'processed': 0, 'sent': 0, 'failed': 0, 'error': str(e)}
+
+def run_partition_maintenance():
+    """Tworzy przyszłe partycje logów i wygasza przeterminowane"""
+    logger = logging.getLogger(__name__)
+    
+    try:
+        app = create_app()
+        with app.app_context():
+            from app.services.log_partitioning import LogPartitionManager
+            
+            logger.info("🗂️ Utrzymanie partycji logów...")
+            
+            results = LogPartitionManager().run_maintenance()
+            if not results:
+                logger.info("   Brak partycjonowanych tabel logów")
+            for table, stats in results.items():
+                logger.info(f"   {table}: utworzone {stats['created'] or '-'}, wygaszone {stats['expired'] or '-'}")
+                if 'error' in stats:
+                    logger.error(f"   {table}: błąd {stats['error']}")
+            
+            return results
+            
+    except Exception as e:
+        logger.error(f"❌ Błąd utrzymania partycji: {e}")
+        return {'error': str(e)}
+
 def main():
     """Główna funkcja skryptu"""
     parser = argparse.ArgumentParser(description='Procesor kolejki emaili')
@@ -185,7 +286,13 @@ def main():
     parser.add_argument('--cleanup', action='store_true', help='Wyczyść stare emaile')
     parser.add_argument('--retry', type=int, metavar='N', help='Ponów wysyłanie N nieudanych emaili')
     parser.add_argument('--days', type=int, default=30, help='Liczba dni dla czyszczenia (domyślnie 30)')
+    parser.add_argument('--archive-dir', type=str, default=None, help='Archiwizuj usuwane emaile do JSONL.gz w katalogu')
     parser.add_argument('--schedule-reminders', action='store_true', help='Zaplanuj przypomnienia o wydarzeniach')
+    parser.add_argument('--run-jobs', type=int, metavar='N', help='Wykonaj N zaległych zadań w tle')
+    parser.add_argument('--partition-maintenance', action='store_true', help='Utwórz przyszłe i wygaś stare partycje logów')
+    parser.add_argument('--sitemap', action='store_true', help='Przebuduj zmienione mapy strony i kanały RSS/Atom')
+    parser.add_argument('--full', action='store_true', help='Z --sitemap: pełna przebudowa bez zapisanego stanu')
+    parser.add_argument('--social-outbox', type=int, metavar='N', help='Wyślij N zaległych publikacji social media')
     
     args = parser.parse_args()
     
@@ -199,11 +306,19 @@ def main():
         if args.stats:
             show_stats()
         elif args.cleanup:
-            cleanup_old_emails(days=args.days)
+            cleanup_old_emails(days=args.days, archive_dir=args.archive_dir)
         elif args.retry is not None:
             retry_failed_emails(limit=args.retry)
         elif args.schedule_reminders:
             schedule_event_reminders()
+        elif args.run_jobs is not None:
+            run_background_jobs(limit=args.run_jobs)
+        elif args.partition_maintenance:
+            run_partition_maintenance()
+        elif args.sitemap:
+            rebuild_sitemaps(force=args.full)
+        elif args.social_outbox is not None:
+            run_social_outbox(limit=args.social_outbox)
         else:
             process_queue(limit=args.limit)
             
@@ -0,0 +1,133 @@
+"""
+Retention Service - porcjowane czyszczenie starych danych
+
+Zamiast ładowania wszystkich wygasłych wierszy do sesji albo jednego DELETE
+na całej tabeli:
+- wiersze usuwane porcjami po RETENTION_CHUNK_SIZE, kolejno po kluczu głównym
+  (każda porcja to osobna, krótka transakcja)
+- pauza RETENTION_SLEEP_SECONDS między porcjami (replikacja i autovacuum nadążają)
+- opcjonalne archiwum: przed usunięciem porcja dopisywana do pliku
+  <katalog>/<tabela>[_<etykieta>]_<znacznik czasu>_<id>.jsonl.gz - osobny plik dla
+  każdego wywołania purge(), tworzony dopiero przy pierwszej porcji
+- wynik zawiera liczbę usuniętych wierszy, porcji, czas i wiersze/s
+"""
+import os
+import gzip
+import json
+import time
+import uuid
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+from flask import current_app, has_app_context
+from sqlalchemy import select, delete
+from app import db
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_SLEEP_SECONDS = 0.1
+
+
+def _config(key: str, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+class RetentionEngine:
+    """Usuwanie wygasłych wierszy porcjami z opcjonalną archiwizacją"""
+
+    def __init__(self, chunk_size: Optional[int] = None, sleep_seconds: Optional[float] = None,
+                 archive_dir: Optional[str] = None):
+        self.chunk_size = max(1, int(chunk_size or _config('RETENTION_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)))
+        self.sleep_seconds = float(sleep_seconds if sleep_seconds is not None
+                                   else _config('RETENTION_SLEEP_SECONDS', DEFAULT_SLEEP_SECONDS))
+        # Pusty katalog = bez archiwizacji
+        self.archive_dir = archive_dir if archive_dir is not None else _config('RETENTION_ARCHIVE_DIR', '')
+
+    def _archive_path(self, table_name: str, label: Optional[str] = None) -> str:
+        os.makedirs(self.archive_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        prefix = f'{table_name}_{label}' if label else table_name
+        return os.path.join(self.archive_dir, f'{prefix}_{stamp}_{uuid.uuid4().hex[:8]}.jsonl.gz')
+
+    @staticmethod
+    def _archive_chunk(archive, table, pk, ids):
+        rows = db.session.execute(select(table).where(pk.in_(ids)).order_by(pk)).mappings()
+        for row in rows:
+            archive.write(json.dumps(dict(row), default=str, ensure_ascii=False))
+            archive.write('\n')
+
+    def purge(self, model, *conditions, label: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Usuwa wiersze modelu spełniające warunki
+
+        Args:
+            model: Model SQLAlchemy z jednokolumnowym kluczem głównym
+            conditions: Warunki wygaśnięcia (np. EmailLog.sent_at < cutoff)
+            label: Dopisek w nazwie pliku archiwum (np. 'sent'), gdy tabela jest czyszczona kilka razy
+
+        Returns:
+            Dict: table, deleted, chunks, seconds, rows_per_second, archive_file
+        """
+        table = model.__table__
+        pk = list(table.primary_key.columns)[0]
+        archive_file = None
+        archive = None
+
+        deleted = 0
+        chunks = 0
+        last_id = None
+        started = time.perf_counter()
+
+        try:
+            while True:
+                ids_query = select(pk).where(*conditions)
+                if last_id is not None:
+                    ids_query = ids_query.where(pk > last_id)
+                ids = db.session.execute(ids_query.order_by(pk).limit(self.chunk_size)).scalars().all()
+                if not ids:
+                    break
+
+                if self.archive_dir:
+                    if archive is None:
+                        archive_file = self._archive_path(table.name, label)
+                        archive = gzip.open(archive_file, 'wt', encoding='utf-8')
+                    self._archive_chunk(archive, table, pk, ids)
+                    archive.flush()
+
+                result = db.session.execute(
+                    delete(table).where(pk.in_(ids)).execution_options(synchronize_session=False)
+                )
+                db.session.commit()
+
+                deleted += result.rowcount
+                chunks += 1
+                last_id = ids[-1]
+
+                if len(ids) < self.chunk_size:
+                    break
+                if self.sleep_seconds > 0:
+                    time.sleep(self.sleep_seconds)
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            if archive:
+                archive.close()
+
+        seconds = time.perf_counter() - started
+
+        stats = {
+            'table': table.name,
+            'deleted': deleted,
+            'chunks': chunks,
+            'seconds': round(seconds, 3),
+            'rows_per_second': round(deleted / seconds, 1) if seconds > 0 else 0.0,
+            'archive_file': archive_file
+        }
+        if deleted:
+            logger.info(f"🗑️ Retencja {table.name}: {deleted} wierszy w {chunks} porcjach, "
+                        f"{stats['rows_per_second']} wierszy/s")
+        return stats
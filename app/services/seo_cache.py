@@ -0,0 +1,116 @@
+"""
+SEO Cache - wyrenderowane meta tagi i JSON-LD stron publicznych
+
+Zamiast przy każdym renderowaniu strony odpytywać SEOSettings, dekodować
+structured_data i składać meta tagi oraz schema.org z modelu:
+- fragment <head> (seo/meta_tags.html z JSON-LD) renderowany raz i trzymany w pamięci
+  procesu pod kluczem (typ strony, id encji, updated_at encji) - edycja encji zmienia
+  klucz, więc nowa wersja widoczna jest od razu także w innych procesach
+- adres strony (og:url, twitter:url) wstawiany przy każdym żądaniu w miejsce znacznika
+- unieważnianie przy zapisach ustawień SEO (seo_api, SEOController) oraz tagów,
+  kategorii, postów i wydarzeń; SEO_CACHE_TTL ogranicza nieaktualność w pozostałych
+  procesach, SEO_CACHE_SIZE liczbę wpisów (najdawniej używane usuwane pierwsze)
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from flask import current_app, has_app_context, has_request_context, render_template, request
+from markupsafe import Markup, escape
+from app.utils.seo_utils import SEOManager
+
+DEFAULT_TTL = 300
+DEFAULT_SIZE = 1000
+
+# Znacznik adresu strony w zapisanym fragmencie (podmieniany przy każdym żądaniu)
+PAGE_URL_MARKER = '__seo_page_url__'
+
+# Typy stron z SEO generowanym z encji
+ENTITY_GENERATORS = {
+    'blog_post': SEOManager.generate_blog_post_seo,
+    'blog_category': SEOManager.generate_blog_category_seo,
+    'blog_tag': SEOManager.generate_blog_tag_seo,
+    'event': SEOManager.generate_event_seo,
+    'section': SEOManager.generate_section_seo,
+}
+
+_cache: 'OrderedDict[Tuple, Tuple[str, float]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _config(key: str, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+def _entity_version(entity) -> Optional[str]:
+    changed = getattr(entity, 'updated_at', None) or getattr(entity, 'created_at', None)
+    return changed.isoformat() if changed else None
+
+
+class SEOCache:
+    """Cache fragmentów <head> z meta tagami SEO"""
+
+    @staticmethod
+    def key(page_type: str, entity=None) -> Tuple:
+        if entity is None:
+            return page_type, None, None
+        return page_type, entity.id, _entity_version(entity)
+
+    @staticmethod
+    def resolve(page_type: str, entity=None) -> dict:
+        """Dane SEO dla typu strony (z encji lub z SEOSettings)"""
+        generator = ENTITY_GENERATORS.get(page_type)
+        if generator and entity is not None:
+            return generator(entity)
+        return SEOManager.get_seo_settings(page_type)
+
+    @classmethod
+    def head(cls, page_type: str, entity=None) -> Markup:
+        """
+        Wyrenderowany fragment meta tagów (z JSON-LD) dla strony
+
+        Args:
+            page_type: Typ strony (blog_home, blog_post, blog_category, ...)
+            entity: Encja strony (post, kategoria, tag, wydarzenie, sekcja) lub None
+        """
+        key = cls.key(page_type, entity)
+        now = time.monotonic()
+        with _cache_lock:
+            cached = _cache.get(key)
+            if cached and cached[1] > now:
+                _cache.move_to_end(key)
+                fragment = cached[0]
+            else:
+                fragment = None
+
+        if fragment is None:
+            fragment = render_template('seo/meta_tags.html', seo_data=cls.resolve(page_type, entity),
+                                       page_url=PAGE_URL_MARKER)
+            size = int(_config('SEO_CACHE_SIZE', DEFAULT_SIZE))
+            expires_at = now + int(_config('SEO_CACHE_TTL', DEFAULT_TTL))
+            with _cache_lock:
+                _cache[key] = (fragment, expires_at)
+                _cache.move_to_end(key)
+                while len(_cache) > size:
+                    _cache.popitem(last=False)
+
+        page_url = str(escape(request.url)) if has_request_context() else ''
+        return Markup(fragment.replace(PAGE_URL_MARKER, page_url))
+
+    @staticmethod
+    def invalidate(page_type: Optional[str] = None, entity_id: Optional[int] = None):
+        """
+        Unieważnia fragmenty
+
+        Bez argumentów - wszystkie (np. po zmianie ustawień SEO); z page_type - wszystkie
+        danego typu; z page_type i entity_id - wszystkie wersje jednej encji.
+        """
+        with _cache_lock:
+            if page_type is None:
+                _cache.clear()
+                return
+            for key in [key for key in _cache if key[0] == page_type
+                        and (entity_id is None or key[1] == entity_id)]:
+                del _cache[key]
@@ -0,0 +1,419 @@
+"""
+Sitemap Service - mapa strony i kanały RSS/Atom jako statyczne pliki gzip
+
+Pliki budowane przez cron (process_email_queue.py --sitemap) w katalogu SITEMAP_DIR:
+- sitemap.xml (+ .gz) - indeks map; sitemap-1.xml.gz, sitemap-2.xml.gz, ... - po
+  najwyżej SITEMAP_MAX_URLS adresów (limit protokołu: 50 000)
+- feed.rss i feed.atom (+ .gz) - FEED_SIZE najnowszych postów
+- state.json - znaczniki (watermark) updated_at i adresy postów z poprzedniego budowania
+
+Przyrostowo:
+- ładowane są tylko posty z updated_at nowszym niż zapisany znacznik; usunięte,
+  wycofane i brakujące wykrywane po liczbie i sumie id (pełna lista id tylko przy różnicy)
+- kategorie, tagi i wydarzenia (małe tabele) przeliczane za każdym razem; zmiana
+  kategorii (slug, rodzic) przebudowuje adresy wszystkich postów
+- posty w kolejności id, więc nowe trafiają do ostatniego pliku; plik zapisywany
+  (atomowo) tylko gdy zmieniła się treść - Last-Modified odpowiada faktycznej zmianie
+
+Serwowanie (send_generated) czyta wyłącznie pliki z dysku - ruch robotów nie
+wykonuje zapytań do bazy. Wydarzenia nie mają własnych stron - ich zmiany
+aktualizują lastmod strony głównej, na której są wyświetlane.
+"""
+import os
+import gzip
+import json
+import hashlib
+import logging
+import tempfile
+from datetime import datetime
+from email.utils import format_datetime
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+from flask import current_app, has_app_context
+from sqlalchemy import func
+from sqlalchemy.orm import load_only, selectinload
+from app import db
+from app.models import BlogPost, BlogCategory, BlogTag, EventSchedule, blog_post_categories, blog_post_tags
+from app.blueprints.blog_controller import BlogController
+from app.services.blog_listing import listing_query
+from app.utils.timezone_utils import get_local_timezone
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_INDEX = 'sitemap.xml'
+CHUNK_TEMPLATE = 'sitemap-{}.xml.gz'
+FEED_FILES = {'rss': 'feed.rss', 'atom': 'feed.atom'}
+STATE_NAME = 'state.json'
+STATE_VERSION = 1
+
+# Limit adresów w jednym pliku mapy wg sitemaps.org
+PROTOCOL_MAX_URLS = 50000
+DEFAULT_FEED_SIZE = 20
+DEFAULT_FEED_TITLE = 'Klub Lepsze Życie - Blog'
+
+# Robot i tak pyta warunkowo (If-Modified-Since) - krótki cache wystarcza
+CACHE_MAX_AGE = 900
+
+# Strony stałe: ścieżka i źródło lastmod
+STATIC_PAGES = (('/', 'events'), ('/blog/', 'posts'), ('/privacy-policy', None), ('/terms', None))
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+
+
+def _config(key: str, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+def sitemap_dir() -> str:
+    """Katalog plików; ścieżka względna liczona od katalogu projektu (nie od cwd procesu)"""
+    path = _config('SITEMAP_DIR', 'instance/sitemaps')
+    if os.path.isabs(path):
+        return path
+    app_root = current_app.root_path if has_app_context() else os.path.dirname(os.path.dirname(__file__))
+    return os.path.join(os.path.dirname(app_root), path)
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    """Daty w bazie zapisywane są w czasie lokalnym bez strefy"""
+    if value is None or value.tzinfo is not None:
+        return value
+    return get_local_timezone().localize(value)
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    value = _aware(value)
+    return value.isoformat(timespec='seconds') if value else None
+
+
+def _latest(*values: Optional[str]) -> Optional[str]:
+    present = [value for value in values if value]
+    return max(present, key=lambda value: datetime.fromisoformat(value)) if present else None
+
+
+def _write_atomic(path: str, content: bytes):
+    directory = os.path.dirname(path)
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(handle, 'wb') as temp:
+            temp.write(content)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _gzip(content: bytes) -> bytes:
+    # mtime=0 - ta sama treść daje ten sam plik
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def _digest(content: bytes) -> str:
+    return hashlib.sha1(content, usedforsecurity=False).hexdigest()
+
+
+class SitemapBuilder:
+    """Przyrostowe budowanie map strony i kanałów"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or sitemap_dir()
+        self.base_url = (_config('BASE_URL', None) or '').rstrip('/')
+        self.max_urls = min(int(_config('SITEMAP_MAX_URLS', PROTOCOL_MAX_URLS)), PROTOCOL_MAX_URLS)
+        self.stats = {'posts_loaded': 0, 'files_written': 0, 'files_removed': 0}
+
+    # --- stan ---
+
+    def _state_path(self) -> str:
+        return os.path.join(self.directory, STATE_NAME)
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self._state_path(), encoding='utf-8') as handle:
+                state = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        return state if state.get('version') == STATE_VERSION else {}
+
+    def _save_state(self, state: Dict):
+        state['version'] = STATE_VERSION
+        _write_atomic(self._state_path(), json.dumps(state, sort_keys=True).encode('utf-8'))
+
+    def _write(self, name: str, content: bytes, digests: Dict[str, str], plain: bool = True):
+        """Zapisuje plik (i wariant .gz) tylko gdy treść się zmieniła"""
+        digest = _digest(content)
+        paths = [os.path.join(self.directory, name)]
+        if plain:
+            paths.append(paths[0] + '.gz')
+        if digests.get(name) == digest and all(os.path.exists(path) for path in paths):
+            return
+        if plain:
+            _write_atomic(paths[0], content)
+            _write_atomic(paths[1], _gzip(content))
+        else:
+            _write_atomic(paths[0], _gzip(content))
+        digests[name] = digest
+        self.stats['files_written'] += 1
+
+    # --- źródła ---
+
+    def _categories(self) -> Tuple[List[BlogCategory], List]:
+        categories = BlogCategory.query.options(selectinload(BlogCategory.parent)).order_by(BlogCategory.id).all()
+        # Zmiana sluga lub rodzica kategorii (także nieaktywnej) zmienia adresy postów
+        signature = [[category.id, category.slug, category.parent.slug if category.parent else None]
+                     for category in categories]
+        return [category for category in categories if category.is_active], signature
+
+    def _post_entry(self, post: BlogPost) -> List:
+        return [BlogController.get_post_url_with_category(post), _iso(post.updated_at or post.created_at)]
+
+    @staticmethod
+    def _posts_query():
+        return BlogPost.query.filter(BlogPost.status == 'published').options(
+            load_only(BlogPost.id, BlogPost.slug, BlogPost.created_at, BlogPost.updated_at),
+            selectinload(BlogPost.categories).load_only(BlogCategory.id, BlogCategory.slug, BlogCategory.parent_id)
+            .selectinload(BlogCategory.parent).load_only(BlogCategory.id, BlogCategory.slug)
+        )
+
+    def _load_posts(self, watermark: Optional[str]) -> Tuple[Dict[int, List], Optional[str]]:
+        """Wpisy opublikowanych postów zmienionych po znaczniku (wszystkich gdy brak znacznika)"""
+        query = self._posts_query()
+        # Znacznik w pełnej precyzji (naiwny czas lokalny jak w kolumnie) - bez ponownego
+        # ładowania postów zmienionych w tej samej sekundzie
+        latest = datetime.fromisoformat(watermark) if watermark else None
+        if latest:
+            query = query.filter(BlogPost.updated_at > latest)
+
+        entries = {}
+        for post in query.order_by(BlogPost.id).yield_per(1000):
+            entries[post.id] = self._post_entry(post)
+            if post.updated_at and (latest is None or post.updated_at.replace(tzinfo=None) > latest):
+                latest = post.updated_at.replace(tzinfo=None)
+        self.stats['posts_loaded'] += len(entries)
+        return entries, latest.isoformat() if latest else None
+
+    def _sync_published(self, posts: Dict[int, List]) -> bool:
+        """
+        Usuwa wpisy postów usuniętych lub wycofanych z publikacji i dodaje brakujące
+        (np. opublikowane bez zmiany updated_at)
+
+        Returns:
+            True gdy zbiór postów się zmienił
+        """
+        count, id_sum = db.session.query(func.count(BlogPost.id), func.coalesce(func.sum(BlogPost.id), 0)) \
+            .filter(BlogPost.status == 'published').one()
+        if count == len(posts) and int(id_sum) == sum(posts):
+            return False
+        published = {post_id for (post_id,) in db.session.query(BlogPost.id).filter(BlogPost.status == 'published')}
+        for post_id in [post_id for post_id in posts if post_id not in published]:
+            del posts[post_id]
+        missing = sorted(published.difference(posts))
+        for start in range(0, len(missing), 1000):
+            for post in self._posts_query().filter(BlogPost.id.in_(missing[start:start + 1000])):
+                posts[post.id] = self._post_entry(post)
+        self.stats['posts_loaded'] += len(missing)
+        return True
+
+    @staticmethod
+    def _latest_post_updates(association, key) -> Dict[int, Optional[str]]:
+        rows = db.session.query(key, func.max(BlogPost.updated_at)) \
+            .join(BlogPost, BlogPost.id == association.c.post_id) \
+            .filter(BlogPost.status == 'published') \
+            .group_by(key).all()
+        return {item_id: _iso(updated_at) for item_id, updated_at in rows}
+
+    def _events_lastmod(self) -> Optional[str]:
+        updated_at = db.session.query(func.max(EventSchedule.updated_at)).filter(
+            EventSchedule.is_active.is_(True),
+            EventSchedule.is_published.is_(True)
+        ).scalar()
+        return _iso(updated_at)
+
+    # --- XML ---
+
+    def _absolute(self, path: str) -> str:
+        return f'{self.base_url}{path}'
+
+    def _urlset(self, entries: List[List]) -> bytes:
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<urlset xmlns="{SITEMAP_NS}">']
+        for path, lastmod in entries:
+            lastmod_tag = f'<lastmod>{lastmod}</lastmod>' if lastmod else ''
+            lines.append(f'<url><loc>{escape(self._absolute(path))}</loc>{lastmod_tag}</url>')
+        lines.append('</urlset>')
+        return '\n'.join(lines).encode('utf-8')
+
+    def _index(self, chunks: List[Tuple[str, Optional[str]]]) -> bytes:
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<sitemapindex xmlns="{SITEMAP_NS}">']
+        for name, lastmod in chunks:
+            lastmod_tag = f'<lastmod>{lastmod}</lastmod>' if lastmod else ''
+            lines.append(f'<sitemap><loc>{escape(self._absolute("/sitemaps/" + name))}</loc>{lastmod_tag}</sitemap>')
+        lines.append('</sitemapindex>')
+        return '\n'.join(lines).encode('utf-8')
+
+    def _feed_items(self) -> List[Dict]:
+        size = int(_config('FEED_SIZE', DEFAULT_FEED_SIZE))
+        posts = listing_query().order_by(BlogPost.published_at.desc().nulls_last(), BlogPost.id.desc()) \
+            .limit(size).all()
+        return [{
+            'id': post.id,
+            'title': post.title,
+            'link': self._absolute(BlogController.get_post_url_with_category(post)),
+            'summary': post.excerpt or post.summary or '',
+            'author': post.author.first_name if post.author else None,
+            'categories': [category.title for category in post.categories],
+            'published': _aware(post.published_at or post.created_at),
+        } for post in posts]
+
+    def _rss(self, items: List[Dict], title: str) -> bytes:
+        link = self._absolute('/blog/')
+        updated = max((item['published'] for item in items if item['published']), default=None)
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            f'<rss version="2.0" xmlns:atom="{ATOM_NS}"><channel>',
+            f'<title>{escape(title)}</title>',
+            f'<link>{escape(link)}</link>',
+            f'<description>{escape(title)}</description>',
+            '<language>pl</language>',
+            f'<atom:link href="{escape(self._absolute("/blog/feed.rss"))}" rel="self" type="application/rss+xml"/>',
+        ]
+        if updated:
+            lines.append(f'<lastBuildDate>{format_datetime(updated)}</lastBuildDate>')
+        for item in items:
+            lines.append('<item>')
+            lines.append(f"<title>{escape(item['title'])}</title>")
+            lines.append(f"<link>{escape(item['link'])}</link>")
+            lines.append(f"<guid isPermaLink=\"false\">{escape(self._absolute('/blog/'))}post-{item['id']}</guid>")
+            if item['published']:
+                lines.append(f"<pubDate>{format_datetime(item['published'])}</pubDate>")
+            lines.extend(f'<category>{escape(category)}</category>' for category in item['categories'])
+            lines.append(f"<description>{escape(item['summary'])}</description>")
+            lines.append('</item>')
+        lines.append('</channel></rss>')
+        return '\n'.join(lines).encode('utf-8')
+
+    def _atom(self, items: List[Dict], title: str) -> bytes:
+        updated = max((item['published'] for item in items if item['published']), default=None)
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            f'<feed xmlns="{ATOM_NS}" xml:lang="pl">',
+            f'<title>{escape(title)}</title>',
+            f'<id>{escape(self._absolute("/blog/"))}</id>',
+            f'<link href="{escape(self._absolute("/blog/"))}"/>',
+            f'<link href="{escape(self._absolute("/blog/feed.atom"))}" rel="self"/>',
+            f'<updated>{_iso(updated) or _iso(datetime.now(get_local_timezone()))}</updated>',
+        ]
+        for item in items:
+            lines.append('<entry>')
+            lines.append(f"<title>{escape(item['title'])}</title>")
+            lines.append(f"<id>{escape(self._absolute('/blog/'))}post-{item['id']}</id>")
+            lines.append(f"<link href=\"{escape(item['link'])}\"/>")
+            if item['published']:
+                lines.append(f"<published>{_iso(item['published'])}</published>")
+                lines.append(f"<updated>{_iso(item['published'])}</updated>")
+            if item['author']:
+                lines.append(f"<author><name>{escape(item['author'])}</name></author>")
+            lines.extend(f'<category term="{escape(category)}"/>' for category in item['categories'])
+            lines.append(f"<summary>{escape(item['summary'])}</summary>")
+            lines.append('</entry>')
+        lines.append('</feed>')
+        return '\n'.join(lines).encode('utf-8')
+
+    # --- budowanie ---
+
+    def build(self, force: bool = False) -> Dict:
+        """
+        Przebudowuje zmienione pliki map i kanałów
+
+        Args:
+            force: Pomija zapisany stan i buduje wszystko od nowa
+
+        Returns:
+            Dict: urls, chunks, posts_loaded, files_written, files_removed, full
+        """
+        if not self.base_url:
+            raise ValueError('BASE_URL nie jest ustawiony - mapa strony wymaga adresów bezwzględnych')
+        os.makedirs(self.directory, exist_ok=True)
+
+        state = {} if force else self._load_state()
+        categories, category_signature = self._categories()
+        full = (not state or state.get('base_url') != self.base_url
+                or state.get('categories') != category_signature)
+
+        posts = {} if full else {int(post_id): entry for post_id, entry in state.get('posts', {}).items()}
+        watermark = None if full else state.get('watermark')
+        changed, watermark = self._load_posts(watermark)
+        posts.update(changed)
+        resynced = self._sync_published(posts)
+
+        category_updates = self._latest_post_updates(blog_post_categories, blog_post_categories.c.category_id)
+        tag_updates = self._latest_post_updates(blog_post_tags, blog_post_tags.c.tag_id)
+        tags = BlogTag.query.filter_by(is_active=True).order_by(BlogTag.id).all()
+
+        lastmods = {'events': self._events_lastmod(), 'posts': _iso(datetime.fromisoformat(watermark)) if watermark else None}
+        entries = [[path, lastmods.get(source)] for path, source in STATIC_PAGES]
+        entries.extend([BlogController.get_category_url_with_hierarchy(category),
+                        _latest(_iso(category.updated_at), category_updates.get(category.id))]
+                       for category in categories)
+        entries.extend([f'/blog/tag/{tag.slug}', tag_updates.get(tag.id) or _iso(tag.created_at)] for tag in tags)
+        entries.extend(posts[post_id] for post_id in sorted(posts))
+
+        digests = {} if full else state.get('digests', {})
+        chunks = []
+        for number, start in enumerate(range(0, len(entries), self.max_urls), start=1):
+            chunk = entries[start:start + self.max_urls]
+            name = CHUNK_TEMPLATE.format(number)
+            self._write(name, self._urlset(chunk), digests, plain=False)
+            chunks.append((name, _latest(*(lastmod for _, lastmod in chunk))))
+        self._remove_stale_chunks({name for name, _ in chunks}, digests)
+        self._write(SITEMAP_INDEX, self._index(chunks), digests)
+
+        if full or changed or resynced or any(name not in digests for name in FEED_FILES.values()):
+            items = self._feed_items()
+            title = _config('FEED_TITLE', DEFAULT_FEED_TITLE)
+            self._write(FEED_FILES['rss'], self._rss(items, title), digests)
+            self._write(FEED_FILES['atom'], self._atom(items, title), digests)
+
+        self._save_state({
+            'base_url': self.base_url,
+            'categories': category_signature,
+            'watermark': watermark,
+            'posts': {str(post_id): entry for post_id, entry in posts.items()},
+            'digests': digests,
+            'built_at': _iso(datetime.now(get_local_timezone()))
+        })
+        return dict(self.stats, urls=len(entries), chunks=len(chunks), full=full)
+
+    def _remove_stale_chunks(self, current: set, digests: Dict[str, str]):
+        for name in os.listdir(self.directory):
+            if name.startswith('sitemap-') and name.endswith('.xml.gz') and name not in current:
+                os.remove(os.path.join(self.directory, name))
+                digests.pop(name, None)
+                self.stats['files_removed'] += 1
+
+
+def send_generated(filename: str, mimetype: str, precompressed: bool = True):
+    """
+    Odpowiedź z pliku zbudowanego przez SitemapBuilder - bez zapytań do bazy
+
+    Last-Modified z mtime pliku (zmienia się tylko przy zmianie treści), odpowiedzi
+    warunkowe 304 obsługuje send_from_directory. Przy precompressed wariant .gz
+    wysyłany z Content-Encoding, gdy klient go akceptuje. Abort 404, gdy plik nie istnieje.
+    """
+    from flask import abort, request, send_from_directory
+
+    directory = sitemap_dir()
+    if not os.path.isfile(os.path.join(directory, filename)):
+        abort(404)
+
+    if precompressed and request.accept_encodings['gzip'] > 0 and os.path.isfile(os.path.join(directory, filename + '.gz')):
+        response = send_from_directory(directory, filename + '.gz', mimetype=mimetype, max_age=CACHE_MAX_AGE)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = send_from_directory(directory, filename, mimetype=mimetype, max_age=CACHE_MAX_AGE)
+    if precompressed:
+        response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    return response
@@ -0,0 +1,232 @@
+"""
+Social Outbox - publikacja postów bloga w mediach społecznościowych w tle
+
+Zamiast wywoływać API Facebooka / Twittera / LinkedIn w żądaniu admina:
+- zapis posta dodaje wiersz social_publications (post, platforma) w tej samej
+  transakcji co post - publikacja nie zginie, gdy proces padnie po commit
+- po commit wiersz przekazywany jest do JobPipeline (social_publication), a cron
+  (--social-outbox) podejmuje wiersze, których termin ponowienia minął
+- nieudane próby ponawiane z wykładniczym opóźnieniem (SOCIAL_PUBLISH_BACKOFF)
+  aż do SOCIAL_PUBLISH_MAX_ATTEMPTS
+- idempotencja: jeden wiersz na (post, platforma) z własnym idempotency_key,
+  wiersz przejmowany atomowo (pending -> sending); wiersz porzucony w trakcie
+  wysyłki nie jest wysyłany ponownie (wynik nieznany - ponowienie tylko ręczne),
+  bo API platform nie przyjmują kluczy idempotencji
+"""
+import logging
+from datetime import timedelta
+from typing import Dict, List, Optional
+from flask import current_app, has_app_context
+from sqlalchemy import update, or_
+from app.models import db, BlogPost, SocialPublication
+from app.services.social_media_service import social_media_service
+from app.utils.timezone_utils import get_local_now
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF = 60
+# Wiersze 'sending' starsze niż 10 min uznajemy za porzucone
+STALE_AFTER = 600
+
+# Platforma -> flaga posta
+PLATFORMS = {
+    'facebook': 'social_facebook',
+    'twitter': 'social_twitter',
+    'linkedin': 'social_linkedin',
+}
+
+
+def _config(key: str, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+class SocialOutbox:
+    """Outbox publikacji postów bloga w mediach społecznościowych"""
+
+    @staticmethod
+    def snapshot(post: BlogPost) -> Dict[str, object]:
+        """Status i flagi platform posta sprzed edycji (do przekazania do stage())"""
+        return {attr: getattr(post, attr) for attr in ('status', *PLATFORMS.values())}
+
+    @staticmethod
+    def stage(post: BlogPost, previous: Optional[Dict[str, object]] = None) -> List[SocialPublication]:
+        """
+        Dodaje do sesji publikacje dla zaznaczonych platform (bez commit)
+
+        Wywoływać przed commit zapisu posta. Publikacja powstaje tylko dla nowego
+        opublikowanego posta, przy zmianie statusu na 'published' albo po włączeniu
+        flagi platformy - zwykła edycja posta opublikowanego przed wprowadzeniem
+        outboxa nie publikuje go ponownie. Platformy, dla których post ma już
+        publikację, są pomijane.
+
+        Args:
+            post: Zapisywany post
+            previous: snapshot() pobrany przed zmianą pól edytowanego posta; None dla
+                nowego posta. Historia atrybutów ORM się nie nadaje - autoflush przy
+                zapytaniach o kategorie / tagi czyści ją przed commit
+
+        Returns:
+            Nowe publikacje (do przekazania do dispatch() po commit)
+        """
+        if post.status != 'published':
+            return []
+
+        publishing = previous is None or previous.get('status') != 'published'
+        platforms = [platform for platform, flag in PLATFORMS.items()
+                     if getattr(post, flag) and (publishing or not previous.get(flag))]
+        if not platforms:
+            return []
+
+        staged = set()
+        if post.id is not None:
+            staged = {row.platform for row in db.session.query(SocialPublication.platform)
+                      .filter(SocialPublication.post_id == post.id)}
+
+        max_attempts = int(_config('SOCIAL_PUBLISH_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS))
+        publications = []
+        for platform in platforms:
+            if platform in staged:
+                continue
+            publication = SocialPublication(post=post, platform=platform, max_attempts=max_attempts,
+                                            run_after=get_local_now())
+            db.session.add(publication)
+            publications.append(publication)
+        return publications
+
+    @staticmethod
+    def dispatch(publications: List[SocialPublication]):
+        """Zleca wysyłkę publikacji w tle (wywoływać po commit)"""
+        from app.services.background_jobs import job_pipeline
+        for publication in publications:
+            # Ponawianie obsługuje outbox (run_after), więc zadanie ma jedną próbę
+            job_pipeline.enqueue('social_publication', {'publication_id': publication.id}, max_attempts=1)
+
+    @staticmethod
+    def _publish(post: BlogPost, platform: str):
+        post_url = f"{_config('BASE_URL', 'https://klublepszezycie.pl')}/blog/{post.slug}"
+        excerpt = post.excerpt or post.meta_description or ''
+        if platform == 'facebook':
+            return social_media_service.publish_to_facebook(post.title, post_url, excerpt, post.featured_image or None)
+        if platform == 'twitter':
+            return social_media_service.publish_to_twitter(post.title, post_url, excerpt)
+        if platform == 'linkedin':
+            return social_media_service.publish_to_linkedin(post.title, post_url, excerpt)
+        return False, f"Nieobsługiwana platforma: {platform}"
+
+    @classmethod
+    def deliver(cls, publication_id: int) -> bool:
+        """
+        Wysyła pojedynczą publikację (wymaga kontekstu aplikacji)
+
+        Publikacja jest przejmowana atomowo (pending -> sending), więc to samo ID
+        w zadaniu i w cronie zostanie wysłane tylko raz. Nie rzuca wyjątków.
+
+        Returns:
+            True gdy opublikowano
+        """
+        now = get_local_now()
+        claimed = db.session.execute(
+            update(SocialPublication)
+            .where(SocialPublication.id == publication_id, SocialPublication.status == 'pending',
+                   or_(SocialPublication.run_after.is_(None), SocialPublication.run_after <= now))
+            .values(status='sending', attempts=SocialPublication.attempts + 1, started_at=now)
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return False
+
+        publication = db.session.get(SocialPublication, publication_id)
+        try:
+            post = publication.post
+            if post is None or post.status != 'published':
+                publication.status = 'cancelled'
+                publication.last_error = 'Post nie jest opublikowany'
+                db.session.commit()
+                return False
+            success, message = cls._publish(post, publication.platform)
+        except Exception as e:
+            db.session.rollback()
+            publication = db.session.get(SocialPublication, publication_id)
+            success, message = False, str(e)
+
+        if success:
+            publication.status = 'sent'
+            publication.response = message
+            publication.last_error = None
+            publication.sent_at = get_local_now()
+            logger.info(f"✅ Post {publication.post_id} opublikowany na {publication.platform}: {message}")
+        else:
+            publication.last_error = message
+            if publication.attempts >= (publication.max_attempts or 1):
+                publication.status = 'failed'
+                logger.error(f"❌ Post {publication.post_id} NIE opublikowany na {publication.platform} "
+                             f"po {publication.attempts} próbach: {message}")
+            else:
+                backoff = int(_config('SOCIAL_PUBLISH_BACKOFF', DEFAULT_BACKOFF))
+                publication.status = 'pending'
+                publication.run_after = get_local_now() + timedelta(seconds=backoff * 2 ** (publication.attempts - 1))
+                logger.warning(f"⚠️ Post {publication.post_id} - publikacja na {publication.platform} "
+                               f"nieudana (próba {publication.attempts}), ponowienie: {publication.run_after}")
+        db.session.commit()
+        return success
+
+    @classmethod
+    def relay(cls, limit: int = 50) -> Dict[str, int]:
+        """
+        Wysyła zaległe publikacje (dla crona)
+
+        Returns:
+            Dict ze statystykami: processed, sent, failed, abandoned
+        """
+        stats = {'processed': 0, 'sent': 0, 'failed': 0, 'abandoned': cls._abandon_stale()}
+        rows = db.session.query(SocialPublication.id).filter(
+            SocialPublication.status == 'pending',
+            or_(SocialPublication.run_after.is_(None), SocialPublication.run_after <= get_local_now())
+        ).order_by(SocialPublication.run_after.asc()).limit(limit).all()
+
+        for row in rows:
+            stats['processed'] += 1
+            if cls.deliver(row.id):
+                stats['sent'] += 1
+            else:
+                stats['failed'] += 1
+        return stats
+
+    @staticmethod
+    def _abandon_stale() -> int:
+        """Oznacza jako nieudane publikacje porzucone w trakcie wysyłki (mogły zostać opublikowane)"""
+        threshold = get_local_now() - timedelta(seconds=STALE_AFTER)
+        abandoned = db.session.execute(
+            update(SocialPublication)
+            .where(SocialPublication.status == 'sending', SocialPublication.started_at < threshold)
+            .values(status='failed', last_error='Wysyłka przerwana - wynik nieznany, sprawdź platformę przed ponowieniem')
+        ).rowcount
+        db.session.commit()
+        if abandoned:
+            logger.warning(f"⚠️ {abandoned} publikacji przerwanych w trakcie wysyłki")
+        return abandoned
+
+    @staticmethod
+    def status(post_id: int) -> Dict[str, Dict]:
+        """Stan publikacji posta per platforma"""
+        publications = SocialPublication.query.filter_by(post_id=post_id).all()
+        return {publication.platform: publication.to_dict() for publication in publications}
+
+    @staticmethod
+    def retry(post_id: int, platform: str) -> Optional[SocialPublication]:
+        """
+        Przywraca nieudaną lub anulowaną publikację do kolejki (bez commit)
+
+        Returns:
+            Publikacja lub None, gdy nie istnieje albo nie można jej ponowić
+        """
+        publication = SocialPublication.query.filter_by(post_id=post_id, platform=platform).first()
+        if publication is None or publication.status not in ('failed', 'cancelled'):
+            return None
+        publication.status = 'pending'
+        publication.attempts = 0
+        publication.run_after = get_local_now()
+        return publication
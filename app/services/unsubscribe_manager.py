@@ -8,8 +8,9 @@ import secrets
 import base64
 import json
 import os
+import logging
 from datetime import datetime, timedelta
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Iterable
 from app import db
 from app.models.user_model import User
 
@@ -24,6 +25,34 @@ class UnsubscribeManager:
         # Ensure URL has protocol
         if self.base_url and not self.base_url.startswith(('http://', 'https://')):
             self.base_url = f'http://{self.base_url}'
+        
+        # Przygotowany obiekt HMAC z kluczem - kopiowany dla każdego podpisu
+        self._hmac_template = hmac.new(self.secret_key.encode('utf-8'), digestmod=hashlib.sha256)
+        self.logger = logging.getLogger(__name__)
+    
+    def _sign(self, payload: str) -> str:
+        """Podpis HMAC-SHA256 payloadu (16 znaków dla krótkości)"""
+        mac = self._hmac_template.copy()
+        mac.update(payload.encode('utf-8'))
+        return mac.hexdigest()[:16]
+    
+    def _expires_timestamp(self) -> int:
+        """Timestamp wygaśnięcia dla tokenów generowanych teraz"""
+        expires_at = __import__('app.utils.timezone_utils', fromlist=['get_local_now']).get_local_now() + timedelta(days=self.token_expiry_days)
+        return int(expires_at.timestamp())
+    
+    def generate_token_for_user(self, user_id: int, action: str, expires_timestamp: int = None) -> str:
+        """
+        Generuje token dla znanego user_id (bez zapytań do bazy)
+        
+        Format: {user_id}.{expires_timestamp}.{action}.{hmac_signature}
+        """
+        if expires_timestamp is None:
+            expires_timestamp = self._expires_timestamp()
+        
+        # Payload: user_id.expires_timestamp.action
+        payload = f"{user_id}.{expires_timestamp}.{action}"
+        return f"{payload}.{self._sign(payload)}"
     
     def generate_token(self, email: str, action: str) -> str:
         """
@@ -34,38 +63,56 @@ class UnsubscribeManager:
         """
         try:
             # Znajdź użytkownika
-            user = User.query.filter_by(email=email).first()
-            if not user:
-                print(f"❌ User not found: {email}")
+            user_id = db.session.query(User.id).filter_by(email=email).scalar()
+            if not user_id:
+                self.logger.warning(f"❌ User not found: {email}")
                 return None
             
-            # Utwórz token payload
-            expires_at = __import__('app.utils.timezone_utils', fromlist=['get_local_now']).get_local_now() + timedelta(days=self.token_expiry_days)
-            expires_timestamp = int(expires_at.timestamp())
-            
-            # Payload: user_id.expires_timestamp.action
-            payload = f"{user.id}.{expires_timestamp}.{action}"
-            
-            # Wygeneruj HMAC signature (16 znaków dla krótkości)
-            signature = hmac.new(
-                self.secret_key.encode('utf-8'),
-                payload.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()[:16]
-            
-            # Token format: user_id.expires_timestamp.action.signature
-            token = f"{user.id}.{expires_timestamp}.{action}.{signature}"
-            
-            print(f"🔑 Generated {action} token for {email}")
-            print(f"   Expires: {expires_at.strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"   Token: {token} (length: {len(token)})")
-            
+            token = self.generate_token_for_user(user_id, action)
+            self.logger.debug(f"🔑 Generated {action} token for {email}")
             return token
             
         except Exception as e:
-            print(f"❌ Error generating token: {e}")
+            self.logger.error(f"❌ Error generating token: {e}")
             return None
     
+    def get_urls_for_user(self, user_id: int, expires_timestamp: int = None) -> Dict[str, Optional[str]]:
+        """
+        Zwraca oba podpisane URL-e (wypisanie i usunięcie konta) dla znanego user_id
+        
+        Returns:
+            Dict z kluczami unsubscribe_url i delete_account_url (None gdy brak user_id)
+        """
+        if not user_id:
+            return {'unsubscribe_url': None, 'delete_account_url': None}
+        
+        if expires_timestamp is None:
+            expires_timestamp = self._expires_timestamp()
+        
+        return {
+            'unsubscribe_url': f"{self.base_url}/unsubscribe/{self.generate_token_for_user(user_id, 'unsubscribe', expires_timestamp)}",
+            'delete_account_url': f"{self.base_url}/delete-account/{self.generate_token_for_user(user_id, 'delete_account', expires_timestamp)}"
+        }
+    
+    def bulk_get_urls(self, recipients: Iterable[Tuple[Optional[int], str]]) -> Dict[str, Dict[str, Optional[str]]]:
+        """
+        Generuje URL-e wypisania i usunięcia konta dla wielu odbiorców w jednym przebiegu
+        
+        Nie wykonuje zapytań do bazy - przyjmuje już załadowane pary (user_id, email).
+        Wszystkie tokeny w partii mają wspólny czas wygaśnięcia.
+        
+        Args:
+            recipients: Iterowalne pary (user_id, email); user_id może być None
+            
+        Returns:
+            Dict email -> {'unsubscribe_url': ..., 'delete_account_url': ...}
+        """
+        expires_timestamp = self._expires_timestamp()
+        return {
+            email: self.get_urls_for_user(user_id, expires_timestamp)
+            for user_id, email in recipients
+        }
+    
     def verify_token(self, token: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
         """
         Weryfikuje KRÓTKI token i zwraca dane użytkownika
@@ -99,11 +146,7 @@ class UnsubscribeManager:
             
             # Weryfikuj HMAC signature
             payload = f"{user_id}.{expires_timestamp}.{action}"
-            expected_signature = hmac.new(
-                self.secret_key.encode('utf-8'),
-                payload.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()[:16]
+            expected_signature = self._sign(payload)
             
             if not hmac.compare_digest(signature, expected_signature):
                 print(f"❌ Invalid token signature")
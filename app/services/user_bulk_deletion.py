@@ -0,0 +1,167 @@
+"""
+User Bulk Deletion - zbiorowe usuwanie użytkowników
+
+Zamiast przetwarzania użytkowników pojedynczo (zapytania o członkostwa, rejestracje
+i kolejkę dla każdego z osobna, a na końcu pełna synchronizacja wszystkich grup):
+- kilka instrukcji DELETE ... WHERE user_id = ANY(:ids) w jednej transakcji
+- member_count przeliczany tylko dla grup, z których usunięto członkostwa
+- czasy poszczególnych faz zwracane w wyniku (diagnostyka dużych operacji)
+
+Pozostałe powiązania (logi, historia, tokeny, połączenia CRM, posty) obsługują
+klucze obce ON DELETE CASCADE / SET NULL w bazie.
+"""
+import time
+import logging
+from typing import Dict, Iterable, List
+from sqlalchemy import delete, update, select, func, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from app import db
+from app.models import User, UserGroup, UserGroupMember, EventRegistration, EmailQueue
+
+logger = logging.getLogger(__name__)
+
+
+class UserBulkDeletion:
+    """Usuwanie wielu użytkowników instrukcjami zbiorowymi"""
+
+    @staticmethod
+    def _matches(column, values: List, type_):
+        """column = ANY(:values) na PostgreSQL, IN (...) na innych bazach"""
+        if db.engine.dialect.name == 'postgresql':
+            return column == any_(bindparam(f'{column.key}_values', value=values, type_=ARRAY(type_)))
+        return column.in_(values)
+
+    @staticmethod
+    def _normalize_ids(user_ids: Iterable) -> List[int]:
+        ids = set()
+        for user_id in user_ids or []:
+            try:
+                ids.add(int(user_id))
+            except (TypeError, ValueError):
+                continue
+        return sorted(ids)
+
+    @staticmethod
+    def recount_group_members(group_ids: Iterable[int]):
+        """Przelicza member_count tylko dla podanych grup (jedna instrukcja UPDATE)"""
+        group_ids = sorted(set(group_ids))
+        if not group_ids:
+            return
+
+        active_members = select(func.count(UserGroupMember.id)).where(
+            UserGroupMember.group_id == UserGroup.id,
+            UserGroupMember.is_active == True
+        ).scalar_subquery()
+
+        db.session.execute(
+            update(UserGroup)
+            .where(UserBulkDeletion._matches(UserGroup.id, group_ids, db.Integer))
+            .values(member_count=active_members)
+            .execution_options(synchronize_session=False)
+        )
+
+    @classmethod
+    def delete_users(cls, user_ids: Iterable) -> Dict:
+        """
+        Usuwa użytkowników wraz z członkostwami w grupach, rejestracjami
+        i oczekującymi emailami w kolejce
+
+        Args:
+            user_ids: ID użytkowników do usunięcia
+
+        Returns:
+            Dict: deleted_count, deleted_users (id, email, club_member),
+                  memberships, registrations, queue_items, affected_groups,
+                  timings (sekundy na fazę)
+        """
+        ids = cls._normalize_ids(user_ids)
+        timings = {}
+        result = {
+            'deleted_count': 0,
+            'deleted_users': [],
+            'memberships': 0,
+            'registrations': 0,
+            'queue_items': 0,
+            'affected_groups': [],
+            'timings': timings
+        }
+        if not ids:
+            return result
+
+        def phase(name, started):
+            timings[name] = round(time.perf_counter() - started, 4)
+            return time.perf_counter()
+
+        total_started = started = time.perf_counter()
+        try:
+            users = db.session.query(User.id, User.email, User.club_member) \
+                .filter(cls._matches(User.id, ids, db.Integer)).all()
+            started = phase('load_users', started)
+            if not users:
+                return result
+
+            ids = [user.id for user in users]
+            emails = [user.email for user in users]
+
+            # 1. Członkostwa w grupach (zapamiętujemy grupy do przeliczenia)
+            removed_memberships = db.session.execute(
+                delete(UserGroupMember)
+                .where(cls._matches(UserGroupMember.user_id, ids, db.Integer))
+                .returning(UserGroupMember.group_id, UserGroupMember.is_active)
+                .execution_options(synchronize_session=False)
+            ).all()
+            affected_groups = {group_id for group_id, is_active in removed_memberships if is_active}
+            started = phase('memberships', started)
+
+            # 2. Rejestracje na wydarzenia
+            registrations = db.session.execute(
+                delete(EventRegistration)
+                .where(cls._matches(EventRegistration.user_id, ids, db.Integer))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            started = phase('registrations', started)
+
+            # 3. Oczekujące emaile w kolejce
+            queue_items = db.session.execute(
+                delete(EmailQueue)
+                .where(cls._matches(EmailQueue.recipient_email, emails, db.String), EmailQueue.status == 'pending')
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            started = phase('email_queue', started)
+
+            # 4. Użytkownicy (pozostałe powiązania - klucze obce w bazie)
+            deleted_count = db.session.execute(
+                delete(User)
+                .where(cls._matches(User.id, ids, db.Integer))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            started = phase('users', started)
+
+            # 5. Liczniki członków tylko dla dotkniętych grup
+            cls.recount_group_members(affected_groups)
+            started = phase('group_counts', started)
+
+            db.session.commit()
+            phase('commit', started)
+        except Exception:
+            db.session.rollback()
+            raise
+
+        # Obiekty w sesji mogą wskazywać na usunięte wiersze
+        db.session.expire_all()
+
+        timings['total'] = round(time.perf_counter() - total_started, 4)
+        result.update({
+            'deleted_count': deleted_count,
+            'deleted_users': [{'id': user.id, 'email': user.email, 'club_member': user.club_member} for user in users],
+            'memberships': len(removed_memberships),
+            'registrations': registrations,
+            'queue_items': queue_items,
+            'affected_groups': sorted(affected_groups)
+        })
+
+        logger.info(
+            f"🗑️ Bulk delete: {deleted_count} użytkowników, {len(removed_memberships)} członkostw, "
+            f"{registrations} rejestracji, {queue_items} emaili, {len(affected_groups)} grup w {timings['total']}s"
+        )
+        return result
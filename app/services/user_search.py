@@ -0,0 +1,118 @@
+"""
+User Search - wyszukiwanie użytkowników dla autouzupełniania w panelu admina
+
+Na PostgreSQL:
+- frazy od MIN_TRIGRAM_LENGTH znaków: ILIKE '%fraza%' na indeksach GIN pg_trgm
+  (ix_users_first_name_trgm, ix_users_email_trgm)
+- krótsze frazy: wyszukiwanie po prefiksie lower(kolumna) LIKE 'fraza%'
+  na indeksach btree text_pattern_ops (ix_users_first_name_prefix, ix_users_email_prefix)
+- ranking: dokładny email, prefiks emaila, prefiks imienia, potem similarity()
+- wyniki zawsze ograniczone (LIMIT), rejestracje na wydarzenia ładowane przez selectinload
+
+Na innych bazach (np. SQLite w testach) filtry i ranking działają tak samo, bez similarity().
+"""
+from typing import List, Optional
+from sqlalchemy import or_, func, case
+from sqlalchemy.orm import selectinload
+from app import db
+from app.models import User
+
+# Domyślna i maksymalna liczba podpowiedzi
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+
+
+class UserSearch:
+    """Budowanie zapytań wyszukiwania użytkowników z użyciem indeksów"""
+
+    # Trigramy nie pomagają dla krótszych fraz - wtedy wyszukiwanie po prefiksie
+    MIN_TRIGRAM_LENGTH = 3
+
+    @staticmethod
+    def is_postgres() -> bool:
+        return db.engine.dialect.name == 'postgresql'
+
+    @staticmethod
+    def _escape_like(term: str) -> str:
+        """Escapuje znaki specjalne LIKE, aby fraza była traktowana dosłownie"""
+        return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    @staticmethod
+    def normalize_term(term: Optional[str]) -> str:
+        return (term or '').strip().lower()
+
+    @staticmethod
+    def clamp_limit(limit: Optional[int]) -> int:
+        if not limit or limit < 1:
+            return DEFAULT_LIMIT
+        return min(limit, MAX_LIMIT)
+
+    @classmethod
+    def search_clause(cls, term: str):
+        """Warunek wyszukiwania po imieniu i emailu (prefiks dla krótkich fraz)"""
+        term = cls.normalize_term(term)
+        escaped = cls._escape_like(term)
+
+        if len(term) < cls.MIN_TRIGRAM_LENGTH:
+            prefix = f'{escaped}%'
+            return or_(
+                func.lower(User.email).like(prefix, escape='\\'),
+                func.lower(User.first_name).like(prefix, escape='\\')
+            )
+
+        pattern = f'%{escaped}%'
+        return or_(
+            User.email.ilike(pattern, escape='\\'),
+            User.first_name.ilike(pattern, escape='\\')
+        )
+
+    @classmethod
+    def rank_order(cls, term: str) -> List:
+        """Kolejność wyników: najlepsze dopasowania pierwsze"""
+        term = cls.normalize_term(term)
+        prefix = f'{cls._escape_like(term)}%'
+        email = func.lower(User.email)
+        first_name = func.lower(User.first_name)
+
+        order = [case(
+            (email == term, 0),
+            (email.like(prefix, escape='\\'), 1),
+            (first_name.like(prefix, escape='\\'), 2),
+            else_=3
+        )]
+        if cls.is_postgres() and len(term) >= cls.MIN_TRIGRAM_LENGTH:
+            order.append(func.greatest(
+                func.similarity(User.email, term),
+                func.similarity(User.first_name, term)
+            ).desc())
+        order.extend([func.length(User.email), User.id])
+        return order
+
+    @classmethod
+    def apply_search(cls, query, term: Optional[str]):
+        """Nakłada filtr wyszukiwania na zapytanie User (bez zmiany kolejności)"""
+        if not cls.normalize_term(term):
+            return query
+        return query.filter(cls.search_clause(term))
+
+    @classmethod
+    def search(cls, term: Optional[str], limit: Optional[int] = DEFAULT_LIMIT, query=None,
+               with_registrations: bool = False) -> List[User]:
+        """
+        Zwraca najlepiej dopasowanych użytkowników
+
+        Args:
+            term: Fraza (imię lub email)
+            limit: Maksymalna liczba wyników (ograniczona do MAX_LIMIT)
+            query: Zapytanie bazowe z dodatkowymi filtrami (domyślnie User.query)
+            with_registrations: Ładuje event_registrations dla wszystkich wyników jednym zapytaniem
+        """
+        term = cls.normalize_term(term)
+        if not term:
+            return []
+
+        query = (query if query is not None else User.query).filter(cls.search_clause(term))
+        if with_registrations:
+            query = query.options(selectinload(User.event_registrations))
+
+        return query.order_by(*cls.rank_order(term)).limit(cls.clamp_limit(limit)).all()
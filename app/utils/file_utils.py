@@ -101,6 +101,19 @@ def extract_filename_from_url(url):
         logging.error(f"Error extracting filename from URL {url}: {str(e)}")
         return None
 
+def delete_image_variants(variants):
+    """
+    Delete responsive image variant files listed in variants metadata
+    
+    Args:
+        variants (dict): BlogPost.featured_image_variants or BlogPostImage.variants
+    """
+    for items in (variants or {}).get('files', {}).values():
+        for item in items:
+            url = item.get('url') or ''
+            if url.startswith('/static/uploads/'):
+                delete_file_if_exists(url[len('/static/uploads/'):])
+
 def cleanup_blog_post_files(post):
     """
     Clean up all files associated with a blog post
@@ -141,6 +154,12 @@ def cleanup_blog_post_files(post):
                 if filename:
                     deleted_files['featured_image'] = delete_file_if_exists(filename)
         
+        # Delete responsive variants (app.services.image_pipeline)
+        delete_image_variants(post.featured_image_variants)
+        if hasattr(post, 'images') and post.images:
+            for image in post.images:
+                delete_image_variants(image.variants)
+        
         # Delete gallery images
         if hasattr(post, 'images') and post.images:
             for image in post.images:
@@ -3,7 +3,8 @@ Image utility functions for processing and resizing images
 """
 import os
 import logging
-from PIL import Image
+import tempfile
+from PIL import Image, ImageOps, features
 from werkzeug.utils import secure_filename
 
 logger = logging.getLogger(__name__)
@@ -156,5 +157,128 @@ def create_featured_thumbnail(post_id, image_filename, upload_folder):
         return {'success': False, 'error': str(e)}
 
 
+# Pillow format name and file extension for each responsive variant format
+VARIANT_FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+    'avif': ('AVIF', 'avif'),
+}
 
+# EXIF orientations that swap width and height
+_ROTATED_ORIENTATIONS = (5, 6, 7, 8)
 
+
+def supported_variant_formats(formats):
+    """
+    Filter requested variant formats to those the installed Pillow can write
+    
+    Args:
+        formats (list): Format names ('webp', 'jpeg', 'avif')
+    
+    Returns:
+        list: Supported format names in the requested order
+    """
+    supported = []
+    for name in formats:
+        if name not in VARIANT_FORMATS:
+            continue
+        if name in ('webp', 'avif') and not features.check(name):
+            logger.warning(f"⚠️ Pillow bez obsługi {name} - pomijam ten format")
+            continue
+        supported.append(name)
+    return supported
+
+
+def variant_filename(image_filename, width, extension):
+    """Variant filename, e.g. photo.jpg -> photo_800w.webp"""
+    return f"{os.path.splitext(image_filename)[0]}_{width}w.{extension}"
+
+
+def _save_atomic(img, path, pillow_format, **options):
+    """Write to a temporary file in the target directory and rename it into place"""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            img.save(handle, pillow_format, **options)
+        # mkstemp creates 0600 files - variants must be readable by the web server
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _flatten(img):
+    """RGB copy with transparency composited onto white (for JPEG)"""
+    if img.mode == 'RGBA':
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        return background
+    return img
+
+
+def render_responsive_variants(image_path, widths, formats, quality=82):
+    """
+    Render downscaled copies of an image in several widths and formats
+    
+    Runs in a worker process (no Flask or database access). Widths larger than
+    the original are skipped; the original width is used when none fits.
+    JPEG sources are decoded at reduced scale with Image.draft, each smaller width
+    is resized from the previous one, and every file is written atomically.
+    
+    Args:
+        image_path (str): Path to the original image
+        widths (list): Target widths in pixels
+        formats (list): Format names from VARIANT_FORMATS
+        quality (int): Output quality (1-100)
+    
+    Returns:
+        dict: width, height of the original and variants as
+              {format: [{'width', 'height', 'filename'}]} (largest first)
+    """
+    directory = os.path.dirname(image_path)
+    image_filename = os.path.basename(image_path)
+    
+    with Image.open(image_path) as img:
+        orientation = img.getexif().get(274, 1)
+        original_width, original_height = img.size
+        if orientation in _ROTATED_ORIENTATIONS:
+            original_width, original_height = original_height, original_width
+        
+        targets = sorted({width for width in widths if 0 < width <= original_width}, reverse=True) or [original_width]
+        
+        if img.format == 'JPEG':
+            # Decode at the smallest DCT scale that still covers the largest target
+            scale = targets[0] / original_width
+            draft_size = (int(original_width * scale), int(original_height * scale))
+            if orientation in _ROTATED_ORIENTATIONS:
+                draft_size = draft_size[::-1]
+            img.draft('RGB', draft_size)
+        
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if img.has_transparency_data else 'RGB')
+        
+        variants = {name: [] for name in formats}
+        current = img
+        for width in targets:
+            height = max(1, round(original_height * width / original_width))
+            if current.size != (width, height):
+                current = current.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+            
+            for name in formats:
+                pillow_format, extension = VARIANT_FORMATS[name]
+                filename = variant_filename(image_filename, width, extension)
+                if name == 'jpeg':
+                    _save_atomic(_flatten(current), os.path.join(directory, filename), pillow_format,
+                                 quality=quality, optimize=True, progressive=True)
+                else:
+                    _save_atomic(current, os.path.join(directory, filename), pillow_format, quality=quality)
+                variants[name].append({'width': width, 'height': height, 'filename': filename})
+    
+    return {
+        'width': original_width,
+        'height': original_height,
+        'variants': variants
+    }
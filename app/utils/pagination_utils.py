@@ -0,0 +1,206 @@
+"""
+Keyset pagination for admin listings
+
+Zamiast Flask-SQLAlchemy paginate() (OFFSET + dokładny COUNT(*) na każdej stronie):
+- stronicowanie po (kolumna sortowania, id) z kursorem - koszt strony nie zależy od jej głębokości
+- numer strony (OFFSET) pozostaje dostępny dla zgodności z istniejącymi widokami
+- liczba wyników szacowana: pg_class.reltuples dla zapytań bez filtrów,
+  COUNT ograniczony do COUNT_CAP dla zapytań z filtrami
+- opcjonalne ładowanie relacji (selectinload) dla całej strony
+"""
+import json
+import base64
+from datetime import datetime, date
+from typing import Any, List, Optional, Sequence, Tuple
+from sqlalchemy import func, select, text, tuple_
+from app.models import db
+
+# Górna granica liczenia wyników zapytań z filtrami
+COUNT_CAP = 10000
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'Nieobsługiwany typ w kursorze: {type(value)}')
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Kursor wskazujący ostatni wiersz strony"""
+    payload = json.dumps([sort_value, row_id], default=_json_default, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str, sort_column) -> Optional[Tuple[Any, int]]:
+    """Dekoduje kursor; zwraca None dla nieprawidłowej wartości"""
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        if sort_value is not None and isinstance(sort_column.type, db.DateTime):
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        return None
+
+
+def ordered(query, sort_column, id_column, descending: bool = True):
+    """Kolejność (sort DESC/ASC NULLS LAST, id) - zgodna z kursorem"""
+    if descending:
+        return query.order_by(sort_column.desc().nulls_last(), id_column.desc())
+    return query.order_by(sort_column.asc().nulls_last(), id_column.asc())
+
+
+def after_cursor(query, sort_column, id_column, cursor: Tuple[Any, int], descending: bool = True):
+    """
+    Ogranicza zapytanie do wierszy po kursorze
+
+    Kursor z wartością sortowania obejmuje tylko wiersze z wartością (porównanie
+    wierszowe (sort, id) korzysta z indeksu); NULL-e są na końcu i mają własną fazę -
+    kursor z sort_value=None. Przejście między fazami obsługuje paginate_keyset().
+    """
+    sort_value, last_id = cursor
+
+    if sort_value is None:
+        id_after = id_column < last_id if descending else id_column > last_id
+        return query.filter(sort_column.is_(None), id_after)
+
+    key = tuple_(sort_column, id_column)
+    key_after = key < (sort_value, last_id) if descending else key > (sort_value, last_id)
+    return query.filter(sort_column.isnot(None), key_after)
+
+
+def estimated_table_rows(table_name: str) -> Optional[int]:
+    """Szacowana liczba wierszy tabeli z pg_class.reltuples (None poza PostgreSQL lub bez ANALYZE)"""
+    if db.engine.dialect.name != 'postgresql':
+        return None
+    estimate = db.session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {'table_name': table_name}
+    ).scalar()
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+def capped_count(query, id_column, cap: int = COUNT_CAP) -> Tuple[int, bool]:
+    """
+    Liczy wyniki do górnej granicy zamiast pełnego COUNT(*)
+
+    Returns:
+        Tuple: (count, is_exact) - is_exact=False gdy osiągnięto granicę
+    """
+    limited = query.order_by(None).with_entities(id_column).limit(cap + 1).subquery()
+    count = db.session.execute(select(func.count()).select_from(limited)).scalar() or 0
+    if count > cap:
+        return cap, False
+    return count, True
+
+
+def estimated_count(query, id_column, cap: int = COUNT_CAP) -> Tuple[int, bool]:
+    """
+    Liczba wyników bez pełnego skanu
+
+    Bez filtrów: pg_class.reltuples (dokładny COUNT tylko dla małych tabel).
+    Z filtrami: COUNT ograniczony do `cap`.
+
+    Returns:
+        Tuple: (count, is_exact)
+    """
+    if query.whereclause is None:
+        estimate = estimated_table_rows(id_column.table.name)
+        if estimate is not None and estimate > cap:
+            return estimate, False
+    return capped_count(query, id_column, cap)
+
+
+class KeysetPage:
+    """Strona wyników z metadanymi zgodnymi z dotychczasowym formatem 'pagination'"""
+
+    def __init__(self, items: List, page: int, per_page: int, has_next: bool,
+                 next_cursor: Optional[str], total: Optional[int], total_is_exact: bool):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.has_next = has_next
+        self.next_cursor = next_cursor
+        self.total = total
+        self.total_is_exact = total_is_exact
+
+    @property
+    def pages(self) -> int:
+        if not self.total or not self.per_page:
+            return 1
+        return max(1, -(-self.total // self.per_page))
+
+    @property
+    def has_prev(self) -> bool:
+        return self.page > 1
+
+    def to_dict(self) -> dict:
+        return {
+            'page': self.page,
+            'pages': self.pages,
+            'per_page': self.per_page,
+            'total': self.total,
+            'total_is_exact': self.total_is_exact,
+            'has_next': self.has_next,
+            'has_prev': self.has_prev,
+            'next_num': self.page + 1 if self.has_next else None,
+            'prev_num': self.page - 1 if self.has_prev else None,
+            'next_cursor': self.next_cursor
+        }
+
+
+def paginate_keyset(query, sort_column, id_column, per_page: int = 20, cursor: str = None,
+                    page: int = 1, descending: bool = True, options: Sequence = (),
+                    count: str = 'estimate') -> KeysetPage:
+    """
+    Pobiera stronę wyników
+
+    Args:
+        query: Zapytanie bazowe (z filtrami, bez order_by)
+        sort_column: Kolumna sortowania (np. Model.created_at)
+        id_column: Kolumna unikalna rozstrzygająca remisy (np. Model.id)
+        per_page: Liczba wyników na stronę
+        cursor: next_cursor z poprzedniej strony (ma pierwszeństwo przed page)
+        page: Numer strony (OFFSET) - gdy brak kursora
+        descending: Kierunek sortowania
+        options: Opcje ładowania relacji (np. selectinload(Model.rel))
+        count: 'estimate' (domyślnie), 'exact' lub 'none'
+    """
+    per_page = max(1, per_page)
+    page = max(1, page or 1)
+
+    if count == 'exact':
+        total, total_is_exact = query.order_by(None).count(), True
+    elif count == 'estimate':
+        total, total_is_exact = estimated_count(query, id_column)
+    else:
+        total, total_is_exact = None, False
+
+    page_query = ordered(query, sort_column, id_column, descending)
+    if options:
+        page_query = page_query.options(*options)
+    base_query = page_query
+
+    decoded = decode_cursor(cursor, sort_column) if cursor else None
+    if decoded:
+        page_query = after_cursor(page_query, sort_column, id_column, decoded, descending)
+    elif page > 1 and not cursor:
+        page_query = page_query.offset((page - 1) * per_page)
+
+    # Jeden wiersz więcej, aby wiedzieć czy istnieje następna strona
+    rows = page_query.limit(per_page + 1).all()
+
+    # Koniec wierszy z wartością sortowania - strona dobiera wiersze z NULL-em
+    if decoded and decoded[0] is not None and len(rows) <= per_page:
+        rows += base_query.filter(sort_column.is_(None)).limit(per_page + 1 - len(rows)).all()
+
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+
+    next_cursor = None
+    if has_next and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return KeysetPage(rows, page, per_page, has_next, next_cursor, total, total_is_exact)
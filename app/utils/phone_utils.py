@@ -0,0 +1,98 @@
+"""
+Phone number normalisation for CRM (E.164-style, default country +48)
+
+normalize_phone() handles single values, normalize_phone_series() applies the
+same rules to a whole pandas Series without a Python loop. Both must stay in
+sync - the result is stored in Contact.phone_normalized and used for dedupe
+and blacklist matching.
+"""
+import re
+from typing import Optional
+
+DEFAULT_COUNTRY_CODE = '48'
+
+# Local (national) number length for the default country
+NATIONAL_NUMBER_LENGTH = 9
+
+# E.164 limits (digits after '+')
+MIN_DIGITS = 7
+MAX_DIGITS = 15
+
+_NON_DIGITS = re.compile(r'\D')
+
+
+def normalize_phone(phone, country_code: str = DEFAULT_COUNTRY_CODE) -> Optional[str]:
+    """
+    Normalise phone number to '+<country><number>'
+
+    Examples (country_code='48'):
+        '600 123 456'      -> '+48600123456'
+        '0600-123-456'     -> '+48600123456'
+        '48600123456'      -> '+48600123456'
+        '0048 600 123 456' -> '+48600123456'
+        '+44 20 7946 0958' -> '+442079460958'
+
+    Returns:
+        Normalised number or None when the value has no usable digits
+    """
+    if phone is None:
+        return None
+    raw = str(phone).strip()
+    if raw.endswith('.0'):
+        # Numbers read from Excel as floats
+        raw = raw[:-2]
+
+    has_plus = raw.startswith('+')
+    digits = _NON_DIGITS.sub('', raw)
+
+    if not has_plus:
+        if digits.startswith('00'):
+            digits = digits[2:]
+        elif len(digits) == NATIONAL_NUMBER_LENGTH + 1 and digits.startswith('0'):
+            digits = country_code + digits[1:]
+        elif len(digits) == NATIONAL_NUMBER_LENGTH:
+            digits = country_code + digits
+        elif not digits.startswith(country_code):
+            digits = country_code + digits
+
+    if not MIN_DIGITS <= len(digits) <= MAX_DIGITS:
+        return None
+    return '+' + digits
+
+
+def normalize_phone_series(phones, country_code: str = DEFAULT_COUNTRY_CODE):
+    """
+    Vectorised normalize_phone() for a pandas Series
+
+    Returns:
+        Series of normalised numbers (None where the value is not usable)
+    """
+    import numpy as np
+    import pandas as pd
+
+    # NaN/None become 'nan'/'None' here and end up without digits -> None
+    raw = phones.astype(str).str.strip()
+    raw = raw.str.replace(r'\.0$', '', regex=True)
+
+    has_plus = raw.str.startswith('+')
+    digits = raw.str.replace(r'\D', '', regex=True)
+    length = digits.str.len()
+
+    starts_00 = ~has_plus & digits.str.startswith('00')
+    trunk_prefix = ~has_plus & ~starts_00 & (length == NATIONAL_NUMBER_LENGTH + 1) & digits.str.startswith('0')
+    local = ~has_plus & ~starts_00 & ~trunk_prefix & (length == NATIONAL_NUMBER_LENGTH)
+    missing_country = ~has_plus & ~starts_00 & ~trunk_prefix & ~local & ~digits.str.startswith(country_code)
+
+    result = pd.Series(
+        np.select(
+            [starts_00, trunk_prefix, local | missing_country],
+            [digits.str[2:], country_code + digits.str[1:], country_code + digits],
+            default=digits
+        ),
+        index=phones.index,
+        dtype='object'
+    )
+
+    result_length = result.str.len()
+    valid = (result_length >= MIN_DIGITS) & (result_length <= MAX_DIGITS)
+    return ('+' + result).where(valid, None)
@@ -330,6 +330,9 @@ class SEOManager:
                 db.session.add(seo)
             
             db.session.commit()
+            
+            from app.services.seo_cache import SEOCache
+            SEOCache.invalidate()
             return seo
             
         except Exception as e:
@@ -0,0 +1,318 @@
+"""
+Static assets - fingerprinting, prekompresja i manifest plików static/
+
+Krok budowania (przy wdrożeniu, po zmianie CSS/JS/obrazów):
+
+    python -m app.utils.static_assets [--static-dir static] [--clean]
+
+- każdy plik static/ (poza uploads/ i dist/) kopiowany do static/dist/ pod nazwą
+  z hashem treści (css/style.css -> css/style.3f2a1b9c.css)
+- odwołania url(...) w CSS przepisywane na nazwy z hashem (CSS budowany po plikach,
+  do których się odwołuje)
+- dla plików tekstowych obok kopii z hashem powstają .gz i .br (brotli opcjonalne),
+  tylko gdy są wyraźnie mniejsze
+- static/dist/manifest.json: ścieżka źródłowa -> ścieżka z hashem i dostępne kodowania
+
+W aplikacji asset_url() (zamiennik url_for('static', ...)) zwraca adres /assets/<hash>
+serwowany z nagłówkiem Cache-Control immutable i w kodowaniu z Accept-Encoding.
+Bez manifestu (np. w developmencie) asset_url() działa jak url_for('static', ...).
+
+DirectoryIndex zastępuje sprawdzanie kolejnych katalogów przy /uploads/<plik>:
+nazwy plików trzymane w pamięci, odświeżane po zmianie mtime katalogów.
+"""
+import os
+import re
+import gzip
+import json
+import shutil
+import hashlib
+import argparse
+import time
+import posixpath
+import threading
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli jest opcjonalne - bez niego tylko .gz
+    brotli = None
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+SKIP_DIRS = {'uploads', DIST_DIR}
+SKIP_FILES = {'.DS_Store'}
+HASH_LENGTH = 8
+
+# Pliki tekstowe, dla których opłaca się prekompresja
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.xml', '.html', '.ico'}
+# Kompresja zapisywana tylko, gdy plik jest mniejszy co najmniej o 10%
+MIN_COMPRESSION_RATIO = 0.9
+
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+# Co ile sekund sprawdzać, czy manifest lub katalog się zmienił
+CHECK_INTERVAL = 2.0
+
+# Pliki z hashem w nazwie nie zmieniają treści - cache przeglądarki na rok
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def fingerprint(relative_path: str, content: bytes) -> str:
+    """css/style.css + treść -> css/style.<hash>.css"""
+    digest = hashlib.md5(content, usedforsecurity=False).hexdigest()[:HASH_LENGTH]
+    base, extension = posixpath.splitext(relative_path)
+    return f'{base}.{digest}{extension}'
+
+
+def _rewrite_css_urls(relative_path: str, content: bytes, manifest: Dict[str, Dict]) -> bytes:
+    """Zamienia url(...) wskazujące na pliki z manifestu na ich nazwy z hashem"""
+    directory = posixpath.dirname(relative_path)
+
+    def replace(match):
+        quote, reference = match.group(1), match.group(2).strip()
+        if reference.startswith(('data:', 'http:', 'https:', '//', '#', '/')):
+            return match.group(0)
+        path, separator, suffix = reference, '', ''
+        marker = re.search(r'[?#]', reference)
+        if marker:
+            path, separator, suffix = reference[:marker.start()], marker.group(0), reference[marker.end():]
+        target = posixpath.normpath(posixpath.join(directory, path))
+        entry = manifest.get(target)
+        if not entry:
+            return match.group(0)
+        hashed = posixpath.relpath(entry['path'], directory or '.')
+        return f'url({quote}{hashed}{separator}{suffix}{quote})'
+
+    return _CSS_URL.sub(replace, content.decode('utf-8')).encode('utf-8')
+
+
+def _write_compressed(path: str, content: bytes) -> list:
+    """Zapisuje .gz / .br obok pliku; zwraca listę dostępnych kodowań"""
+    encodings = []
+    candidates = [('gzip', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        candidates.insert(0, ('br', lambda data: brotli.compress(data, quality=11)))
+
+    for encoding, compress in candidates:
+        compressed = compress(content)
+        if len(compressed) <= len(content) * MIN_COMPRESSION_RATIO:
+            with open(path + ENCODING_SUFFIXES[encoding], 'wb') as handle:
+                handle.write(compressed)
+            encodings.append(encoding)
+    return encodings
+
+
+def build(static_dir: str, clean: bool = False) -> Dict[str, Dict]:
+    """
+    Buduje static/dist/ i manifest
+
+    Returns:
+        Manifest: {ścieżka źródłowa: {'path', 'size', 'encodings'}}
+    """
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    if clean and os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+
+    sources = []
+    for root, dirs, files in os.walk(static_dir):
+        relative_root = os.path.relpath(root, static_dir)
+        if relative_root == '.':
+            dirs[:] = [name for name in dirs if name not in SKIP_DIRS]
+        for name in files:
+            if name in SKIP_FILES:
+                continue
+            relative = posixpath.normpath(posixpath.join(relative_root.replace(os.sep, '/'), name))
+            sources.append(relative)
+
+    # CSS na końcu - odwołania url(...) muszą wskazywać już znane nazwy z hashem
+    sources.sort(key=lambda path: (path.endswith('.css'), path))
+
+    manifest = {}
+    for relative in sources:
+        with open(os.path.join(static_dir, relative), 'rb') as handle:
+            content = handle.read()
+        if relative.endswith('.css'):
+            content = _rewrite_css_urls(relative, content, manifest)
+
+        hashed = fingerprint(relative, content)
+        target = os.path.join(dist_dir, hashed)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as handle:
+            handle.write(content)
+
+        encodings = []
+        if posixpath.splitext(relative)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+            encodings = _write_compressed(target, content)
+
+        manifest[relative] = {'path': hashed, 'size': len(content), 'encodings': encodings}
+
+    temp_path = os.path.join(dist_dir, MANIFEST_NAME + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as handle:
+        json.dump(manifest, handle, indent=1, sort_keys=True)
+    os.replace(temp_path, os.path.join(dist_dir, MANIFEST_NAME))
+    return manifest
+
+
+class AssetManifest:
+    """Manifest wczytywany leniwie i przeładowywany po zmianie pliku (nowy build)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self._entries: Dict[str, Dict] = {}
+        self._by_hashed: Dict[str, Dict] = {}
+
+    def _refresh(self, static_dir: str):
+        path = os.path.join(static_dir, DIST_DIR, MANIFEST_NAME)
+        now = time.monotonic()
+        if path == self._path and now - self._checked_at < CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+        if path == self._path and mtime == self._mtime:
+            return
+
+        entries = {}
+        if mtime is not None:
+            with open(path, encoding='utf-8') as handle:
+                entries = json.load(handle)
+        with self._lock:
+            self._path = path
+            self._mtime = mtime
+            self._entries = entries
+            self._by_hashed = {entry['path']: entry for entry in entries.values()}
+
+    def lookup(self, static_dir: str, filename: str) -> Optional[Dict]:
+        """Wpis dla ścieżki źródłowej (css/style.css)"""
+        self._refresh(static_dir)
+        return self._entries.get(filename)
+
+    def lookup_hashed(self, static_dir: str, hashed: str) -> Optional[Dict]:
+        """Wpis dla ścieżki z hashem (css/style.3f2a1b9c.css)"""
+        self._refresh(static_dir)
+        return self._by_hashed.get(hashed)
+
+
+manifest = AssetManifest()
+
+
+class DirectoryIndex:
+    """Nazwy plików w katalogach (bez podkatalogów) odświeżane po zmianie mtime katalogu"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._state: Dict[str, Tuple[Optional[float], frozenset]] = {}
+
+    @staticmethod
+    def _scan(directory: str) -> Tuple[Optional[float], frozenset]:
+        try:
+            mtime = os.stat(directory).st_mtime
+            names = frozenset(entry.name for entry in os.scandir(directory) if entry.is_file())
+        except OSError:
+            return None, frozenset()
+        return mtime, names
+
+    def _refresh(self, directories: List[str]):
+        now = time.monotonic()
+        if all(directory in self._state for directory in directories) and now - self._checked_at < CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        for directory in directories:
+            try:
+                mtime = os.stat(directory).st_mtime
+            except OSError:
+                mtime = None
+            cached = self._state.get(directory)
+            if cached is None or cached[0] != mtime:
+                scanned = self._scan(directory)
+                with self._lock:
+                    self._state[directory] = scanned
+
+    def find(self, candidates: List[Tuple[str, str]]) -> Optional[Tuple[str, str]]:
+        """
+        Pierwszy istniejący plik z listy (katalog, nazwa) - bez dostępu do dysku przy braku
+
+        Returns:
+            (katalog, nazwa) lub None
+        """
+        self._refresh(list(dict.fromkeys(directory for directory, _ in candidates)))
+        for directory, name in candidates:
+            if name in self._state.get(directory, (None, frozenset()))[1]:
+                return directory, name
+        return None
+
+
+def static_folder() -> str:
+    from flask import current_app
+    return current_app.static_folder
+
+
+def asset_url(endpoint: str = 'static', filename: Optional[str] = None, **values) -> str:
+    """
+    Zamiennik url_for('static', filename=...) zwracający adres pliku z hashem
+
+    Dla innych endpointów lub plików spoza manifestu działa jak url_for.
+    """
+    from flask import url_for
+    if endpoint == 'static' and filename:
+        entry = manifest.lookup(static_folder(), filename)
+        if entry:
+            return url_for('assets.serve_asset', filename=entry['path'], **values)
+    if filename is not None:
+        values['filename'] = filename
+    return url_for(endpoint, **values)
+
+
+def send_asset(filename: str):
+    """
+    Odpowiedź dla pliku z hashem: wariant .br / .gz wg Accept-Encoding, cache immutable
+
+    Abort 404 dla plików spoza manifestu.
+    """
+    import mimetypes
+    from flask import abort, request, send_from_directory
+
+    static_dir = static_folder()
+    entry = manifest.lookup_hashed(static_dir, filename)
+    if not entry:
+        abort(404)
+
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    encoding = next((name for name in ('br', 'gzip')
+                     if name in entry['encodings'] and request.accept_encodings[name] > 0), None)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    if encoding:
+        response = send_from_directory(dist_dir, filename + ENCODING_SUFFIXES[encoding], mimetype=mimetype)
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response = send_from_directory(dist_dir, filename, mimetype=mimetype)
+    if entry['encodings']:
+        response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+def main():
+    default_static = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'static')
+    parser = argparse.ArgumentParser(description='Fingerprinting i prekompresja plików static/')
+    parser.add_argument('--static-dir', default=default_static, help='Katalog static (domyślnie static/ projektu)')
+    parser.add_argument('--clean', action='store_true', help='Usuń poprzedni build (static/dist) przed budowaniem')
+    args = parser.parse_args()
+
+    result = build(args.static_dir, clean=args.clean)
+    compressed = sum(1 for entry in result.values() if entry['encodings'])
+    print(f"✅ Zbudowano {len(result)} plików ({compressed} z prekompresją"
+          f"{'' if brotli is not None else ', bez brotli'}) -> {os.path.join(args.static_dir, DIST_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
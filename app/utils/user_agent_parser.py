@@ -2,49 +2,103 @@
 User-Agent parser for extracting browser and OS information
 """
 import re
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+# Browser patterns (checked in order, first match wins)
+BROWSER_PATTERNS = (
+    ('Chrome', r'Chrome/(\d+\.\d+)'),
+    ('Firefox', r'Firefox/(\d+\.\d+)'),
+    ('Safari', r'Safari/(\d+\.\d+)'),
+    ('Edge', r'Edg/(\d+\.\d+)'),
+    ('Opera', r'Opera/(\d+\.\d+)'),
+    ('Internet Explorer', r'MSIE (\d+\.\d+)'),
+    ('Internet Explorer', r'Trident/.*rv:(\d+\.\d+)'),
+)
+
+# OS patterns (checked in order, first match wins)
+OS_PATTERNS = (
+    ('Windows 10', r'Windows NT 10\.0'),
+    ('Windows 8.1', r'Windows NT 6\.3'),
+    ('Windows 8', r'Windows NT 6\.2'),
+    ('Windows 7', r'Windows NT 6\.1'),
+    ('Windows Vista', r'Windows NT 6\.0'),
+    ('Windows XP', r'Windows NT 5\.1'),
+    ('macOS', r'Mac OS X (\d+[._]\d+)'),
+    ('iOS', r'iPhone OS (\d+[._]\d+)'),
+    ('iOS', r'iPad.*OS (\d+[._]\d+)'),
+    ('Android', r'Android (\d+\.\d+)'),
+    ('Linux', r'Linux'),
+    ('Ubuntu', r'Ubuntu'),
+    ('Debian', r'Debian'),
+    ('CentOS', r'CentOS'),
+    ('Red Hat', r'Red Hat'),
+)
+
+# Compiled once at import time
+_BROWSER_RULES = tuple((name, re.compile(pattern, re.IGNORECASE)) for name, pattern in BROWSER_PATTERNS)
+_OS_RULES = tuple((name, re.compile(pattern, re.IGNORECASE)) for name, pattern in OS_PATTERNS)
+
+# Most traffic comes from a few hundred distinct User-Agent strings
+CACHE_SIZE = 1024
+
+
+def _parse_user_agent(user_agent: str) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+    """Match User-Agent against the compiled rule table (uncached)"""
+    browser = None
+    browser_version = None
+    for browser_name, regex in _BROWSER_RULES:
+        match = regex.search(user_agent)
+        if match:
+            browser = browser_name
+            browser_version = match.group(1)
+            break
+
+    os = None
+    os_version = None
+    for os_name, regex in _OS_RULES:
+        match = regex.search(user_agent)
+        if match:
+            os = os_name
+            if match.groups():
+                os_version = match.group(1).replace('_', '.')
+            break
+
+    return browser, browser_version, os, os_version
+
+
+_parse_user_agent_cached = lru_cache(maxsize=CACHE_SIZE)(_parse_user_agent)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _browser_display_name(browser: Optional[str], version: Optional[str]) -> str:
+    if not browser:
+        return 'Nieznana przeglądarka'
+    if version:
+        return f'{browser} {version}'
+    return browser
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _os_display_name(os: Optional[str], version: Optional[str]) -> str:
+    if not os:
+        return 'Nieznany system'
+    if version:
+        return f'{os} {version}'
+    return os
+
 
 class UserAgentParser:
-    """Simple User-Agent parser for browser and OS detection"""
-    
-    # Browser patterns
-    BROWSER_PATTERNS = {
-        'Chrome': r'Chrome/(\d+\.\d+)',
-        'Firefox': r'Firefox/(\d+\.\d+)',
-        'Safari': r'Safari/(\d+\.\d+)',
-        'Edge': r'Edg/(\d+\.\d+)',
-        'Opera': r'Opera/(\d+\.\d+)',
-        'Internet Explorer': r'MSIE (\d+\.\d+)',
-        'Internet Explorer': r'Trident/.*rv:(\d+\.\d+)'
-    }
-    
-    # OS patterns
-    OS_PATTERNS = {
-        'Windows 10': r'Windows NT 10\.0',
-        'Windows 8.1': r'Windows NT 6\.3',
-        'Windows 8': r'Windows NT 6\.2',
-        'Windows 7': r'Windows NT 6\.1',
-        'Windows Vista': r'Windows NT 6\.0',
-        'Windows XP': r'Windows NT 5\.1',
-        'macOS': r'Mac OS X (\d+[._]\d+)',
-        'iOS': r'iPhone OS (\d+[._]\d+)',
-        'iOS': r'iPad.*OS (\d+[._]\d+)',
-        'Android': r'Android (\d+\.\d+)',
-        'Linux': r'Linux',
-        'Ubuntu': r'Ubuntu',
-        'Debian': r'Debian',
-        'CentOS': r'CentOS',
-        'Red Hat': r'Red Hat'
-    }
-    
+    """Simple User-Agent parser for browser and OS detection (memoised per User-Agent string)"""
+
     @classmethod
     def parse(cls, user_agent: str) -> Dict[str, Optional[str]]:
         """
         Parse User-Agent string and extract browser and OS information
-        
+
         Args:
             user_agent: User-Agent string from request
-            
+
         Returns:
             Dict with browser, browser_version, os, os_version
         """
@@ -55,53 +109,88 @@ class UserAgentParser:
                 'os': None,
                 'os_version': None
             }
-        
-        user_agent = user_agent.strip()
-        
-        # Parse browser
-        browser = None
-        browser_version = None
-        for browser_name, pattern in cls.BROWSER_PATTERNS.items():
-            match = re.search(pattern, user_agent, re.IGNORECASE)
-            if match:
-                browser = browser_name
-                browser_version = match.group(1)
-                break
-        
-        # Parse OS
-        os = None
-        os_version = None
-        for os_name, pattern in cls.OS_PATTERNS.items():
-            match = re.search(pattern, user_agent, re.IGNORECASE)
-            if match:
-                os = os_name
-                if match.groups():
-                    os_version = match.group(1).replace('_', '.')
-                break
-        
+
+        browser, browser_version, os, os_version = _parse_user_agent_cached(user_agent.strip())
+
         return {
             'browser': browser,
             'browser_version': browser_version,
             'os': os,
             'os_version': os_version
         }
-    
+
+    @classmethod
+    def get_display_names(cls, user_agent: str) -> Tuple[str, str]:
+        """Parse User-Agent and return formatted (browser, operating system) names"""
+        parsed = cls.parse(user_agent)
+        return (
+            _browser_display_name(parsed['browser'], parsed['browser_version']),
+            _os_display_name(parsed['os'], parsed['os_version'])
+        )
+
     @classmethod
     def get_browser_display_name(cls, browser: str, version: str = None) -> str:
         """Get formatted browser name with version"""
-        if not browser:
-            return 'Nieznana przeglądarka'
-        
-        if version:
-            return f'{browser} {version}'
-        return browser
-    
+        return _browser_display_name(browser, version)
+
     @classmethod
     def get_os_display_name(cls, os: str, version: str = None) -> str:
         """Get formatted OS name with version"""
-        if not os:
-            return 'Nieznany system'
-        
-        if version:
-            return f'{os} {version}'
-        return os
+        return _os_display_name(os, version)
+
+    @classmethod
+    def cache_info(cls) -> Dict[str, int]:
+        """Get parse cache statistics"""
+        info = _parse_user_agent_cached.cache_info()
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_size': info.maxsize
+        }
+
+    @classmethod
+    def clear_cache(cls):
+        """Clear parse and display name caches"""
+        _parse_user_agent_cached.cache_clear()
+        _browser_display_name.cache_clear()
+        _os_display_name.cache_clear()
+
+
+if __name__ == "__main__":
+    """Micro-benchmark: parses per second without and with the cache"""
+    import time
+
+    sample_agents = [
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+        'Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Mobile/15E148 Safari/604.1',
+        'Mozilla/5.0 (Linux; Android 13; SM-S911B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Mobile Safari/537.36',
+        'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0',
+        'Mozilla/5.0 (Windows NT 6.1; Trident/7.0; rv:11.0) like Gecko',
+    ] * 50
+    iterations = 20
+    total = len(sample_agents) * iterations
+
+    def uncached():
+        # Previous behaviour: pattern strings searched on every call, no memoisation
+        for user_agent in sample_agents:
+            for _, pattern in BROWSER_PATTERNS:
+                if re.search(pattern, user_agent, re.IGNORECASE):
+                    break
+            for _, pattern in OS_PATTERNS:
+                if re.search(pattern, user_agent, re.IGNORECASE):
+                    break
+
+    def cached():
+        for user_agent in sample_agents:
+            UserAgentParser.get_display_names(user_agent)
+
+    for label, func in (('bez cache', uncached), ('z cache', cached)):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        print(f"{label:>10}: {total / elapsed:,.0f} parsowań/s")
+
+    print(f"Cache: {UserAgentParser.cache_info()}")
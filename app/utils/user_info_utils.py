@@ -4,7 +4,6 @@ User information collection utilities
 import re
 import requests
 from flask import request
-from user_agents import parse
 from .user_agent_parser import UserAgentParser
 from .ip_geolocation import IPGeolocation
 
@@ -13,9 +12,8 @@ def get_user_info():
     user_agent_string = request.headers.get('User-Agent', '')
     ip_address = get_client_ip()
     
-    # Parse user agent with our custom parser
-    ua_parser = UserAgentParser()
-    parsed_ua = ua_parser.parse(user_agent_string)
+    # Parse user agent with our custom parser (memoised per User-Agent string)
+    browser, operating_system = UserAgentParser.get_display_names(user_agent_string)
     
     # Get location from IP
     location_info = IPGeolocation.get_location(ip_address)
@@ -23,8 +21,8 @@ def get_user_info():
     return {
         'ip_address': ip_address,
         'user_agent': user_agent_string,
-        'browser': ua_parser.get_browser_display_name(parsed_ua['browser'], parsed_ua['browser_version']),
-        'operating_system': ua_parser.get_os_display_name(parsed_ua['os'], parsed_ua['os_version']),
+        'browser': browser,
+        'operating_system': operating_system,
         'location_country': location_info.get('country', ''),
         'location_city': location_info.get('city', '')
     }
@@ -63,7 +63,8 @@ class BlogCategoriesManager {
 
     async loadCategories(page = 1, perPage = 10) {
         try {
-            const response = await fetch(`/api/blog/admin/categories?page=${page}&per_page=${perPage}`, {
+            const params = SimplePagination.applyCursor(new URLSearchParams({page: page, per_page: perPage}), page);
+            const response = await fetch(`/api/blog/admin/categories?${params}`, {
                 credentials: 'include'
             });
             const data = await response.json();
@@ -108,7 +109,7 @@ class BlogCategoriesManager {
                 
                 // Set callbacks
                 paginationContainer.paginationInstance.setPageChangeCallback((page) => {
-                    this.loadCategories(page);
+                    this.loadCategories(page, paginationContainer.paginationInstance.getPerPage());
                 });
                 
                 paginationContainer.paginationInstance.setPerPageChangeCallback((newPage, perPage) => {
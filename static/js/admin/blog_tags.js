@@ -64,7 +64,8 @@ class BlogTagsManager {
 
     async loadTags(page = 1, perPage = 10) {
         try {
-            const response = await fetch(`/api/blog/tags?page=${page}&per_page=${perPage}`);
+            const params = SimplePagination.applyCursor(new URLSearchParams({page: page, per_page: perPage}), page);
+            const response = await fetch(`/api/blog/tags?${params}`);
             const data = await response.json();
             
             if (data.success) {
@@ -107,7 +108,7 @@ class BlogTagsManager {
                 
                 // Set callbacks
                 paginationContainer.paginationInstance.setPageChangeCallback((page) => {
-                    this.loadTags(page);
+                    this.loadTags(page, paginationContainer.paginationInstance.getPerPage());
                 });
                 
                 paginationContainer.paginationInstance.setPerPageChangeCallback((newPage, perPage) => {
@@ -83,6 +83,7 @@ function loadLogs() {
         per_page: currentPerPage,
         ...currentFilters
     });
+    SimplePagination.applyCursor(params, currentPage);
     
     fetch(`/api/logs?${params}`)
         .then(response => response.json())
@@ -130,6 +130,9 @@ function loadStats() {
 
 // Load queue
 function loadQueue(filter) {
+    if (filter !== currentFilter) {
+        currentPage = 1; // Page numbers and cursors belong to the previous filter
+    }
     currentFilter = filter;
     
     // Map filter names to button IDs
@@ -160,6 +163,7 @@ function loadQueue(filter) {
         per_page: currentPerPage,
         filter: filter
     });
+    SimplePagination.applyCursor(params, currentPage);
     
     fetch(`/api/email/queue?${params}`)
         .then(response => {
@@ -589,7 +593,7 @@ function refreshEmailQueueData() {
                 throw new Error('Sesja wygasła - wymagane ponowne logowanie');
             }
         }),
-        fetch(`/api/email/queue?page=${currentPage}&per_page=${currentPerPage}&filter=${currentFilter}`).then(response => {
+        fetch(`/api/email/queue?${SimplePagination.applyCursor(new URLSearchParams({page: currentPage, per_page: currentPerPage, filter: currentFilter}), currentPage)}`).then(response => {
             console.log('📡 Queue API response status:', response.status);
             
             // Sprawdź czy response to JSON czy HTML (strona logowania)
@@ -24,6 +24,7 @@ class SimplePagination {
         this.totalPages = 1;
         this.totalItems = 0;
         this.perPage = this.options.defaultPerPage;
+        this.cursors = {};  // page -> keyset cursor (next_cursor of the previous page)
         
         this.onPageChange = null;
         this.onPerPageChange = null;
@@ -44,6 +45,15 @@ class SimplePagination {
         this.totalItems = data.total || 0;
         this.perPage = data.per_page || this.options.defaultPerPage;
         
+        // Keyset cursors: next_cursor of page N opens page N + 1 without OFFSET.
+        // Page 1 is loaded after every filter/sort change, so older cursors are dropped there.
+        if (this.currentPage === 1) {
+            this.cursors = {};
+        }
+        if (data.next_cursor) {
+            this.cursors[this.currentPage + 1] = data.next_cursor;
+        }
+        
         console.log('🔍 SimplePagination state after setData:', {
             currentPage: this.currentPage,
             totalPages: this.totalPages,
@@ -230,6 +240,7 @@ class SimplePagination {
         
         this.perPage = perPage;
         this.currentPage = 1; // Reset to first page
+        this.cursors = {};
         
         if (this.onPerPageChange) {
             console.log('🔍 SimplePagination calling onPerPageChange:', this.currentPage, perPage);
@@ -263,6 +274,23 @@ class SimplePagination {
     getTotalItems() {
         return this.totalItems;
     }
+    
+    getCursor(page) {
+        return this.cursors[page] || null;
+    }
+    
+    /**
+     * Adds the keyset cursor for `page` to URLSearchParams when it is known
+     * (pages reached with Next/Previous); other pages fall back to `page` (OFFSET)
+     */
+    static applyCursor(params, page, containerId = 'pagination') {
+        const container = document.getElementById(containerId);
+        const cursor = container && container.paginationInstance ? container.paginationInstance.getCursor(page) : null;
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        return params;
+    }
 }
 
 // Export for use in other modules
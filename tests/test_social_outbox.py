@@ -0,0 +1,67 @@
+"""Social outbox - publikacja posta przy edycji (PUT /api/blog/admin/posts/<id>)"""
+import pytest
+from app import create_app
+from app.models import db, User, BlogPost, BlogCategory, SocialPublication
+from app.services.social_outbox import SocialOutbox
+
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def draft(app):
+    admin = User(first_name='Admin', email='admin@example.com', password_hash='x', account_type='admin')
+    category = BlogCategory(title='Zdrowie', slug='zdrowie')
+    post = BlogPost(title='Post', slug='post', content='Treść', author=admin, status='draft',
+                    social_facebook=True)
+    db.session.add_all([admin, category, post])
+    db.session.commit()
+    return admin, category, post
+
+
+@pytest.fixture
+def client(app, draft, monkeypatch):
+    monkeypatch.setattr(SocialOutbox, 'dispatch', lambda publications: None)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(draft[0].id)
+    return client
+
+
+def _platforms(post_id):
+    return {row.platform for row in SocialPublication.query.filter_by(post_id=post_id)}
+
+
+def test_publishing_draft_with_categories_stages_publication(client, draft):
+    _, category, post = draft
+    response = client.put(f'/api/blog/admin/posts/{post.id}',
+                          json={'status': 'published', 'categories': [category.id], 'tags': ['zdrowie']})
+
+    assert response.status_code == 200
+    assert _platforms(post.id) == {'facebook'}
+
+
+def test_enabling_platform_on_published_post_stages_only_that_platform(client, draft):
+    _, category, post = draft
+    client.put(f'/api/blog/admin/posts/{post.id}', json={'status': 'published'})
+    client.put(f'/api/blog/admin/posts/{post.id}',
+               json={'social_linkedin': True, 'categories': [category.id]})
+
+    assert _platforms(post.id) == {'facebook', 'linkedin'}
+
+
+def test_editing_published_post_does_not_stage_again(client, draft):
+    _, category, post = draft
+    post.status = 'published'
+    db.session.commit()
+
+    client.put(f'/api/blog/admin/posts/{post.id}', json={'title': 'Nowy tytuł', 'categories': [category.id]})
+
+    assert _platforms(post.id) == set()